@@ -0,0 +1,60 @@
+"""Gunicorn configuration, read by default from the working directory.
+
+The application is imported once in the master process and shared with forked
+workers copy-on-write. Every setting can be tuned with an environment variable.
+"""
+import gc
+import multiprocessing
+import os
+import sys
+
+cpu_count = multiprocessing.cpu_count()
+
+bind = f"0.0.0.0:{os.getenv('PORT', 8000)}"
+workers = int(os.getenv("GUNICORN_WORKERS", cpu_count + 1))
+# More than one thread switches workers to the threaded worker class
+threads = int(os.getenv("GUNICORN_THREADS", 2))
+preload_app = os.getenv("GUNICORN_PRELOAD", "yes").lower() in ("yes", "true", "1")
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 30))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", 2))
+# Recycles workers to bound memory growth; jitter avoids restarting all at once
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 0))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", 0))
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-")
+# Heartbeat files on a memory-backed filesystem never block workers on disk IO
+worker_tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+
+def on_starting(server):
+    """Removes metrics files left by workers of a previous server run."""
+    directory = os.getenv("METRICS_MULTIPROCESS_DIR")
+    if directory and os.path.isdir(directory):
+        for filename in os.listdir(directory):
+            if filename.startswith("metrics_"):
+                os.remove(os.path.join(directory, filename))
+
+
+def when_ready(server):
+    """Collects garbage left by importing the application once, before workers
+    are forked, so that freed memory is not copied into every worker.
+    """
+    gc.collect()
+
+
+def pre_fork(server, worker):
+    """Closes database connections of the master process, so that no worker
+    inherits a socket shared with other processes, and moves all objects to the
+    permanent GC generation: collections in workers then never touch (and copy)
+    memory pages shared with the master.
+    """
+    if "django.db" in sys.modules:
+        from django.db import connections
+
+        for connection in connections.all():
+            connection.close()
+
+    pool_backend = sys.modules.get("tictactoe.db.backends.postgresql_pool.base")
+    if pool_backend is not None:
+        pool_backend.close_pools()
+
+    gc.freeze()
@@ -0,0 +1,109 @@
+"""Measures memory of gunicorn workers started with and without `preload_app`.
+
+Starts the server for both modes with `gunicorn.conf.py`, sends a few requests
+to warm the workers up and reads `/proc/<pid>/smaps_rollup` (Linux only) of the
+master and every worker. USS is memory private to a process, PSS additionally
+counts an even share of pages shared with other processes.
+
+    python measure_worker_memory.py --workers 4 --configuration Api
+"""
+from time import monotonic, sleep
+from urllib.error import URLError
+from urllib.request import urlopen
+import argparse
+import os
+import signal
+import subprocess
+import sys
+
+
+def read_memory(pid):
+    """Returns USS and PSS of a process in kB."""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1])
+
+    return fields["Private_Clean"] + fields["Private_Dirty"], fields["Pss"]
+
+
+def child_pids(pid):
+    with open(f"/proc/{pid}/task/{pid}/children") as f:
+        return [int(child) for child in f.read().split()]
+
+
+def wait_until_serving(url, timeout):
+    deadline = monotonic() + timeout
+    while monotonic() < deadline:
+        try:
+            urlopen(url, timeout=1)
+            return
+        except URLError as e:
+            # Any HTTP response, e.g. 401 of an anonymous request, means it serves
+            if hasattr(e, "code"):
+                return
+        except OSError:
+            pass
+        sleep(0.2)
+
+    raise RuntimeError(f"Server did not answer {url} within {timeout}s")
+
+
+def measure(preload, options):
+    env = {
+        **os.environ,
+        "DJANGO_SETTINGS_MODULE": "tictactoe.config",
+        "DJANGO_CONFIGURATION": options.configuration,
+        "GUNICORN_PRELOAD": "yes" if preload else "no",
+        "GUNICORN_WORKERS": str(options.workers),
+        "GUNICORN_ACCESS_LOG": "/dev/null",
+        "PORT": str(options.port),
+    }
+    url = f"http://127.0.0.1:{options.port}{options.path}"
+    command = [sys.executable, "-m", "gunicorn", "--config", "gunicorn.conf.py"]
+    server = subprocess.Popen(command + ["tictactoe.wsgi:application"], env=env)
+    try:
+        wait_until_serving(url, options.timeout)
+        for _ in range(options.requests):
+            try:
+                urlopen(url, timeout=5)
+            except URLError:
+                pass
+        # Let late workers finish booting
+        sleep(1)
+
+        workers = [read_memory(pid) for pid in child_pids(server.pid)]
+        master = read_memory(server.pid)
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait()
+
+    return master, workers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--configuration", default="Api")
+    parser.add_argument("--path", default="/api/v1/")
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=30)
+    options = parser.parse_args()
+
+    for preload in (False, True):
+        (master_uss, master_pss), workers = measure(preload, options)
+        uss = sum(worker[0] for worker in workers) / len(workers)
+        pss = sum(worker[1] for worker in workers) / len(workers)
+        total = master_pss + sum(worker[1] for worker in workers)
+        print(
+            f"preload {'on ' if preload else 'off'}: {len(workers)} workers, "
+            f"USS {uss / 1024:.1f} MiB/worker, PSS {pss / 1024:.1f} MiB/worker, "
+            f"total PSS {total / 1024:.1f} MiB (master {master_pss / 1024:.1f} MiB)"
+        )
+
+
+if __name__ == "__main__":
+    main()
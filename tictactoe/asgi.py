@@ -0,0 +1,24 @@
+"""
+ASGI config for tictactoe project.
+It exposes the ASGI callable as a module-level variable named ``application``,
+serving HTTP with Django and WebSocket game channels with
+``tictactoe.games.websocket``. Run it with an ASGI server, e.g. uvicorn.
+For more information on this file, see
+https://docs.djangoproject.com/en/4.0/howto/deployment/asgi/
+"""
+import os
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tictactoe.config")
+os.environ.setdefault("DJANGO_CONFIGURATION", "Production")
+
+from configurations.asgi import get_asgi_application  # noqa
+django_application = get_asgi_application()
+
+from tictactoe.games.websocket import game_socket  # noqa
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "websocket":
+        await game_socket(scope, receive, send)
+    else:
+        await django_application(scope, receive, send)
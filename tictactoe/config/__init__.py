@@ -1,2 +1,3 @@
 from .local import Local  # noqa
 from .production import Production  # noqa
+from .api import Api  # noqa
@@ -0,0 +1,58 @@
+from .production import Production
+
+# Apps and middleware serving only the admin, sessions, the browsable API and
+# static or uploaded files, which API workers never use
+UNUSED_APPS = (
+    'django.contrib.admin',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    'storages',
+    'gunicorn',
+)
+UNUSED_MIDDLEWARE = (
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+)
+
+
+class Api(Production):
+    """Production profile of workers serving only the JSON API.
+
+    Fewer apps and middleware mean fewer modules imported and initialized when a
+    worker boots, and less work done per request. Token authentication does not
+    need sessions or CSRF protection; the admin, browsable API and static files
+    are served by processes running the `Production` profile.
+    """
+
+    INSTALLED_APPS = tuple(app for app in Production.INSTALLED_APPS if app not in UNUSED_APPS)
+    MIDDLEWARE = tuple(
+        middleware for middleware in Production.MIDDLEWARE if middleware not in UNUSED_MIDDLEWARE
+    )
+
+    DEFAULT_FILE_STORAGE = 'django.core.files.storage.FileSystemStorage'
+    TEMPLATES = [
+        {
+            'BACKEND': 'django.template.backends.django.DjangoTemplates',
+            'DIRS': [],
+            'APP_DIRS': True,
+            'OPTIONS': {
+                'context_processors': [
+                    'django.template.context_processors.request',
+                ],
+            },
+        },
+    ]
+
+    REST_FRAMEWORK = {
+        **Production.REST_FRAMEWORK,
+        'DEFAULT_RENDERER_CLASSES': (
+            'rest_framework.renderers.JSONRenderer',
+        ),
+        'DEFAULT_AUTHENTICATION_CLASSES': (
+            'rest_framework.authentication.TokenAuthentication',
+        ),
+    }
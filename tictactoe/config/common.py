@@ -1,11 +1,66 @@
 import os
 from os.path import join
-from distutils.util import strtobool
 import dj_database_url
 from configurations import Configuration
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 
+def strtobool(value: str) -> bool:
+    """Converts a truthy or falsy string (e.g. `yes` or `off`) to a bool.
+
+    Replaces `distutils.util.strtobool`, as importing `distutils` pulls in
+    `setuptools` and `pkg_resources` and slows down every process start.
+    """
+    value = value.lower()
+    if value in ('y', 'yes', 't', 'true', 'on', '1'):
+        return True
+    if value in ('n', 'no', 'f', 'false', 'off', '0'):
+        return False
+    raise ValueError(f'invalid truth value {value!r}')
+
+
+def postgres_options(database: dict) -> dict:
+    """Applies connection pooling and pgbouncer options to a PostgreSQL database.
+
+    `POSTGRES_POOL` switches to the pooled backend; the pool returns connections
+    when Django closes them, so persistent connections are disabled.
+    `POSTGRES_PGBOUNCER` disables server-side cursors, which do not work with
+    pgbouncer in transaction pooling mode.
+    """
+    if 'postgresql' not in database.get('ENGINE', ''):
+        return database
+
+    if strtobool(os.getenv('POSTGRES_POOL', 'no')):
+        database['ENGINE'] = 'tictactoe.db.backends.postgresql_pool'
+        database['CONN_MAX_AGE'] = 0
+        database['POOL'] = {
+            'MIN_SIZE': int(os.getenv('POSTGRES_POOL_MIN_SIZE', 1)),
+            'MAX_SIZE': int(os.getenv('POSTGRES_POOL_MAX_SIZE', 10)),
+            'TIMEOUT': float(os.getenv('POSTGRES_POOL_TIMEOUT', 10)),
+            'HEALTH_CHECK_INTERVAL': float(os.getenv('POSTGRES_POOL_HEALTH_CHECK_INTERVAL', 30)),
+        }
+    if strtobool(os.getenv('POSTGRES_PGBOUNCER', 'no')):
+        database['DISABLE_SERVER_SIDE_CURSORS'] = True
+
+    return database
+
+
+def replica_databases(urls: str) -> dict:
+    """Builds settings of read replicas from comma separated database URLs.
+
+    Replicas mirror the primary database in tests.
+    """
+    return {
+        f'replica_{i}': {
+            **postgres_options(dj_database_url.parse(
+                url.strip(), conn_max_age=int(os.getenv('POSTGRES_CONN_MAX_AGE', 600))
+            )),
+            'TEST': {'MIRROR': 'default'},
+        }
+        for i, url in enumerate(filter(None, urls.split(',')), 1)
+    }
+
+
 class Common(Configuration):
 
     INSTALLED_APPS = (
@@ -25,11 +80,14 @@ class Common(Configuration):
         # Your apps
         'tictactoe.users',
         'tictactoe.games',
+        'tictactoe.metrics',
+        'tictactoe.tasks',
 
     )
 
     # https://docs.djangoproject.com/en/2.0/topics/http/middleware/
     MIDDLEWARE = (
+        'tictactoe.metrics.middleware.QueryInstrumentationMiddleware',
         'django.middleware.security.SecurityMiddleware',
         'django.contrib.sessions.middleware.SessionMiddleware',
         'django.middleware.common.CommonMiddleware',
@@ -53,11 +111,16 @@ class Common(Configuration):
 
     # Postgres
     DATABASES = {
-        'default': dj_database_url.config(
+        'default': postgres_options(dj_database_url.config(
             default='postgres://postgres:@postgres:5432/postgres',
             conn_max_age=int(os.getenv('POSTGRES_CONN_MAX_AGE', 600))
-        )
+        )),
+        **replica_databases(os.getenv('DATABASE_REPLICA_URLS', '')),
     }
+    DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+    DATABASE_ROUTERS = ['tictactoe.db.routers.ReplicaRouter']
+    # Seconds for which reads of a user go to the primary after they wrote
+    REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', 5))
 
     # General
     APPEND_SLASH = False
@@ -180,6 +243,84 @@ class Common(Configuration):
         }
     }
 
+    # Metrics
+    # Share of requests whose SQL, serialization and total time is recorded;
+    # 0 disables the instrumentation middleware altogether
+    METRICS_SAMPLE_RATE = float(os.getenv('METRICS_SAMPLE_RATE', 1))
+    METRICS_SERVER_TIMING = strtobool(os.getenv('METRICS_SERVER_TIMING', 'yes'))
+    # Directory shared by all worker processes whose metrics are merged on scrape;
+    # it should be emptied whenever the server is (re)started
+    METRICS_MULTIPROCESS_DIR = os.getenv('METRICS_MULTIPROCESS_DIR')
+    METRICS_FLUSH_INTERVAL = float(os.getenv('METRICS_FLUSH_INTERVAL', 1))
+    # Clients allowed to read `/metrics`: comma separated addresses or networks, or
+    # a bearer token sent in the `Authorization` header
+    METRICS_ALLOWED_IPS = [
+        network for network in os.getenv('METRICS_ALLOWED_IPS', '127.0.0.1,::1').split(',') if network
+    ]
+    METRICS_TOKEN = os.getenv('METRICS_TOKEN') or None
+    # Seconds for which metrics computed from the database at scrape time are reused
+    METRICS_COLLECT_INTERVAL = float(os.getenv('METRICS_COLLECT_INTERVAL', 10))
+
+    # Games
+    # Seconds for which encoded game and moves payloads are cached per game version
+    GAMES_SNAPSHOT_CACHE_TIMEOUT = int(os.getenv('GAMES_SNAPSHOT_CACHE_TIMEOUT', 300))
+    # Seconds for which the opening book is cached; it is also dropped whenever it
+    # is updated
+    GAMES_OPENINGS_CACHE_TIMEOUT = int(os.getenv('GAMES_OPENINGS_CACHE_TIMEOUT', 300))
+    # Keep move histories only in the packed `Game.move_sequence` column instead of
+    # also writing a `Move` row per move
+    GAMES_PACKED_MOVES = strtobool(os.getenv('GAMES_PACKED_MOVES', 'no'))
+    # Number of active games whose state each process keeps for validating moves
+    # (0 disables the cache) and alias of a cache sharing the states between
+    # processes, with the seconds for which they are kept there
+    GAMES_HOT_CACHE_SIZE = int(os.getenv('GAMES_HOT_CACHE_SIZE', 10000))
+    GAMES_HOT_CACHE_BACKEND = os.getenv('GAMES_HOT_CACHE_BACKEND') or None
+    GAMES_HOT_CACHE_TIMEOUT = int(os.getenv('GAMES_HOT_CACHE_TIMEOUT', 3600))
+    # Comma separated names of nodes owning shards of games, e.g. addresses of
+    # workers behind a load balancer, and the name of this node
+    GAMES_ROUTING_NODES = [node for node in os.getenv('GAMES_ROUTING_NODES', '').split(',') if node]
+    GAMES_ROUTING_NODE = os.getenv('GAMES_ROUTING_NODE') or None
+    # Broker fanning game events out to WebSocket clients; the in-process broker
+    # only reaches clients connected to the same process, use
+    # 'tictactoe.games.events.PostgresBroker' with several workers or nodes
+    GAMES_EVENTS_BROKER = os.getenv('GAMES_EVENTS_BROKER', 'tictactoe.games.events.InMemoryBroker')
+    # Seconds after which a gap in game event ids is taken for a rolled back insert
+    # rather than a transaction yet to commit, and projections move past it
+    GAMES_PROJECTIONS_GAP_TIMEOUT = float(os.getenv('GAMES_PROJECTIONS_GAP_TIMEOUT', 10))
+    # Token bucket rates of game actions per user and per client IP, e.g. `10/s`
+    # or `30/min`; a bucket holds that many requests and refills at that rate.
+    # Buckets are kept in a store of a fixed size per process, or in a cache shared
+    # by processes
+    GAMES_THROTTLE_RATES = {
+        scope: rate
+        for scope, rate in (
+            ('create', os.getenv('GAMES_THROTTLE_CREATE', '30/min')),
+            ('create_ip', os.getenv('GAMES_THROTTLE_CREATE_IP', '300/min')),
+            ('move', os.getenv('GAMES_THROTTLE_MOVE', '10/s')),
+            ('move_ip', os.getenv('GAMES_THROTTLE_MOVE_IP', '100/s')),
+        )
+        if rate
+    }
+    GAMES_THROTTLE_STORE_SIZE = int(os.getenv('GAMES_THROTTLE_STORE_SIZE', 100000))
+    GAMES_THROTTLE_BACKEND = os.getenv('GAMES_THROTTLE_BACKEND') or None
+    # Games a user may have open (not finished) at once; 0 disables the cap
+    GAMES_MAX_OPEN_GAMES = int(os.getenv('GAMES_MAX_OPEN_GAMES', 10))
+    # Seconds a new game waits for the second player, and a player has for a move,
+    # before the game is finished by the `reap_games` command; 0 disables the timeout
+    GAMES_JOIN_TIMEOUT = int(os.getenv('GAMES_JOIN_TIMEOUT', 86400))
+    GAMES_MOVE_TIMEOUT = int(os.getenv('GAMES_MOVE_TIMEOUT', 3600))
+
+    # Ids
+    # Generate time-ordered UUIDs (version 7 layout) for new games and users
+    # instead of random UUID4, keeping primary key indexes compact
+    TIME_ORDERED_IDS = strtobool(os.getenv('TIME_ORDERED_IDS', 'no'))
+
+    # Tasks
+    # Runs of a failing background task, and seconds before its first retry,
+    # doubled after every further failure
+    TASKS_MAX_ATTEMPTS = int(os.getenv('TASKS_MAX_ATTEMPTS', 5))
+    TASKS_RETRY_DELAY = float(os.getenv('TASKS_RETRY_DELAY', 5))
+
     # Custom user app
     AUTH_USER_MODEL = 'users.User'
 
@@ -0,0 +1,93 @@
+"""PostgreSQL backend taking connections from a per-process connection pool.
+
+Connections are returned to the pool whenever Django closes them, so the backend
+should be used with `CONN_MAX_AGE = 0`. Pool options are read from the `POOL`
+key of the database settings:
+
+    DATABASES["default"]["POOL"] = {
+        "MIN_SIZE": 1,
+        "MAX_SIZE": 10,
+        "TIMEOUT": 10,
+        "HEALTH_CHECK_INTERVAL": 30,
+    }
+"""
+from threading import Lock
+from typing import Dict, Tuple
+import os
+import psycopg2
+from psycopg2 import extensions
+from django.db.backends.postgresql import base
+from tictactoe.db.health import is_healthy
+from tictactoe.db.pool import ConnectionPool, PoolTimeout
+
+_pools: Dict[Tuple, ConnectionPool] = {}
+_pools_lock = Lock()
+
+
+def reset_connection(connection) -> bool:
+    """Rolls back any open transaction of a connection returned to the pool.
+
+    Returns:
+        bool: False if the connection is broken and must not be reused
+    """
+    if connection.closed:
+        return False
+
+    status = connection.get_transaction_status()
+    if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+        return False
+    if status != extensions.TRANSACTION_STATUS_IDLE:
+        try:
+            connection.rollback()
+        except psycopg2.Error:
+            return False
+
+    return True
+
+
+def close_pools() -> None:
+    """Closes idle connections of all pools of the current process."""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close_all()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def get_pool(self, conn_params: dict) -> ConnectionPool:
+        # Pools are per process: connections must never be shared with forked
+        # children. Test databases get their own pool through `conn_params`.
+        key = (os.getpid(), self.alias, repr(sorted(conn_params.items())))
+
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                options = self.settings_dict.get("POOL", {})
+                pool = _pools[key] = ConnectionPool(
+                    connect=lambda: super(DatabaseWrapper, self).get_new_connection(
+                        conn_params
+                    ),
+                    is_healthy=is_healthy,
+                    reset=reset_connection,
+                    min_size=options.get("MIN_SIZE", 1),
+                    max_size=options.get("MAX_SIZE", 10),
+                    timeout=options.get("TIMEOUT", 10),
+                    health_check_interval=options.get("HEALTH_CHECK_INTERVAL", 30),
+                    name=self.alias,
+                )
+
+        return pool
+
+    def get_new_connection(self, conn_params: dict):
+        self.pool = self.get_pool(conn_params)
+        try:
+            connection = self.pool.acquire()
+        except PoolTimeout as e:
+            raise psycopg2.OperationalError(str(e)) from e
+
+        options = self.settings_dict["OPTIONS"]
+        self.isolation_level = options.get("isolation_level", connection.isolation_level)
+        return connection
+
+    def _close(self) -> None:
+        if self.connection is not None:
+            self.pool.release(self.connection)
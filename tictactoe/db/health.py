@@ -0,0 +1,77 @@
+"""Health checks of PostgreSQL connections.
+
+The module depends on `psycopg2` only, so it can also be used before Django is
+set up, e.g. by `wait_for_postgres.py` on startup.
+"""
+from time import monotonic, sleep
+from typing import Callable, Optional
+import logging
+import psycopg2
+
+logger = logging.getLogger(__name__)
+
+
+def is_healthy(connection) -> bool:
+    """Checks if a connection is open and the server answers a trivial query.
+
+    Args:
+        connection: psycopg2 connection
+
+    Returns:
+        bool: True if the connection can be used
+    """
+    if connection.closed:
+        return False
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+    except psycopg2.Error:
+        return False
+
+    # Do not leave the check's transaction open on a connection without autocommit
+    if connection.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+        connection.rollback()
+    return True
+
+
+def wait_for_postgres(
+    timeout: float,
+    interval: float,
+    connect: Optional[Callable] = None,
+    **conn_params,
+) -> bool:
+    """Waits until PostgreSQL accepts connections and passes the health check.
+
+    Args:
+        timeout (float): seconds to wait for at most
+        interval (float): seconds between attempts
+        connect (Optional[Callable]): connection factory; defaults to `psycopg2.connect`
+        conn_params: parameters of the connection
+
+    Returns:
+        bool: True if the database became ready within the timeout
+    """
+    connect = connect or psycopg2.connect
+    deadline = monotonic() + timeout
+    interval_unit = "second" if interval == 1 else "seconds"
+
+    while monotonic() < deadline:
+        try:
+            connection = connect(**conn_params)
+        except psycopg2.OperationalError:
+            connection = None
+
+        if connection is not None:
+            healthy = is_healthy(connection)
+            connection.close()
+            if healthy:
+                logger.info("Postgres is ready! ✨ 💅")
+                return True
+
+        logger.info(f"Postgres isn't ready. Waiting for {interval:g} {interval_unit}...")
+        sleep(interval)
+
+    logger.error(f"We could not connect to Postgres within {timeout:g} seconds.")
+    return False
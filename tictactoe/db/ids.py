@@ -0,0 +1,48 @@
+"""Primary key generators of UUID columns.
+
+Random UUID4 keys scatter inserts all over primary key indexes. Time-ordered
+UUIDs in the version 7 layout start with a millisecond timestamp, so new rows
+are appended next to each other, while ids keep the same public format and mix
+freely with existing UUID4 ids.
+"""
+from threading import Lock
+from time import time_ns
+import os
+import uuid
+from django.conf import settings
+
+_lock = Lock()
+_last = (0, 0)
+
+
+def uuid7() -> uuid.UUID:
+    """Returns a time-ordered UUID in the version 7 layout.
+
+    The 48-bit Unix timestamp in milliseconds is followed by a 12-bit counter,
+    started at a random value every millisecond, and 62 random bits, so ids
+    generated by a single process are strictly increasing.
+
+    Returns:
+        uuid.UUID: generated id
+    """
+    global _last
+
+    with _lock:
+        timestamp = time_ns() // 1_000_000
+        last_timestamp, counter = _last
+        if timestamp <= last_timestamp:
+            timestamp, counter = last_timestamp, counter + 1
+            if counter > 0xFFF:
+                timestamp, counter = timestamp + 1, 0
+        else:
+            counter = int.from_bytes(os.urandom(2), "big") & 0x7FF
+        _last = (timestamp, counter)
+
+    random_bits = int.from_bytes(os.urandom(8), "big") & (1 << 62) - 1
+    value = timestamp << 80 | 0x7 << 76 | counter << 64 | 0b10 << 62 | random_bits
+    return uuid.UUID(int=value)
+
+
+def generate_id() -> uuid.UUID:
+    """Returns a new primary key in the scheme chosen with `TIME_ORDERED_IDS`."""
+    return uuid7() if settings.TIME_ORDERED_IDS else uuid.uuid4()
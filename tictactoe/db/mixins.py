@@ -0,0 +1,34 @@
+from contextlib import ExitStack
+from django.conf import settings
+from rest_framework.permissions import SAFE_METHODS
+from tictactoe.db.routers import is_pinned_to_primary, pin_to_primary, read_from_replica
+
+
+class ReplicaReadMixin:
+    """Viewset mixin sending reads of `replica_actions` to a read replica.
+
+    Users who have just written through the viewset are pinned to the primary
+    for a short while, so that they always read their own writes.
+    """
+
+    replica_actions = ()
+
+    def initial(self, request, *args, **kwargs) -> None:
+        super().initial(request, *args, **kwargs)
+        self._replica_stack = ExitStack()
+
+        user = request.user
+        if settings.DATABASE_REPLICAS and self.action in self.replica_actions:
+            if not (user.is_authenticated and is_pinned_to_primary(user.pk)):
+                self._replica_stack.enter_context(read_from_replica())
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        replica_stack = getattr(self, "_replica_stack", None)
+        if replica_stack is not None:
+            replica_stack.close()
+
+        wrote = request.method not in SAFE_METHODS and response.status_code < 400
+        if wrote and request.user.is_authenticated:
+            pin_to_primary(request.user.pk)
+
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -0,0 +1,198 @@
+from collections import deque
+from threading import Condition
+from time import monotonic
+from typing import Callable, Deque, Tuple
+from tictactoe.metrics.registry import REGISTRY
+
+pool_wait = REGISTRY.histogram(
+    "db_pool_wait_seconds", "Time spent waiting for a pooled database connection."
+)
+pool_connections = REGISTRY.gauge(
+    "db_pool_connections", "Pooled database connections by state (idle or in use)."
+)
+pool_health_check_failures = REGISTRY.counter(
+    "db_pool_health_check_failures", "Pooled connections discarded by the health check."
+)
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection becomes available within the pool timeout."""
+
+
+class ConnectionPool:
+    """Thread-safe pool of database connections with bounded size.
+
+    Connections idle for longer than `health_check_interval` are checked before
+    they are handed out, and broken ones are replaced with new connections.
+    """
+
+    def __init__(
+        self,
+        connect: Callable,
+        is_healthy: Callable,
+        reset: Callable,
+        min_size: int = 1,
+        max_size: int = 10,
+        timeout: float = 10.0,
+        health_check_interval: float = 30.0,
+        name: str = "default",
+    ) -> None:
+        """
+        Args:
+            connect (Callable): factory of new connections
+            is_healthy (Callable): health check of a connection
+            reset (Callable): resets state of a returned connection; returns False
+                if the connection cannot be reused
+            min_size (int): number of connections opened up front and kept idle
+            max_size (int): maximum number of open connections
+            timeout (float): seconds to wait for a connection before giving up
+            health_check_interval (float): idle seconds after which a connection
+                is checked before reuse
+            name (str): name of the pool used in metrics
+        """
+        if not 0 <= min_size <= max_size:
+            raise ValueError("Pool sizes must satisfy 0 <= min_size <= max_size")
+
+        self.connect = connect
+        self.is_healthy = is_healthy
+        self.reset = reset
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.name = name
+        self._idle: Deque[Tuple[object, float]] = deque()
+        self._size = 0
+        self._condition = Condition()
+        self._filled = False
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def idle(self) -> int:
+        return len(self._idle)
+
+    def _report(self) -> None:
+        pool_connections.set(len(self._idle), pool=self.name, state="idle")
+        pool_connections.set(self._size - len(self._idle), pool=self.name, state="in_use")
+
+    def _connect(self):
+        """Opens a connection in a slot already counted in the pool size."""
+        try:
+            return self.connect()
+        except Exception:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+
+    def _fill(self) -> None:
+        with self._condition:
+            if self._filled:
+                return
+            missing = max(self.min_size - self._size, 0)
+            self._size += missing
+            self._filled = True
+
+        for opened in range(missing):
+            try:
+                connection = self._connect()
+            except Exception:
+                with self._condition:
+                    # Slots of connections not attempted yet are given back too
+                    self._size -= missing - opened - 1
+                    self._filled = False
+                    self._condition.notify_all()
+                raise
+            with self._condition:
+                self._idle.append((connection, monotonic()))
+                self._condition.notify()
+
+    def _take(self, deadline: float) -> Tuple[object, float]:
+        """Pops an idle connection, or reserves a slot for a new one if the pool is
+        not full, waiting until either is possible.
+
+        Returns:
+            Tuple[object, float]: idle connection and the time it has been idle since,
+                or None and 0 for a reserved slot
+        """
+        with self._condition:
+            while True:
+                if self._idle:
+                    return self._idle.pop()
+
+                if self._size < self.max_size:
+                    self._size += 1
+                    return None, 0.0
+
+                remaining = deadline - monotonic()
+                if remaining <= 0:
+                    raise PoolTimeout(
+                        f"No database connection available within {self.timeout} seconds"
+                    )
+                self._condition.wait(remaining)
+
+    def acquire(self):
+        """Returns an idle connection or opens a new one if the pool is not full.
+
+        The lock of the pool is only held to pick a connection or reserve a slot;
+        connections are opened and checked outside of it, so a slow database does
+        not hold up threads taking idle connections.
+
+        Raises:
+            PoolTimeout: if no connection is available within the timeout
+
+        Returns:
+            connection from the pool
+        """
+        start = monotonic()
+        deadline = start + self.timeout
+        self._fill()
+
+        while True:
+            connection, idle_since = self._take(deadline)
+            if connection is None:
+                connection = self._connect()
+                break
+            if monotonic() - idle_since < self.health_check_interval:
+                break
+            if self.is_healthy(connection):
+                break
+            pool_health_check_failures.inc(pool=self.name)
+            self._discard(connection)
+
+        with self._condition:
+            self._report()
+        pool_wait.observe(monotonic() - start, pool=self.name)
+        return connection
+
+    def release(self, connection) -> None:
+        """Returns a connection to the pool, discarding it if it cannot be reused."""
+        if not self.reset(connection):
+            self._discard(connection)
+            return
+
+        with self._condition:
+            self._idle.append((connection, monotonic()))
+            self._report()
+            self._condition.notify()
+
+    def _discard(self, connection) -> None:
+        with self._condition:
+            self._size -= 1
+            self._report()
+            self._condition.notify()
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def close_all(self) -> None:
+        """Closes all idle connections, e.g. before the process is forked."""
+        with self._condition:
+            while self._idle:
+                self._discard(self._idle.pop()[0])
+            self._filled = False
+            self._report()
@@ -0,0 +1,76 @@
+from contextlib import contextmanager
+from typing import Iterator, Optional
+import random
+from asgiref.local import Local
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+_state = Local()
+
+
+def _pin_key(user_id) -> str:
+    return f"db:pin-to-primary:{user_id}"
+
+
+def pin_to_primary(user_id) -> None:
+    """Sends reads of a user to the primary for `REPLICA_PIN_SECONDS`.
+
+    Called right after the user writes, so they read their own writes even if
+    replicas lag behind. The pin is kept in the cache, which has to be shared by
+    all workers (e.g. Redis or Memcached) for the pin to work across them.
+    """
+    if settings.DATABASE_REPLICAS:
+        cache.set(_pin_key(user_id), True, settings.REPLICA_PIN_SECONDS)
+
+
+def is_pinned_to_primary(user_id) -> bool:
+    return bool(cache.get(_pin_key(user_id)))
+
+
+def get_read_replica() -> Optional[str]:
+    """Returns the replica chosen for reads of the current request, if any."""
+    return getattr(_state, "replica", None)
+
+
+@contextmanager
+def read_from_replica() -> Iterator[Optional[str]]:
+    """Routes reads made within the block to a randomly chosen read replica.
+
+    A single replica is used for the whole block, so that all of its reads see
+    the same state of the data.
+
+    Yields:
+        Iterator[Optional[str]]: alias of the chosen replica or None if there are
+            no replicas configured
+    """
+    previous = get_read_replica()
+    replicas = settings.DATABASE_REPLICAS
+    _state.replica = random.choice(replicas) if replicas else None
+    try:
+        yield _state.replica
+    finally:
+        _state.replica = previous
+
+
+class ReplicaRouter:
+    """Routes reads explicitly marked with `read_from_replica()` to read replicas.
+
+    All other reads and all writes go to the primary (`default`) database, and
+    so do reads made inside a transaction on the primary.
+    """
+
+    def db_for_read(self, model, **hints) -> Optional[str]:
+        replica = get_read_replica()
+        if replica is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return replica
+
+    def db_for_write(self, model, **hints) -> Optional[str]:
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints) -> Optional[bool]:
+        return True
+
+    def allow_migrate(self, db: str, app_label: str, model_name=None, **hints) -> Optional[bool]:
+        return db not in settings.DATABASE_REPLICAS
@@ -0,0 +1,50 @@
+from unittest import mock
+import uuid
+from django.test import SimpleTestCase, TestCase, override_settings
+from tictactoe.db.ids import generate_id, uuid7
+from tictactoe.games.models import Game
+
+
+class TestIds(SimpleTestCase):
+    def setUp(self) -> None:
+        # Ids generated by other tests must not affect mocked timestamps
+        patcher = mock.patch("tictactoe.db.ids._last", (0, 0))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_uuid7_layout(self):
+        with mock.patch("tictactoe.db.ids.time_ns", return_value=1_700_000_000_123_000_000):
+            value = uuid7()
+
+        self.assertEqual(7, value.version)
+        self.assertEqual(uuid.RFC_4122, value.variant)
+        self.assertEqual(1_700_000_000_123, value.int >> 80)
+
+    def test_uuid7_is_increasing(self):
+        with mock.patch("tictactoe.db.ids.time_ns", return_value=1_700_000_000_000_000_000):
+            same_millisecond = [uuid7() for _ in range(100)]
+        later = uuid7()
+
+        self.assertEqual(sorted(same_millisecond), same_millisecond)
+        self.assertEqual(100, len(set(same_millisecond)))
+        self.assertLess(same_millisecond[-1], later)
+
+    @override_settings(TIME_ORDERED_IDS=False)
+    def test_generate_id_random(self):
+        self.assertEqual(4, generate_id().version)
+
+    @override_settings(TIME_ORDERED_IDS=True)
+    def test_generate_id_time_ordered(self):
+        self.assertEqual(7, generate_id().version)
+
+
+class TestMixedIds(TestCase):
+    def test_uuid4_and_uuid7_rows_coexist(self):
+        with override_settings(TIME_ORDERED_IDS=False):
+            old = Game.objects.create()
+        with override_settings(TIME_ORDERED_IDS=True):
+            new = Game.objects.create()
+
+        self.assertEqual(4, old.id.version)
+        self.assertEqual(7, new.id.version)
+        self.assertEqual({old, new}, set(Game.objects.all()))
@@ -0,0 +1,151 @@
+from threading import Event, Thread
+import time
+from unittest import mock
+import psycopg2
+from django.test import SimpleTestCase
+from tictactoe.db.health import wait_for_postgres
+from tictactoe.db.pool import ConnectionPool, PoolTimeout
+
+
+class FakeConnection:
+    def __init__(self, healthy: bool = True) -> None:
+        self.healthy = healthy
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class TestConnectionPool(SimpleTestCase):
+    def _pool(self, **kwargs) -> ConnectionPool:
+        self.opened = []
+
+        def connect():
+            self.opened.append(FakeConnection())
+            return self.opened[-1]
+
+        options = {"min_size": 1, "max_size": 2, "timeout": 0.05}
+        options.update(kwargs)
+        return ConnectionPool(
+            connect=connect,
+            is_healthy=lambda connection: connection.healthy,
+            reset=lambda connection: not connection.closed,
+            **options,
+        )
+
+    def test_connections_are_reused(self):
+        pool = self._pool()
+        connection = pool.acquire()
+        pool.release(connection)
+
+        self.assertIs(connection, pool.acquire())
+        self.assertEqual(1, len(self.opened))
+
+    def test_pool_is_bounded(self):
+        pool = self._pool()
+        pool.acquire()
+        pool.acquire()
+
+        self.assertRaises(PoolTimeout, pool.acquire)
+        self.assertEqual(2, pool.size)
+
+    def test_waiting_for_released_connection(self):
+        pool = self._pool(max_size=1, timeout=5)
+        connection = pool.acquire()
+        acquired = []
+        waiter = Thread(target=lambda: acquired.append(pool.acquire()))
+        waiter.start()
+        pool.release(connection)
+        waiter.join()
+
+        self.assertEqual([connection], acquired)
+
+    def test_unhealthy_connections_are_replaced(self):
+        pool = self._pool(health_check_interval=0)
+        connection = pool.acquire()
+        connection.healthy = False
+        pool.release(connection)
+
+        replacement = pool.acquire()
+
+        self.assertIsNot(connection, replacement)
+        self.assertTrue(connection.closed)
+        self.assertEqual(1, pool.size)
+
+    def test_broken_connections_are_not_returned(self):
+        pool = self._pool()
+        connection = pool.acquire()
+        connection.close()
+        pool.release(connection)
+
+        self.assertEqual(0, pool.size)
+        self.assertIsNot(connection, pool.acquire())
+
+    def test_slow_connect_does_not_block_idle_connections(self):
+        pool = self._pool(max_size=2, timeout=5)
+        connection = pool.acquire()
+        connecting, proceed = Event(), Event()
+
+        def slow_connect():
+            connecting.set()
+            proceed.wait(5)
+            return FakeConnection()
+
+        pool.connect = slow_connect
+        opener = Thread(target=pool.acquire)
+        opener.start()
+        connecting.wait(5)
+        pool.release(connection)
+
+        self.assertIs(connection, pool.acquire())
+        proceed.set()
+        opener.join()
+        self.assertEqual(2, pool.size)
+
+    def test_failed_connect_wakes_waiting_threads(self):
+        pool = self._pool(min_size=0, max_size=1, timeout=5)
+        connecting = Event()
+        replacement = FakeConnection()
+
+        def connect():
+            if not connecting.is_set():
+                connecting.set()
+                # Let the other thread start waiting for the only slot
+                time.sleep(0.05)
+                raise OSError("connection refused")
+            return replacement
+
+        pool.connect = connect
+        failed = Thread(target=lambda: self.assertRaises(OSError, pool.acquire))
+        failed.start()
+        connecting.wait(5)
+
+        start = time.monotonic()
+        self.assertIs(replacement, pool.acquire())
+        self.assertLess(time.monotonic() - start, 1)
+        failed.join()
+        self.assertEqual(1, pool.size)
+
+    def test_close_all(self):
+        pool = self._pool(min_size=2)
+        pool.release(pool.acquire())
+        pool.close_all()
+
+        self.assertEqual(0, pool.idle)
+        self.assertTrue(all(connection.closed for connection in self.opened))
+
+
+class TestWaitForPostgres(SimpleTestCase):
+    @mock.patch("tictactoe.db.health.is_healthy", return_value=True)
+    def test_waits_until_database_accepts_connections(self, is_healthy):
+        connect = mock.Mock(side_effect=[psycopg2.OperationalError, FakeConnection()])
+
+        with self.assertLogs("tictactoe.db.health", "INFO"):
+            self.assertTrue(wait_for_postgres(timeout=5, interval=0, connect=connect))
+        self.assertEqual(2, connect.call_count)
+
+    def test_gives_up_after_timeout(self):
+        connect = mock.Mock(side_effect=psycopg2.OperationalError)
+
+        with self.assertLogs("tictactoe.db.health", "INFO"):
+            self.assertFalse(wait_for_postgres(timeout=0.01, interval=0.005, connect=connect))
@@ -0,0 +1,83 @@
+from unittest import skipUnless
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, transaction
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from tictactoe.db.routers import (
+    ReplicaRouter,
+    is_pinned_to_primary,
+    pin_to_primary,
+    read_from_replica,
+)
+from tictactoe.games.models import Game
+from tictactoe.users.test.factories import UserFactory
+
+
+@override_settings(DATABASE_REPLICAS=["replica_1"])
+class TestReplicaRouter(SimpleTestCase):
+    def setUp(self) -> None:
+        self.router = ReplicaRouter()
+
+    def test_reads_go_to_primary_by_default(self):
+        self.assertIsNone(self.router.db_for_read(Game))
+
+    def test_marked_reads_go_to_replica(self):
+        with read_from_replica() as replica:
+            self.assertEqual("replica_1", replica)
+            self.assertEqual("replica_1", self.router.db_for_read(Game))
+        self.assertIsNone(self.router.db_for_read(Game))
+
+    def test_writes_go_to_primary(self):
+        with read_from_replica():
+            self.assertEqual("default", self.router.db_for_write(Game))
+
+    def test_replicas_are_not_migrated(self):
+        self.assertFalse(self.router.allow_migrate("replica_1", "games"))
+        self.assertTrue(self.router.allow_migrate("default", "games"))
+
+    def test_pin_to_primary(self):
+        user_id = "4b0c7b1c-1f40-4f5b-9c5c-1f54e2b1f6c1"
+        cache.delete(f"db:pin-to-primary:{user_id}")
+        self.assertFalse(is_pinned_to_primary(user_id))
+
+        pin_to_primary(user_id)
+
+        self.assertTrue(is_pinned_to_primary(user_id))
+
+
+@skipUnless(
+    settings.DATABASE_REPLICAS,
+    "set DATABASE_REPLICA_URLS, e.g. to a second SQLite database, to test replicas",
+)
+class TestReplicaReads(TransactionTestCase):
+    databases = "__all__"
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.replica = connections[settings.DATABASE_REPLICAS[0]]
+        self.user = UserFactory()
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.user.auth_token}")
+
+    def _replica_queries(self, method: str, url: str) -> int:
+        with CaptureQueriesContext(self.replica) as queries:
+            getattr(self.client, method)(url)
+        return len(queries)
+
+    def test_list_reads_from_replica(self):
+        self.assertGreater(self._replica_queries("get", reverse("game-list")), 0)
+        self.assertGreater(self._replica_queries("get", reverse("highscore-list")), 0)
+
+    def test_user_reads_own_writes_from_primary(self):
+        self.assertEqual(0, self._replica_queries("post", reverse("game-list")))
+        self.assertEqual(0, self._replica_queries("get", reverse("game-list")))
+
+    def test_reads_in_transaction_go_to_primary(self):
+        with read_from_replica(), transaction.atomic():
+            with CaptureQueriesContext(self.replica) as queries:
+                list(Game.objects.all())
+
+        self.assertEqual(0, len(queries))
@@ -0,0 +1,49 @@
+from datetime import datetime
+from django.db import transaction
+from tictactoe.games.models import ArchivedGame, ArchivedMove, Game, Move
+
+GAME_COLUMNS = (
+    "id",
+    "player_1_id",
+    "player_2_id",
+    "status",
+    "winner_id",
+    "next_turn_id",
+    "created",
+    "version",
+    "move_sequence",
+)
+MOVE_COLUMNS = ("id", "game_id", "player_id", "row", "column", "mark")
+
+
+def archive_batch(cutoff: datetime, batch_size: int) -> int:
+    """Moves a batch of games finished before the cutoff to the archive tables.
+
+    Every batch runs in its own short transaction, so rows are locked only for
+    as long as it takes to copy and delete a single batch.
+
+    Args:
+        cutoff (datetime): games created before this moment are archived
+        batch_size (int): maximum number of games moved by the batch
+
+    Returns:
+        int: number of archived games
+    """
+    with transaction.atomic():
+        game_ids = list(
+            Game.objects.filter(status="finished", created__lt=cutoff)
+            .order_by("created")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not game_ids:
+            return 0
+
+        games = Game.objects.filter(id__in=game_ids).values(*GAME_COLUMNS)
+        moves = Move.objects.filter(game_id__in=game_ids).values(*MOVE_COLUMNS)
+        ArchivedGame.objects.bulk_create(ArchivedGame(**game) for game in games)
+        ArchivedMove.objects.bulk_create(ArchivedMove(**move) for move in moves)
+
+        Move.objects.filter(game_id__in=game_ids).delete()
+        Game.objects.filter(id__in=game_ids).delete()
+
+    return len(game_ids)
@@ -0,0 +1,112 @@
+from typing import Iterable, List, Optional, Tuple
+import numpy as np
+from django.conf import settings
+from django.db.models.functions import Length
+from numpy.lib.stride_tricks import sliding_window_view
+from tictactoe.games.models import Game, Move, MARKS, unpack_sequence
+
+EMPTY = 0
+MARK_VALUES = {MARKS["player_1"]: 1, MARKS["player_2"]: -1}
+
+
+def evaluate_boards(
+    boards: np.ndarray, win_len: Optional[int] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Finds winners and draws for a whole batch of boards in one pass.
+
+    Boards are encoded with `MARK_VALUES` (1 for `player_1` mark, -1 for `player_2`
+    mark and 0 for an empty cell), so a line of `win_len` marks of one player is
+    a sliding window whose sum equals `win_len` or `-win_len`.
+
+    Args:
+        boards (np.ndarray): (M, N, N) int8 array of boards
+        win_len (Optional[int]): number of marks in a row needed to win; defaults to N
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (M,) int8 array of winning mark values (0 if
+            there is no winner) and (M,) bool array of draw flags
+    """
+    boards = np.asarray(boards, dtype=np.int8)
+    if boards.ndim != 3 or boards.shape[1] != boards.shape[2]:
+        raise ValueError("Boards must be an (M, N, N) array")
+
+    grid_len = boards.shape[1]
+    win_len = win_len or grid_len
+    if not 0 < win_len <= grid_len:
+        raise ValueError(f"Winning line length must be between 1 and {grid_len}")
+
+    rows = sliding_window_view(boards, win_len, axis=2).sum(axis=-1, dtype=np.int16)
+    cols = sliding_window_view(boards, win_len, axis=1).sum(axis=-1, dtype=np.int16)
+    squares = sliding_window_view(boards, (win_len, win_len), axis=(1, 2))
+    p_diags = np.trace(squares, axis1=-2, axis2=-1, dtype=np.int16)
+    n_diags = np.trace(squares[..., ::-1], axis1=-2, axis2=-1, dtype=np.int16)
+
+    lines = np.concatenate(
+        [s.reshape(len(boards), -1) for s in (rows, cols, p_diags, n_diags)], axis=1
+    )
+    p1_won = (lines == win_len).any(axis=1)
+    p2_won = (lines == -win_len).any(axis=1)
+
+    winners = np.where(
+        p1_won,
+        MARK_VALUES[MARKS["player_1"]],
+        np.where(p2_won, MARK_VALUES[MARKS["player_2"]], EMPTY),
+    ).astype(np.int8)
+    draws = (winners == EMPTY) & (boards != EMPTY).all(axis=(1, 2))
+
+    return winners, draws
+
+
+def _move_rows(game_ids: Optional[List]) -> List[Tuple]:
+    moves = Move.objects.values_list("game_id", "row", "column", "mark")
+    if game_ids is not None:
+        moves = moves.filter(game_id__in=game_ids)
+    return list(moves.order_by("game_id"))
+
+
+def _packed_moves(game_ids: Optional[List]) -> List[Tuple]:
+    games = Game.objects.values_list("id", "move_sequence")
+    if game_ids is not None:
+        games = games.filter(id__in=game_ids)
+    else:
+        games = games.alias(plies=Length("move_sequence")).filter(plies__gt=0)
+    return [
+        (game_id, row, column, mark)
+        for game_id, sequence in games.order_by("id")
+        for row, column, mark in unpack_sequence(sequence)
+    ]
+
+
+def load_boards(
+    game_ids: Optional[Iterable] = None, grid_len: int = 3
+) -> Tuple[List, np.ndarray]:
+    """Builds a batch of boards straight from stored moves using a single query.
+
+    Moves are read from packed move sequences with `GAMES_PACKED_MOVES`, and from
+    `Move` rows otherwise.
+
+    Args:
+        game_ids (Optional[Iterable]): games to load; if not given, every game with
+            at least one move is loaded
+        grid_len (int): length of the board side
+
+    Returns:
+        Tuple[List, np.ndarray]: ids of the games in board order and their
+            (M, N, N) int8 boards
+    """
+    if game_ids is not None:
+        game_ids = list(game_ids)
+    moves = _packed_moves(game_ids) if settings.GAMES_PACKED_MOVES else _move_rows(game_ids)
+
+    if game_ids is None:
+        game_ids = list(dict.fromkeys(game_id for game_id, *_ in moves))
+
+    boards = np.zeros((len(game_ids), grid_len, grid_len), dtype=np.int8)
+    if moves:
+        positions = {str(game_id): i for i, game_id in enumerate(game_ids)}
+        game_idx, rows, cols, marks = zip(*moves)
+        boards[
+            [positions[str(game_id)] for game_id in game_idx], list(rows), list(cols)
+        ] = [MARK_VALUES[mark] for mark in marks]
+
+    return game_ids, boards
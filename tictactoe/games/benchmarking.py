@@ -0,0 +1,165 @@
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Callable, Iterator, List, Sequence, Tuple
+import math
+import os
+import random
+import tempfile
+from django.db import connection
+from rest_framework.authtoken.models import Token
+from tictactoe.games.models import Game, Move, MARKS
+from tictactoe.users.models import User
+
+
+@contextmanager
+def test_database(keepdb: bool = False, on_disk: bool = False) -> Iterator[str]:
+    """Runs the wrapped block against a throwaway test database.
+
+    Benchmarks seed a lot of rows, so they never touch the configured database.
+
+    Args:
+        keepdb (bool): keep the test database between runs
+        on_disk (bool): keep a SQLite test database in a file instead of memory, so
+            that it can be written to from many threads
+
+    Yields:
+        Iterator[str]: name of the test database
+    """
+    old_name = connection.settings_dict["NAME"]
+    test_settings = connection.settings_dict["TEST"]
+    old_test_name = test_settings["NAME"]
+    if on_disk and connection.vendor == "sqlite" and not test_settings["NAME"]:
+        test_settings["NAME"] = os.path.join(
+            tempfile.gettempdir(), "tictactoe_benchmark.sqlite3"
+        )
+    test_name = connection.creation.create_test_db(
+        verbosity=0, autoclobber=True, serialize=False, keepdb=keepdb
+    )
+    try:
+        yield test_name
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=keepdb)
+        test_settings["NAME"] = old_test_name
+
+
+def timed(func: Callable, *args, **kwargs) -> Tuple[float, object]:
+    """Calls the function and measures its wall time.
+
+    Returns:
+        Tuple[float, object]: elapsed seconds and the function's result
+    """
+    start = perf_counter()
+    result = func(*args, **kwargs)
+    return perf_counter() - start, result
+
+
+def table_size(model, indexes_only: bool = False) -> int:
+    """Returns the number of bytes taken by a model's table and its indexes.
+
+    Supports PostgreSQL and SQLite builds with the `dbstat` virtual table.
+
+    Args:
+        model: Django model
+        indexes_only (bool): count only the indexes of the table
+
+    Returns:
+        int: size in bytes
+    """
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            function = "pg_indexes_size" if indexes_only else "pg_total_relation_size"
+            cursor.execute(f"SELECT {function}(%s)", [table])
+        else:
+            cursor.execute(
+                "SELECT SUM(pgsize) FROM dbstat WHERE name IN "
+                "(SELECT name FROM sqlite_master WHERE tbl_name = %s AND type IN (%s, %s))",
+                [table, "index", "index" if indexes_only else "table"],
+            )
+        return cursor.fetchone()[0] or 0
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Returns the nearest-rank percentile of given values.
+
+    Args:
+        values (Sequence[float]): measured values
+        pct (float): percentile in the 0-100 range
+
+    Returns:
+        float: percentile value or 0.0 for no values
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = math.ceil(pct / 100 * len(ordered))
+    return ordered[min(max(rank - 1, 0), len(ordered) - 1)]
+
+
+def seed_users(count: int, prefix: str = "bench", with_tokens: bool = False) -> List[User]:
+    """Bulk creates users without running the auth token signal.
+
+    Args:
+        count (int): number of users to create
+        prefix (str): prefix of created usernames
+        with_tokens (bool): also bulk create auth tokens for the users
+
+    Returns:
+        List[User]: created users
+    """
+    User.objects.bulk_create(
+        User(username=f"{prefix}{i}", email=f"{prefix}{i}@example.com")
+        for i in range(count)
+    )
+    users = list(User.objects.filter(username__startswith=prefix))
+
+    if with_tokens:
+        Token.objects.bulk_create(
+            Token(user=user, key=Token.generate_key()) for user in users
+        )
+
+    return users
+
+
+def seed_games(
+    count: int,
+    users: Sequence[User],
+    grid_len: int = 3,
+    batch_size: int = 1000,
+    with_moves: bool = True,
+) -> None:
+    """Bulk creates finished games with random move histories.
+
+    Args:
+        count (int): number of games to create
+        users (Sequence[User]): pool of players
+        grid_len (int): length of the board side
+        batch_size (int): number of games created per query
+        with_moves (bool): also create a `Move` row per move besides the packed
+            move sequence, as when `GAMES_PACKED_MOVES` is disabled
+    """
+    cells = [(row, col) for row in range(grid_len) for col in range(grid_len)]
+
+    for offset in range(0, count, batch_size):
+        games, moves = [], []
+        for _ in range(min(batch_size, count - offset)):
+            player_1, player_2 = random.sample(list(users), 2)
+            game = Game(player_1=player_1, player_2=player_2, status="finished")
+            games.append(game)
+            random.shuffle(cells)
+            for ply, (row, col) in enumerate(cells[: random.randint(0, len(cells))]):
+                game.move_sequence = bytes(game.move_sequence) + bytes((row * grid_len + col,))
+                if not with_moves:
+                    continue
+                is_player_1 = ply % 2 == 0
+                moves.append(
+                    Move(
+                        game=game,
+                        player=player_1 if is_player_1 else player_2,
+                        row=row,
+                        column=col,
+                        mark=MARKS["player_1"] if is_player_1 else MARKS["player_2"],
+                    )
+                )
+        Game.objects.bulk_create(games)
+        Move.objects.bulk_create(moves)
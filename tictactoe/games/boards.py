@@ -0,0 +1,85 @@
+from base64 import b64encode
+from typing import Iterable, Optional, Tuple
+import struct
+from django.conf import settings
+from rest_framework.exceptions import ValidationError
+from tictactoe.games.models import (
+    ArchivedGame,
+    ArchivedMove,
+    Game,
+    Move,
+    GRID_LEN,
+    MARKS,
+    unpack_sequence,
+)
+
+EMPTY_CELL = "_"
+BOARD_REPRESENTATIONS = ("string", "bitboard")
+
+BoardMove = Tuple[int, int, str]
+
+
+def board_moves(game_id, archived: bool = False) -> list:
+    """Returns (row, column, mark) tuples of all moves of a game with a single query,
+    reading moves of an archived game from the archive table.
+    """
+    if settings.GAMES_PACKED_MOVES:
+        model = ArchivedGame if archived else Game
+        sequence = model.objects.filter(pk=game_id).values_list("move_sequence", flat=True)
+        return unpack_sequence(sequence.first() or b"")
+
+    model = ArchivedMove if archived else Move
+    return list(model.objects.filter(game_id=game_id).values_list("row", "column", "mark"))
+
+
+def board_string(moves: Iterable[BoardMove]) -> str:
+    """Encodes a board as a row-major string of marks, e.g. `"xo_x_o___"`."""
+    cells = [EMPTY_CELL] * GRID_LEN * GRID_LEN
+    for row, column, mark in moves:
+        cells[row * GRID_LEN + column] = mark
+
+    return "".join(cells)
+
+
+def board_bitboard(moves: Iterable[BoardMove]) -> str:
+    """Encodes a board as base64 of two big-endian 16-bit masks.
+
+    The first mask holds cells of the `player_1` mark and the second one cells of
+    the `player_2` mark; cell (row, column) is bit `row * 3 + column`.
+    """
+    masks = {MARKS["player_1"]: 0, MARKS["player_2"]: 0}
+    for row, column, mark in moves:
+        masks[mark] |= 1 << (row * GRID_LEN + column)
+
+    return b64encode(
+        struct.pack(">HH", masks[MARKS["player_1"]], masks[MARKS["player_2"]])
+    ).decode()
+
+
+def board_fields(moves: list, representation: str) -> dict:
+    """Returns board related fields added to a game payload.
+
+    Args:
+        moves (list): (row, column, mark) tuples of game moves
+        representation (str): one of `BOARD_REPRESENTATIONS`
+
+    Returns:
+        dict: encoded board and number of moves
+    """
+    encode = board_string if representation == "string" else board_bitboard
+    return {"board": encode(moves), "move_count": len(moves)}
+
+
+def get_board_representation(query_params) -> Optional[str]:
+    """Returns the board representation requested by a client, if any.
+
+    Raises:
+        ValidationError: if the requested representation is not supported
+    """
+    representation = query_params.get("board")
+    if representation is not None and representation not in BOARD_REPRESENTATIONS:
+        raise ValidationError(
+            {"board": f"Must be one of: {', '.join(BOARD_REPRESENTATIONS)}"}
+        )
+
+    return representation
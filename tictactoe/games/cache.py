@@ -0,0 +1,151 @@
+from collections import OrderedDict
+from dataclasses import dataclass, astuple
+from threading import Lock
+from typing import List, Optional, Union
+import uuid
+from django.conf import settings
+from django.core.cache import caches
+from tictactoe.games.models import Game, GRID_LEN, MARKS, unpack_sequence
+from tictactoe.metrics.collectors import record_cache_access
+
+# `GameState` fields in the order they are read from the `Game` table
+STATE_FIELDS = (
+    "id",
+    "player_1_id",
+    "player_2_id",
+    "next_turn_id",
+    "winner_id",
+    "status",
+    "version",
+    "move_sequence",
+)
+
+
+@dataclass(frozen=True)
+class GameState:
+    """State of a game needed to validate and play its moves."""
+
+    id: uuid.UUID
+    player_1_id: Optional[uuid.UUID]
+    player_2_id: Optional[uuid.UUID]
+    next_turn_id: Optional[uuid.UUID]
+    winner_id: Optional[uuid.UUID]
+    status: str
+    version: int
+    move_sequence: bytes
+
+    @classmethod
+    def load(cls, game_id) -> "GameState":
+        """Reads the current state of a game with a single query.
+
+        Raises:
+            Game.DoesNotExist: if there is no such game
+        """
+        values = list(Game.objects.values_list(*STATE_FIELDS).get(pk=game_id))
+        values[-1] = bytes(values[-1])
+        return cls(*values)
+
+    @property
+    def board(self) -> List[List[Union[str, None]]]:
+        board = [[None] * GRID_LEN for _ in range(GRID_LEN)]
+        for row, column, mark in unpack_sequence(self.move_sequence):
+            board[row][column] = mark
+        return board
+
+    def next_player_and_mark(self) -> tuple:
+        """Returns id of the player on turn and their mark; `player_1` starts."""
+        player_id = self.next_turn_id or self.player_1_id
+        mark = MARKS["player_1"] if player_id == self.player_1_id else MARKS["player_2"]
+        return player_id, mark
+
+    def move_error(self, user_id, row: int, column: int) -> Optional[str]:
+        """Checks a move against the rules of `GameService.move`.
+
+        Returns:
+            Optional[str]: the error `GameService.move` would report or None
+        """
+        if user_id not in (self.player_1_id, self.player_2_id):
+            return "You are not part of this game"
+        if self.status == "finished":
+            return "This game has already finished"
+        if self.status == "not_started":
+            return "Wait for the other player to join"
+        if self.next_player_and_mark()[0] != user_id:
+            return "This is not your turn now"
+        if row * GRID_LEN + column in self.move_sequence:
+            return "You cannot make this move"
+        return None
+
+
+class HotGameCache:
+    """LRU cache of states of active games, optionally backed by a shared cache.
+
+    Entries are never trusted blindly: a state is only used to validate a move,
+    and the move is written with a conditional update on the cached version, so a
+    stale entry makes the write miss instead of overwriting newer state.
+    """
+
+    def __init__(self, max_size: int, backend: Optional[str] = None) -> None:
+        """
+        Args:
+            max_size (int): maximum number of games kept in the process
+            backend (Optional[str]): alias of a Django cache shared by processes
+        """
+        self.max_size = max_size
+        self.backend = backend
+        self._states: "OrderedDict[str, GameState]" = OrderedDict()
+        self._lock = Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def _key(self, game_id) -> str:
+        return f"games:hot:{game_id}"
+
+    def get(self, game_id) -> Optional[GameState]:
+        key = self._key(game_id)
+        with self._lock:
+            state = self._states.get(key)
+            if state is not None:
+                self._states.move_to_end(key)
+
+        if state is None and self.backend is not None:
+            values = caches[self.backend].get(key)
+            if values is not None:
+                state = GameState(*values)
+                self._store(key, state)
+
+        record_cache_access("hot_game", state is not None)
+        return state
+
+    def put(self, state: GameState) -> None:
+        """Caches a state unless a newer version of the game is already cached."""
+        key = self._key(state.id)
+        if self._store(key, state) and self.backend is not None:
+            caches[self.backend].set(key, astuple(state), settings.GAMES_HOT_CACHE_TIMEOUT)
+
+    def discard(self, game_id) -> None:
+        key = self._key(game_id)
+        with self._lock:
+            self._states.pop(key, None)
+        if self.backend is not None:
+            caches[self.backend].delete(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._states.clear()
+
+    def _store(self, key: str, state: GameState) -> bool:
+        with self._lock:
+            cached = self._states.get(key)
+            if cached is not None and cached.version > state.version:
+                return False
+            self._states[key] = state
+            self._states.move_to_end(key)
+            while len(self._states) > self.max_size:
+                self._states.popitem(last=False)
+        return True
+
+
+hot_games = HotGameCache(settings.GAMES_HOT_CACHE_SIZE, settings.GAMES_HOT_CACHE_BACKEND)
@@ -0,0 +1,177 @@
+"""Append-only log of game events that projections are built from.
+
+Every change of a game appends `created`, `joined`, `moved` and `finished`
+events in the same transaction, so the log cannot drift from the games. Events
+are self-contained: `finished` events name both players and carry all moves,
+so projections never have to read games that may since have been archived.
+"""
+from typing import Iterable, List, Union
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from tictactoe.games.cache import GameState
+from tictactoe.games.models import ArchivedGame, Game, GameEvent, Move, unpack_sequence
+
+
+def _str(value):
+    return None if value is None else str(value)
+
+
+def record_created(game: Game, user_id) -> GameEvent:
+    """Appends the creation of a game by a user."""
+    return GameEvent.objects.create(
+        game_id=game.id,
+        type="created",
+        user_id=user_id,
+        data={"player_1": _str(game.player_1_id), "player_2": _str(game.player_2_id)},
+        version=game.version,
+    )
+
+
+def record_joined(game: Game, user_id) -> GameEvent:
+    """Appends a player joining a game."""
+    slot = "player_1" if game.player_1_id == user_id else "player_2"
+    return GameEvent.objects.create(
+        game_id=game.id, type="joined", user_id=user_id, data={"slot": slot}, version=game.version
+    )
+
+
+def _move_events(move: Move, game: Union[Game, GameState, ArchivedGame]) -> List[GameEvent]:
+    events = [
+        GameEvent(
+            game_id=game.id,
+            type="moved",
+            user_id=move.player_id,
+            data={
+                "row": move.row,
+                "column": move.column,
+                "mark": move.mark,
+                "next_turn": _str(game.next_turn_id),
+            },
+            version=game.version,
+        )
+    ]
+    if game.status == "finished":
+        events.append(_finished_event(game))
+    return events
+
+
+def _finished_event(game: Union[Game, GameState, ArchivedGame]) -> GameEvent:
+    return GameEvent(
+        game_id=game.id,
+        type="finished",
+        data={
+            "players": [_str(game.player_1_id), _str(game.player_2_id)],
+            "winner": _str(game.winner_id),
+            "moves": len(game.move_sequence),
+            "sequence": bytes(game.move_sequence).hex(),
+        },
+        version=game.version,
+    )
+
+
+def record_move(move: Move, game: Union[Game, GameState]) -> None:
+    """Appends a move and, if the move finished the game, its result.
+
+    Args:
+        move (Move): performed move
+        game (Union[Game, GameState]): state of the game after the move
+    """
+    GameEvent.objects.bulk_create(_move_events(move, game))
+
+
+def record_finished(games: Iterable[Game]) -> None:
+    """Appends results of games finished without a move, e.g. after a timeout.
+
+    Args:
+        games (Iterable[Game]): finished games
+    """
+    GameEvent.objects.bulk_create(_finished_event(game) for game in games)
+
+
+def synthesize_events(game: Union[Game, ArchivedGame]) -> List[GameEvent]:
+    """Builds the events of a game played before the log was introduced.
+
+    Started games are taken as created by `player_1` and joined by `player_2`,
+    which leads projections to the same state as the original order. All events
+    carry the current version of the game.
+
+    Args:
+        game (Union[Game, ArchivedGame]): stored game with its packed move sequence
+
+    Returns:
+        List[GameEvent]: unsaved events in the order of the log
+    """
+    started = game.status != "not_started"
+    events = [
+        GameEvent(
+            game_id=game.id,
+            type="created",
+            user_id=game.player_1_id or game.player_2_id,
+            data={
+                "player_1": _str(game.player_1_id),
+                "player_2": None if started else _str(game.player_2_id),
+            },
+            version=game.version,
+        )
+    ]
+    if started:
+        events.append(
+            GameEvent(
+                game_id=game.id,
+                type="joined",
+                user_id=game.player_2_id,
+                data={"slot": "player_2"},
+                version=game.version,
+            )
+        )
+
+    players = (game.player_1_id, game.player_2_id)
+    moves = unpack_sequence(game.move_sequence)
+    for ply, (row, column, mark) in enumerate(moves, 1):
+        last = ply == len(moves)
+        state = GameState(
+            id=game.id,
+            player_1_id=game.player_1_id,
+            player_2_id=game.player_2_id,
+            next_turn_id=game.next_turn_id if last else players[ply % 2],
+            winner_id=game.winner_id,
+            status=game.status if last else "in_progress",
+            version=game.version,
+            move_sequence=bytes(game.move_sequence)[:ply],
+        )
+        move = Move(player_id=players[(ply - 1) % 2], row=row, column=column, mark=mark)
+        events.extend(_move_events(move, state))
+    if game.status == "finished" and not moves:
+        events.append(_finished_event(game))
+
+    for event in events:
+        event.created = game.created
+    return events
+
+
+def backfill(batch_size: int = 500) -> int:
+    """Appends synthesized events of stored games that have none in the log.
+
+    Args:
+        batch_size (int): games read and logged per transaction
+
+    Returns:
+        int: number of backfilled games
+    """
+    backfilled = 0
+    for model in (ArchivedGame, Game):
+        while True:
+            with transaction.atomic():
+                games = list(
+                    model.objects.filter(~Exists(GameEvent.objects.filter(game_id=OuterRef("pk"))))
+                    .order_by("created")[:batch_size]
+                )
+                GameEvent.objects.bulk_create(_flatten(synthesize_events(game) for game in games))
+            backfilled += len(games)
+            if len(games) < batch_size:
+                break
+    return backfilled
+
+
+def _flatten(lists: Iterable[List[GameEvent]]) -> List[GameEvent]:
+    return [event for events in lists for event in events]
@@ -0,0 +1,220 @@
+"""Publishing of game events to real-time subscribers, e.g. WebSocket clients.
+
+Events are fanned out by a broker chosen with `GAMES_EVENTS_BROKER`. The default
+in-process broker only reaches subscribers of the publishing process, so it
+serves a single worker process. `PostgresBroker` reaches subscribers of all
+processes and nodes sharing the database; other pub/sub services can be plugged
+in by implementing `Broker`.
+"""
+from functools import lru_cache
+from threading import Lock, Thread
+from typing import Dict, Optional, Set
+import asyncio
+import json
+import logging
+import select
+import time
+from django.conf import settings
+from django.db import connections
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """Queue of events of a channel delivered to a single subscriber."""
+
+    def __init__(self, broker: "Broker", channel: str) -> None:
+        self.broker = broker
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue()
+
+    def deliver(self, event: dict) -> None:
+        """Puts an event to the queue; safe to call from any thread."""
+        self.loop.call_soon_threadsafe(self.queue.put_nowait, event)
+
+    async def get(self) -> dict:
+        return await self.queue.get()
+
+    def close(self) -> None:
+        self.broker.unsubscribe(self)
+
+
+class Broker:
+    """Interface of pub/sub brokers of game events."""
+
+    def subscribe(self, channel: str) -> Subscription:
+        """Subscribes to events of a channel; must be called from an event loop."""
+        raise NotImplementedError
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        raise NotImplementedError
+
+    def publish(self, channel: str, event: dict) -> None:
+        """Sends an event to all subscribers of a channel; safe to call from sync code."""
+        raise NotImplementedError
+
+
+class InMemoryBroker(Broker):
+    """Fans events out to subscribers within the current process."""
+
+    def __init__(self) -> None:
+        self._subscriptions: Dict[str, Set[Subscription]] = {}
+        self._lock = Lock()
+
+    def subscribe(self, channel: str) -> Subscription:
+        subscription = Subscription(self, channel)
+        with self._lock:
+            self._subscriptions.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.channel, set())
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                self._subscriptions.pop(subscription.channel, None)
+
+    def publish(self, channel: str, event: dict) -> None:
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            subscription.deliver(event)
+
+
+class PostgresBroker(InMemoryBroker):
+    """Fans events out to subscribers of all processes with PostgreSQL LISTEN/NOTIFY.
+
+    Events are sent with `pg_notify` on a single channel, and are delivered once
+    the publishing transaction commits. Every process with subscribers listens on
+    a connection of its own in a background thread and fans the events out to its
+    subscribers in process. Payloads of notifications are limited to 8000 bytes.
+    """
+
+    pg_channel = "game_events"
+
+    def __init__(self, alias: str = "default", poll_interval: float = 5.0) -> None:
+        """
+        Args:
+            alias (str): alias of the PostgreSQL database to publish through
+            poll_interval (float): seconds between checks of the listening connection,
+                and before reconnecting after it failed
+        """
+        super().__init__()
+        self.alias = alias
+        self.poll_interval = poll_interval
+        self._listener: Optional[Thread] = None
+
+    def subscribe(self, channel: str) -> Subscription:
+        with self._lock:
+            if self._listener is None or not self._listener.is_alive():
+                self._listener = Thread(target=self._listen, name="game-events", daemon=True)
+                self._listener.start()
+        return super().subscribe(channel)
+
+    def publish(self, channel: str, event: dict) -> None:
+        payload = json.dumps({"channel": channel, "event": event})
+        with connections[self.alias].cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, %s)", [self.pg_channel, payload])
+
+    def _listen(self) -> None:
+        while True:
+            try:
+                self._listen_on_connection()
+            except Exception:
+                logger.exception("Listening to game events failed, reconnecting")
+                time.sleep(self.poll_interval)
+
+    def _listen_on_connection(self) -> None:
+        import psycopg2
+
+        database = connections[self.alias]
+        connection = psycopg2.connect(**database.get_connection_params())
+        connection.autocommit = True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {self.pg_channel}")
+            while True:
+                if not select.select([connection], [], [], self.poll_interval)[0]:
+                    continue
+                connection.poll()
+                while connection.notifies:
+                    message = json.loads(connection.notifies.pop(0).payload)
+                    super().publish(message["channel"], message["event"])
+        finally:
+            connection.close()
+
+
+@lru_cache(maxsize=None)
+def get_broker() -> Broker:
+    """Returns the broker configured with `GAMES_EVENTS_BROKER`."""
+    return import_string(settings.GAMES_EVENTS_BROKER)()
+
+
+def game_channel(game_id) -> str:
+    return f"games:{game_id}"
+
+
+def publish_game_event(game_id, event_type: str, data: dict) -> None:
+    """Publishes an event of a game to its subscribers.
+
+    Args:
+        game_id: id of the game
+        event_type (str): type of the event, e.g. `move` or `join`
+        data (dict): JSON serializable payload of the event
+    """
+    get_broker().publish(
+        game_channel(game_id),
+        {"type": event_type, "game": str(game_id), "published": time.time(), **data},
+    )
+
+
+def _str(value):
+    return None if value is None else str(value)
+
+
+def publish_join(game_id, player_id, status: str, version: int) -> None:
+    """Publishes a player joining a game."""
+    publish_game_event(
+        game_id, "join", {"player": _str(player_id), "status": status, "version": version}
+    )
+
+
+def publish_move(move, status: str, winner_id, next_turn_id, version: int) -> None:
+    """Publishes a move with the state of the game it led to.
+
+    Args:
+        move (Move): performed move
+        status (str): status of the game after the move
+        winner_id: id of the winner, if any
+        next_turn_id: id of the player on turn, if any
+        version (int): version of the game after the move
+    """
+    publish_game_event(
+        move.game_id,
+        "move",
+        {
+            "move": {
+                "id": move.id,
+                "row": move.row,
+                "column": move.column,
+                "mark": move.mark,
+                "game": _str(move.game_id),
+                "player": _str(move.player_id),
+            },
+            "status": status,
+            "winner": _str(winner_id),
+            "next_turn": _str(next_turn_id),
+            "version": version,
+        },
+    )
+
+
+def publish_timeout(game_id, winner_id, version: int) -> None:
+    """Publishes a game finished by the reaper after its move deadline passed."""
+    publish_game_event(
+        game_id,
+        "timeout",
+        {"status": "finished", "winner": _str(winner_id), "next_turn": None, "version": version},
+    )
@@ -0,0 +1,177 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from statistics import mean
+from time import perf_counter
+from typing import Callable, Dict, List, Tuple
+import random
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.settings import api_settings
+from rest_framework.test import APIClient
+from tictactoe.games.benchmarking import percentile, seed_games, seed_users
+from tictactoe.games.models import Game
+from tictactoe.users.models import User
+
+Request = Tuple[str, str, str, dict]
+
+
+@dataclass
+class Fixtures:
+    """Seeded data shared by all load test scenarios."""
+
+    users: List[User]
+    tokens: Dict
+    game_ids: List
+    page_size: int = 10
+
+    @property
+    def game_pages(self) -> int:
+        return max(len(self.game_ids) // self.page_size, 1)
+
+    @property
+    def user_pages(self) -> int:
+        return max(len(self.users) // self.page_size, 1)
+
+    def opponent(self, user: User) -> User:
+        """Returns a random user other than the given one.
+
+        Raises:
+            ValueError: if there is no other user
+        """
+        if not any(other != user for other in self.users):
+            raise ValueError("There is no other user to play against")
+        while True:
+            opponent = random.choice(self.users)
+            if opponent != user:
+                return opponent
+
+
+def seed(users: int, games: int) -> Fixtures:
+    """Seeds users with auth tokens and finished games with random move histories.
+
+    Args:
+        users (int): number of users
+        games (int): number of games
+
+    Returns:
+        Fixtures: seeded data
+    """
+    seeded_users = seed_users(users, prefix="loadtest", with_tokens=True)
+    seed_games(games, seeded_users)
+
+    return Fixtures(
+        users=seeded_users,
+        tokens=dict(Token.objects.values_list("user_id", "key")),
+        game_ids=list(Game.objects.values_list("id", flat=True)),
+        page_size=api_settings.PAGE_SIZE,
+    )
+
+
+def _create_game(user: User, fixtures: Fixtures) -> Tuple[str, str, dict]:
+    return "post", reverse("game-list"), {}
+
+
+def _join_game(user: User, fixtures: Fixtures) -> Tuple[str, str, dict]:
+    game = Game.objects.create(player_1=fixtures.opponent(user))
+    return "post", reverse("game-join-game", kwargs={"pk": game.pk}), {}
+
+
+def _move(user: User, fixtures: Fixtures) -> Tuple[str, str, dict]:
+    game = Game.objects.create(
+        player_1=user, player_2=fixtures.opponent(user), status="in_progress"
+    )
+    data = {"row": random.randint(0, 2), "column": random.randint(0, 2)}
+    return "post", reverse("game-move", kwargs={"pk": game.pk}), data
+
+
+def _moves_list(user: User, fixtures: Fixtures) -> Tuple[str, str, dict]:
+    game_id = random.choice(fixtures.game_ids)
+    return "get", reverse("game-moves", kwargs={"pk": game_id}), {}
+
+
+def _game_list(user: User, fixtures: Fixtures) -> Tuple[str, str, dict]:
+    return "get", reverse("game-list"), {"page": random.randint(1, fixtures.game_pages)}
+
+
+def _highscores(user: User, fixtures: Fixtures) -> Tuple[str, str, dict]:
+    page = random.randint(1, fixtures.user_pages)
+    return "get", reverse("highscore-list"), {"page": page}
+
+
+SCENARIOS: Dict[str, Callable[[User, Fixtures], Tuple[str, str, dict]]] = {
+    "create_game": _create_game,
+    "join_game": _join_game,
+    "move": _move,
+    "moves_list": _moves_list,
+    "game_list": _game_list,
+    "highscores": _highscores,
+}
+
+
+def _send(requests: List[Request]) -> List[Tuple[float, int, int]]:
+    """Sends the requests from a single client and measures each of them."""
+    client = APIClient()
+    samples = []
+
+    try:
+        for token, method, url, data in requests:
+            client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+            with CaptureQueriesContext(connection) as queries:
+                start = perf_counter()
+                response = getattr(client, method)(url, data)
+                elapsed = perf_counter() - start
+            samples.append((elapsed, len(queries), response.status_code))
+    finally:
+        connection.close()
+
+    return samples
+
+
+def run_scenario(
+    name: str, fixtures: Fixtures, requests: int, concurrency: int
+) -> dict:
+    """Drives a scenario with concurrent clients and summarizes its measurements.
+
+    Data needed by every request is prepared up front, so only the requests
+    themselves are timed.
+
+    Args:
+        name (str): name of the scenario from `SCENARIOS`
+        fixtures (Fixtures): seeded data
+        requests (int): total number of requests
+        concurrency (int): number of concurrent clients
+
+    Returns:
+        dict: throughput, latency percentiles (ms) and queries per request
+    """
+    prepare = SCENARIOS[name]
+    prepared = []
+    for _ in range(requests):
+        user = random.choice(fixtures.users)
+        prepared.append((fixtures.tokens[user.pk], *prepare(user, fixtures)))
+
+    batches = [prepared[i::concurrency] for i in range(concurrency)]
+    start = perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        samples = [sample for batch in executor.map(_send, batches) for sample in batch]
+    elapsed = perf_counter() - start
+
+    latencies = [latency * 1000 for latency, _, _ in samples]
+    queries = [count for _, count, _ in samples]
+
+    return {
+        "requests": len(samples),
+        "concurrency": concurrency,
+        "errors": sum(status_code >= 400 for _, _, status_code in samples),
+        "throughput": len(samples) / elapsed,
+        "latency_ms": {
+            "mean": mean(latencies),
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "max": max(latencies),
+        },
+        "queries_per_request": {"mean": mean(queries), "max": max(queries)},
+    }
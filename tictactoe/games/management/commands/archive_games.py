@@ -0,0 +1,40 @@
+from datetime import timedelta
+from time import sleep
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from tictactoe.games.archive import archive_batch
+
+
+class Command(BaseCommand):
+    help = (
+        "Moves games finished more than N days ago, with their moves, to the "
+        "archive tables in bounded batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=30)
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--max-batches", type=int, default=None, help="stop after this many batches"
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0.0,
+            help="seconds to sleep between batches to spread the load",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        archived = batches = 0
+
+        while options["max_batches"] is None or batches < options["max_batches"]:
+            count = archive_batch(cutoff, options["batch_size"])
+            if not count:
+                break
+            archived += count
+            batches += 1
+            self.stdout.write(f"Archived batch {batches} of {count} games")
+            sleep(options["pause"])
+
+        self.stdout.write(f"Archived {archived} games in {batches} batches")
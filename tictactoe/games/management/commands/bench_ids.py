@@ -0,0 +1,54 @@
+from time import perf_counter
+import uuid
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from tictactoe.db.ids import uuid7
+from tictactoe.games.benchmarking import table_size, test_database
+from tictactoe.games.models import Game
+
+ID_SCHEMES = {"uuid4": uuid.uuid4, "uuid7": uuid7}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares insert throughput and index size of the games table with random "
+        "UUID4 and time-ordered UUID7 primary keys."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--games", type=int, default=200000)
+        parser.add_argument(
+            "--batch-size", type=int, default=100, help="games inserted per transaction"
+        )
+
+    def handle(self, *args, **options):
+        results = {}
+        with test_database(on_disk=True):
+            for scheme, generate in ID_SCHEMES.items():
+                Game.objects.all().delete()
+                self._vacuum()
+                elapsed = self._insert(generate, options["games"], options["batch_size"])
+                results[scheme] = (elapsed, table_size(Game, indexes_only=True))
+
+        self.stdout.write(f"games: {options['games']}")
+        for scheme, (elapsed, size) in results.items():
+            self.stdout.write(
+                f"{scheme}: {options['games'] / elapsed:.0f} inserts/sec, "
+                f"indexes {size / 2 ** 20:.1f} MiB"
+            )
+
+    def _insert(self, generate, games: int, batch_size: int) -> float:
+        start = perf_counter()
+        for offset in range(0, games, batch_size):
+            with transaction.atomic():
+                Game.objects.bulk_create(
+                    Game(id=generate()) for _ in range(min(batch_size, games - offset))
+                )
+        return perf_counter() - start
+
+    def _vacuum(self) -> None:
+        sql = "VACUUM"
+        if connection.vendor == "postgresql":
+            sql = f"VACUUM FULL {Game._meta.db_table}"
+        with connection.cursor() as cursor:
+            cursor.execute(sql)
@@ -0,0 +1,72 @@
+import random
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import override_settings
+from tictactoe.games import snapshots
+from tictactoe.games.benchmarking import (
+    percentile,
+    seed_games,
+    seed_users,
+    table_size,
+    test_database,
+    timed,
+)
+from tictactoe.games.models import Game, Move
+
+NO_CACHE = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares storage size and `moves` payload build latency of move rows "
+        "with packed move sequences, extrapolated to a larger number of games."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--games", type=int, default=100000)
+        parser.add_argument("--reads", type=int, default=1000)
+        parser.add_argument("--extrapolate", type=int, default=10_000_000)
+
+    def handle(self, *args, **options):
+        with test_database(on_disk=True):
+            seed_games(options["games"], seed_users(100))
+            game_ids = list(Game.objects.values_list("id", flat=True))
+            sample = random.choices(game_ids, k=options["reads"])
+
+            latencies = {
+                packed: self._read_latencies(sample, packed) for packed in (False, True)
+            }
+            rows_size = table_size(Move)
+            games_size = table_size(Game)
+            Game.objects.update(move_sequence=b"")
+            self._vacuum()
+            packed_size = games_size - table_size(Game)
+
+        scale = options["extrapolate"] / options["games"]
+        self.stdout.write(
+            f"games:      {options['games']} (extrapolated to {options['extrapolate']})"
+        )
+        for name, size in (("move rows", rows_size), ("packed", packed_size)):
+            self.stdout.write(
+                f"{name + ':':<11} {size / options['games']:.1f} B/game, "
+                f"{size * scale / 2 ** 30:.2f} GiB extrapolated"
+            )
+        for packed, values in latencies.items():
+            self.stdout.write(
+                f"{('packed' if packed else 'move rows') + ' read:':<16} "
+                f"p50 {percentile(values, 50):.3f}ms, p95 {percentile(values, 95):.3f}ms"
+            )
+
+    def _read_latencies(self, game_ids: list, packed: bool) -> list:
+        with override_settings(GAMES_PACKED_MOVES=packed, CACHES=NO_CACHE):
+            return [
+                timed(snapshots.moves_snapshot, game_id, 0)[0] * 1000 for game_id in game_ids
+            ]
+
+    def _vacuum(self) -> None:
+        # Reclaims space freed by emptied sequences before measuring the table again
+        sql = "VACUUM"
+        if connection.vendor == "postgresql":
+            sql = f"VACUUM FULL {Game._meta.db_table}"
+        with connection.cursor() as cursor:
+            cursor.execute(sql)
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+from tictactoe.games import snapshots
+from tictactoe.games.benchmarking import seed_games, seed_users, test_database, timed
+from tictactoe.games.models import Game
+from tictactoe.games.serializers import GameSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares rendering a game list through `GameSerializer` and `JSONRenderer` "
+        "with the fast path encoding `values()` tuples."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--games", type=int, default=10000)
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        with test_database():
+            seed_games(options["games"], seed_users(100))
+            queryset = Game.objects.all()
+
+            drf_times, fast_times = [], []
+            for _ in range(options["repeat"]):
+                elapsed, drf_payload = timed(
+                    lambda: JSONRenderer().render(GameSerializer(queryset, many=True).data)
+                )
+                drf_times.append(elapsed)
+                elapsed, fast_payload = timed(
+                    lambda: snapshots.dumps(
+                        snapshots.games_payload(snapshots.game_values(queryset))
+                    )
+                )
+                fast_times.append(elapsed)
+
+        drf_time, fast_time = min(drf_times), min(fast_times)
+        encoder = "orjson" if snapshots.orjson is not None else "json"
+        self.stdout.write(f"games:             {options['games']}")
+        self.stdout.write(f"DRF serializer:    {drf_time:.4f}s ({len(drf_payload)} bytes)")
+        self.stdout.write(
+            f"fast path ({encoder}): {fast_time:.4f}s ({len(fast_payload)} bytes)"
+        )
+        self.stdout.write(f"speedup:           {drf_time / fast_time:.1f}x")
@@ -0,0 +1,80 @@
+from statistics import median
+from time import perf_counter
+import json
+import os
+import subprocess
+import sys
+from django.core.management.base import BaseCommand, CommandError
+
+# Run in a fresh interpreter for every measurement, so nothing is imported yet
+STARTUP_SCRIPT = """
+from time import perf_counter
+start = perf_counter()
+from wsgiref.util import setup_testing_defaults
+import json
+import sys
+
+from tictactoe.wsgi import application
+imported = perf_counter()
+
+environ = {"PATH_INFO": sys.argv[1]}
+setup_testing_defaults(environ)
+statuses = []
+b"".join(application(environ, lambda status, headers, exc_info=None: statuses.append(status)))
+responded = perf_counter()
+
+print(json.dumps({
+    "import": imported - start,
+    "first_response": responded - imported,
+    "status": statuses[0],
+    "modules": len(sys.modules),
+}))
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures cold start of `tictactoe.wsgi` in fresh interpreters: time to "
+        "import the application and to answer the first request, per configuration."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--configurations", nargs="+", default=["Production", "Api"])
+        parser.add_argument("--runs", type=int, default=5)
+        parser.add_argument("--path", default="/api/v1/", help="path of the first request")
+
+    def handle(self, *args, **options):
+        for configuration in options["configurations"]:
+            samples = [
+                self._measure(configuration, options["path"])
+                for _ in range(options["runs"])
+            ]
+            timings = {
+                key: median(sample[key] for sample in samples) * 1000
+                for key in ("process", "import", "first_response")
+            }
+            self.stdout.write(
+                f"{configuration}: process {timings['process']:.0f}ms, "
+                f"import {timings['import']:.0f}ms, "
+                f"first response {timings['first_response']:.0f}ms "
+                f"({samples[0]['status']}), {samples[0]['modules']} modules"
+            )
+
+    def _measure(self, configuration: str, path: str) -> dict:
+        env = {
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": "tictactoe.config",
+            "DJANGO_CONFIGURATION": configuration,
+        }
+        start = perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-c", STARTUP_SCRIPT, path],
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        elapsed = perf_counter() - start
+        if result.returncode:
+            raise CommandError(f"{configuration} failed to start:\n{result.stderr}")
+
+        return {"process": elapsed, **json.loads(result.stdout.splitlines()[-1])}
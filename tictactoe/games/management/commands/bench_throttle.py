@@ -0,0 +1,61 @@
+from time import perf_counter
+import random
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from tictactoe.games import throttling
+from tictactoe.games.benchmarking import percentile, seed_games, seed_users, test_database
+from tictactoe.games.services import GameService
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures the per-request overhead of game rate limits with the local and "
+        "a shared bucket store, and of counting open games of a user."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=100000)
+        parser.add_argument("--clients", type=int, default=10000)
+        parser.add_argument(
+            "--backend", help="alias of a cache to also measure as the shared bucket store"
+        )
+        parser.add_argument("--users", type=int, default=200)
+        parser.add_argument("--games", type=int, default=50000)
+
+    def handle(self, *args, **options):
+        stores = {"local": throttling.TokenBucketStore(options["clients"])}
+        if options["backend"]:
+            stores[options["backend"]] = throttling.TokenBucketStore(
+                options["clients"], options["backend"]
+            )
+
+        # Generous rates, so that every request takes a token
+        rates = {"move": "1000000/s", "move_ip": "1000000/s"}
+        clients = [(str(i), f"10.0.{i // 256 % 256}.{i % 256}") for i in range(options["clients"])]
+        for name, store in stores.items():
+            with override_settings(GAMES_THROTTLE_RATES=rates):
+                throttling.buckets, previous = store, throttling.buckets
+                try:
+                    start = perf_counter()
+                    for _ in range(options["requests"]):
+                        throttling.throttle_wait("move", *random.choice(clients))
+                    elapsed = perf_counter() - start
+                finally:
+                    throttling.buckets = previous
+            self.stdout.write(
+                f"throttle ({name} store): {elapsed / options['requests'] * 1e6:.1f} us/request"
+            )
+
+        with test_database(on_disk=True):
+            users = seed_users(options["users"])
+            seed_games(options["games"], users, with_moves=False)
+            timings = []
+            for user in random.choices(users, k=200):
+                start = perf_counter()
+                GameService.count_open_games(user)
+                timings.append(perf_counter() - start)
+
+        self.stdout.write(
+            f"open games count over {options['games']} games: "
+            f"p50 {percentile(timings, 50) * 1e6:.0f} us, p95 {percentile(timings, 95) * 1e6:.0f} us"
+        )
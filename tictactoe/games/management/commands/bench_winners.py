@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from tictactoe.games.batch import evaluate_boards, load_boards
+from tictactoe.games.benchmarking import seed_games, seed_users, test_database, timed
+from tictactoe.games.models import Game
+from tictactoe.games.services import Grid
+
+
+class Command(BaseCommand):
+    help = "Compares the batch winner evaluator with looping over `Grid`."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--games", type=int, default=2000)
+        parser.add_argument("--users", type=int, default=50)
+
+    def handle(self, *args, **options):
+        with test_database():
+            seed_games(options["games"], seed_users(options["users"]))
+            games = list(Game.objects.all())
+
+            grid_time, grid_winners = timed(
+                lambda: [Grid(game).find_winner() for game in games]
+            )
+            load_time, (_, boards) = timed(load_boards, [game.id for game in games])
+            eval_time, (winners, draws) = timed(evaluate_boards, boards)
+
+        batch_time = load_time + eval_time
+        self.stdout.write(f"games:            {len(games)}")
+        self.stdout.write(f"Grid loop:        {grid_time:.4f}s")
+        self.stdout.write(
+            f"batch evaluator:  {batch_time:.4f}s "
+            f"(load {load_time:.4f}s, evaluate {eval_time:.4f}s)"
+        )
+        self.stdout.write(f"speedup:          {grid_time / batch_time:.1f}x")
+        self.stdout.write(
+            f"winners: {int((winners != 0).sum())}, draws: {int(draws.sum())}, "
+            f"Grid winners/draws: {sum(w is not None for w in grid_winners)}"
+        )
@@ -0,0 +1,87 @@
+from datetime import datetime, timezone
+import json
+import platform
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import override_settings
+from tictactoe.games.benchmarking import test_database
+from tictactoe.games.loadtest import SCENARIOS, run_scenario, seed
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds a test database and load tests the API endpoints with concurrent "
+        "clients, reporting throughput, latency percentiles and queries per request."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=500)
+        parser.add_argument("--games", type=int, default=20000)
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            choices=SCENARIOS,
+            dest="scenarios",
+            help="scenario to run; may be repeated, defaults to all scenarios",
+        )
+        parser.add_argument("--output", help="save results as JSON to this file")
+        parser.add_argument("--compare", help="JSON results of a previous run")
+        parser.add_argument("--keepdb", action="store_true")
+
+    def handle(self, *args, **options):
+        if options["users"] < 2:
+            raise CommandError("Games need 2 players, seed at least 2 users")
+        scenarios = options["scenarios"] or list(SCENARIOS)
+        results = {
+            "meta": {
+                "started": datetime.now(timezone.utc).isoformat(),
+                "database": connection.vendor,
+                "django": django.get_version(),
+                "python": platform.python_version(),
+                "users": options["users"],
+                "games": options["games"],
+            },
+            "scenarios": {},
+        }
+
+        # Clients of a load test share an address and create many games each, so
+        # rate limits and the cap of open games are lifted
+        limits = override_settings(GAMES_THROTTLE_RATES={}, GAMES_MAX_OPEN_GAMES=0)
+        with test_database(keepdb=options["keepdb"], on_disk=True), limits:
+            fixtures = seed(options["users"], options["games"])
+            for name in scenarios:
+                results["scenarios"][name] = run_scenario(
+                    name, fixtures, options["requests"], options["concurrency"]
+                )
+
+        baseline = {}
+        if options["compare"]:
+            with open(options["compare"]) as f:
+                baseline = json.load(f)["scenarios"]
+
+        self.stdout.write(
+            f"{'scenario':<12} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} "
+            f"{'queries':>8} {'errors':>7}"
+        )
+        for name, result in results["scenarios"].items():
+            latency = result["latency_ms"]
+            line = (
+                f"{name:<12} {result['throughput']:>8.1f} {latency['p50']:>8.2f} "
+                f"{latency['p95']:>8.2f} {latency['p99']:>8.2f} "
+                f"{result['queries_per_request']['mean']:>8.1f} {result['errors']:>7}"
+            )
+            if name in baseline:
+                old_p95 = baseline[name]["latency_ms"]["p95"]
+                if old_p95:
+                    line += f"  p95 {(latency['p95'] - old_p95) / old_p95:+.1%}"
+                else:
+                    line += f"  p95 {latency['p95'] - old_p95:+.2f}ms"
+            self.stdout.write(line)
+
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump(results, f, indent=2)
+            self.stdout.write(f"Results saved to {options['output']}")
@@ -0,0 +1,53 @@
+from time import sleep
+from django.core.management.base import BaseCommand
+from tictactoe.games.reaper import reap_batch
+
+
+class Command(BaseCommand):
+    help = (
+        "Finishes games whose move deadline passed in bounded batches: games never "
+        "joined are abandoned, games in progress are forfeited by the player on turn."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--max-batches", type=int, default=None, help="stop a run after this many batches"
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0.0,
+            help="seconds to sleep between batches to spread the load",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=None,
+            help="keep running, starting a run every this many seconds",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            self.reap(options)
+            if options["interval"] is None:
+                break
+            sleep(options["interval"])
+
+    def reap(self, options) -> None:
+        totals = {"abandoned": 0, "forfeit": 0}
+        batches = 0
+
+        while options["max_batches"] is None or batches < options["max_batches"]:
+            counts = reap_batch(options["batch_size"])
+            if not any(counts.values()):
+                break
+            batches += 1
+            for outcome, count in counts.items():
+                totals[outcome] += count
+            sleep(options["pause"])
+
+        self.stdout.write(
+            f"Reaped {sum(totals.values())} games in {batches} batches: "
+            f"{totals['abandoned']} abandoned, {totals['forfeit']} forfeit"
+        )
@@ -0,0 +1,25 @@
+from time import monotonic
+from django.core.management.base import BaseCommand
+from tictactoe.games import ratings
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds ratings of all users by replaying results of finished games, "
+        "archived ones included, from the event log in the order games finished."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=2000, help="games fetched and users updated per query"
+        )
+
+    def handle(self, *args, **options):
+        start = monotonic()
+        replayed = ratings.recompute(options["batch_size"])
+        elapsed = monotonic() - start
+
+        self.stdout.write(
+            f"Replayed {replayed} games in {elapsed:.2f}s "
+            f"({replayed / elapsed if elapsed else 0:.0f} games/s)"
+        )
@@ -0,0 +1,56 @@
+from time import monotonic, sleep
+from django.core.management.base import BaseCommand
+from tictactoe.games import eventlog, projections
+
+
+class Command(BaseCommand):
+    help = (
+        "Applies pending game events to projections in streaming batches, or "
+        "rebuilds projections by replaying the whole event log."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--projection",
+            action="append",
+            choices=sorted(projections.PROJECTIONS),
+            help="projection to update; all projections by default",
+        )
+        parser.add_argument(
+            "--rebuild", action="store_true", help="drop projections and replay from the start"
+        )
+        parser.add_argument(
+            "--backfill",
+            action="store_true",
+            help="first log events of games stored before the event log existed",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--follow", action="store_true", help="keep applying new events until interrupted"
+        )
+        parser.add_argument(
+            "--interval", type=float, default=1.0, help="seconds between polls with --follow"
+        )
+
+    def handle(self, *args, **options):
+        if options["backfill"]:
+            self.stdout.write(f"Backfilled events of {eventlog.backfill()} games")
+
+        names = options["projection"] or sorted(projections.PROJECTIONS)
+        rebuild = options["rebuild"]
+        while True:
+            for name in names:
+                start = monotonic()
+                applied = projections.replay(
+                    projections.PROJECTIONS[name], options["batch_size"], rebuild=rebuild
+                )
+                elapsed = monotonic() - start
+                if applied or not options["follow"]:
+                    self.stdout.write(
+                        f"{name}: applied {applied} events in {elapsed:.2f}s "
+                        f"({applied / elapsed if elapsed else 0:.0f} events/s)"
+                    )
+            if not options["follow"]:
+                break
+            rebuild = False
+            sleep(options["interval"])
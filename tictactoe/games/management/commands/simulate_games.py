@@ -0,0 +1,92 @@
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+import os
+import random
+from django.core.management.base import BaseCommand
+from tictactoe.games.benchmarking import seed_users, test_database
+from tictactoe.games.simulation import (
+    PLAYERS,
+    SimulationStats,
+    play_service_game,
+    run_memory_games,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Simulates bot-vs-bot games and reports their throughput. Serves as the "
+        "reference performance benchmark of the game rules and `GameService`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--games", type=int, default=1000)
+        parser.add_argument("--player-1", choices=PLAYERS, default="random")
+        parser.add_argument("--player-2", choices=PLAYERS, default="random")
+        parser.add_argument(
+            "--mode",
+            choices=("memory", "service"),
+            default="memory",
+            help="play with the in-memory rules or through `GameService` on a test DB",
+        )
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=os.cpu_count(),
+            help="size of the process pool used by the memory mode",
+        )
+        parser.add_argument("--seed", type=int, default=None)
+
+    def handle(self, *args, **options):
+        start = perf_counter()
+        if options["mode"] == "memory":
+            stats = self._simulate_in_memory(**options)
+        else:
+            stats = self._simulate_with_service(**options)
+        elapsed = perf_counter() - start
+
+        self.stdout.write(f"mode:       {options['mode']}")
+        self.stdout.write(f"games:      {stats.games}")
+        self.stdout.write(f"moves:      {stats.moves}")
+        self.stdout.write(f"elapsed:    {elapsed:.3f}s")
+        self.stdout.write(f"games/sec:  {stats.games / elapsed:.1f}")
+        self.stdout.write(f"moves/sec:  {stats.moves / elapsed:.1f}")
+        for phase, total in sorted(stats.phases.items()):
+            self.stdout.write(
+                f"{phase + ':':<11} {total:.3f}s total, "
+                f"{total / stats.moves * 1e6:.1f}us per move"
+            )
+        for outcome, count in sorted(stats.outcomes.items()):
+            self.stdout.write(f"{outcome}: {count}")
+
+    def _simulate_in_memory(self, games, processes, seed, **options):
+        processes = max(1, min(processes, games))
+        chunks = [games // processes + (i < games % processes) for i in range(processes)]
+        seeds = [None if seed is None else seed + i for i in range(processes)]
+        stats = SimulationStats()
+
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            results = executor.map(
+                run_memory_games,
+                chunks,
+                [options["player_1"]] * processes,
+                [options["player_2"]] * processes,
+                seeds,
+            )
+            for result in results:
+                stats.merge(result)
+
+        return stats
+
+    def _simulate_with_service(self, games, seed, **options):
+        # Every game goes through the database, which is shared by all
+        # connections, so the full-stack mode is played in a single process.
+        random.seed(seed)
+        players = (PLAYERS[options["player_1"]](), PLAYERS[options["player_2"]]())
+        stats = SimulationStats()
+
+        with test_database():
+            users = seed_users(2, prefix="simulation")
+            for _ in range(games):
+                stats.merge(play_service_game(users, *players))
+
+        return stats
@@ -0,0 +1,82 @@
+from typing import List
+from django.db.models import Count
+from tictactoe.games import projections
+from tictactoe.games.models import Game
+from tictactoe.metrics.registry import REGISTRY, Gauge, Metric
+
+MATCHMAKING_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600)
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+
+games_created = REGISTRY.counter("games_created", "Created games.")
+games_finished = REGISTRY.counter(
+    "games_finished", "Finished games by outcome (win or draw)."
+)
+moves = REGISTRY.counter("moves", "Moves made; rate() of it gives moves per second.")
+misrouted_requests = REGISTRY.counter(
+    "games_misrouted_requests",
+    "Requests for games owned by another node, served without its local state.",
+)
+throttled_requests = REGISTRY.counter(
+    "games_throttled_requests", "Requests rejected by game rate limits by action."
+)
+games_reaped = REGISTRY.counter(
+    "games_reaped",
+    "Games finished after their move deadline by outcome (abandoned or forfeit).",
+)
+matchmaking_wait = REGISTRY.histogram(
+    "matchmaking_wait_seconds",
+    "Time between creating a game and the second player joining it.",
+    MATCHMAKING_BUCKETS,
+)
+
+websocket_connections = REGISTRY.gauge(
+    "websocket_connections", "Open WebSocket connections to game channels."
+)
+websocket_message_latency = REGISTRY.histogram(
+    "websocket_message_latency_seconds",
+    "Time between publishing a game event and sending it to a WebSocket client.",
+    LATENCY_BUCKETS,
+)
+
+
+def active_games() -> List[Metric]:
+    """Reports the number of games that have not finished yet.
+
+    Returns:
+        List[Metric]: gauge of active games per status
+    """
+    gauge = Gauge("active_games", "Games that have not finished yet by status.")
+    counts = (
+        Game.objects.exclude(status="finished")
+        .order_by()
+        .values_list("status")
+        .annotate(count=Count("id"))
+    )
+    for status, count in counts:
+        gauge.set(count, status=status)
+
+    return [gauge]
+
+
+REGISTRY.register_collector(active_games)
+
+
+def projection_lag() -> List[Metric]:
+    """Reports how far projections are behind the game event log.
+
+    Returns:
+        List[Metric]: gauges of pending events and their age per projection
+    """
+    events = Gauge("projection_lag_events", "Game events not applied to a projection yet.")
+    seconds = Gauge(
+        "projection_lag_seconds", "Age of the oldest game event not applied to a projection yet."
+    )
+    for name, projection in projections.PROJECTIONS.items():
+        pending, age = projections.lag(projection)
+        events.set(pending, projection=name)
+        seconds.set(age, projection=name)
+
+    return [events, seconds]
+
+
+REGISTRY.register_collector(projection_lag)
@@ -0,0 +1,72 @@
+# Generated by Django 4.0.1 on 2026-10-19 03:10
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('games', '0003_game_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedGame',
+            fields=[
+                ('id', models.UUIDField(editable=False, primary_key=True, serialize=False)),
+                ('status', models.CharField(choices=[('not_started', 'Not started'), ('in_progress', 'In progress'), ('finished', 'Finished')], max_length=15)),
+                ('created', models.DateTimeField()),
+                ('version', models.PositiveIntegerField(editable=False)),
+                ('archived', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['created'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedMove',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('row', models.IntegerField(choices=[(0, 0), (1, 1), (2, 2)])),
+                ('column', models.IntegerField(choices=[(0, 0), (1, 1), (2, 2)])),
+                ('mark', models.CharField(choices=[('o', 'Nought'), ('x', 'Cross')], max_length=1)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['status', 'created'], name='games_game_status_e8c224_idx'),
+        ),
+        migrations.AddField(
+            model_name='archivedmove',
+            name='game',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='moves', to='games.archivedgame'),
+        ),
+        migrations.AddField(
+            model_name='archivedmove',
+            name='player',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='archivedgame',
+            name='next_turn',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='archivedgame',
+            name='player_1',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='archivedgame',
+            name='player_2',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='archivedgame',
+            name='winner',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_games_won', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
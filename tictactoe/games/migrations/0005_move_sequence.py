@@ -0,0 +1,49 @@
+# Generated by Django 4.0.1 on 2026-10-19 03:13
+
+from itertools import groupby
+from django.db import migrations, models
+
+GRID_LEN = 3
+BATCH_SIZE = 1000
+
+
+def pack_moves(apps, schema_editor):
+    """Fills packed move sequences of existing games from their move rows."""
+    for game_model, move_model in (('Game', 'Move'), ('ArchivedGame', 'ArchivedMove')):
+        Game = apps.get_model('games', game_model)
+        Move = apps.get_model('games', move_model)
+        moves = (
+            Move.objects.order_by('game_id', 'id')
+            .values_list('game_id', 'row', 'column')
+            .iterator(chunk_size=BATCH_SIZE)
+        )
+
+        games = []
+        for game_id, game_moves in groupby(moves, key=lambda move: move[0]):
+            sequence = bytes(row * GRID_LEN + column for _, row, column in game_moves)
+            games.append(Game(id=game_id, move_sequence=sequence))
+            if len(games) == BATCH_SIZE:
+                Game.objects.bulk_update(games, ['move_sequence'])
+                games = []
+        Game.objects.bulk_update(games, ['move_sequence'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0004_archived_games'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedgame',
+            name='move_sequence',
+            field=models.BinaryField(default=bytes),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='move_sequence',
+            field=models.BinaryField(default=bytes),
+        ),
+        migrations.RunPython(pack_moves, migrations.RunPython.noop),
+    ]
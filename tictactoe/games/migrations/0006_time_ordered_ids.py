@@ -0,0 +1,19 @@
+# Generated by Django 4.0.1 on 2026-10-19 03:15
+
+from django.db import migrations, models
+import tictactoe.db.ids
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0005_move_sequence'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='game',
+            name='id',
+            field=models.UUIDField(default=tictactoe.db.ids.generate_id, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
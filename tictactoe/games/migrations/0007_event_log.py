@@ -0,0 +1,72 @@
+# Generated by Django 4.0.1 on 2026-10-19 03:28
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0006_time_ordered_ids'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GameEvent',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('game_id', models.UUIDField(db_index=True)),
+                ('type', models.CharField(choices=[('created', 'Created'), ('joined', 'Joined'), ('moved', 'Moved'), ('finished', 'Finished')], max_length=10)),
+                ('user_id', models.UUIDField(null=True)),
+                ('data', models.JSONField(default=dict)),
+                ('version', models.PositiveIntegerField()),
+                ('created', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ProjectedGame',
+            fields=[
+                ('id', models.UUIDField(editable=False, primary_key=True, serialize=False)),
+                ('player_1_id', models.UUIDField(null=True)),
+                ('player_2_id', models.UUIDField(null=True)),
+                ('status', models.CharField(choices=[('not_started', 'Not started'), ('in_progress', 'In progress'), ('finished', 'Finished')], max_length=15)),
+                ('winner_id', models.UUIDField(null=True)),
+                ('next_turn_id', models.UUIDField(null=True)),
+                ('version', models.PositiveIntegerField()),
+                ('move_sequence', models.BinaryField(default=bytes)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ProjectedLeaderboardEntry',
+            fields=[
+                ('user_id', models.UUIDField(primary_key=True, serialize=False)),
+                ('wins', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ProjectedUserStats',
+            fields=[
+                ('user_id', models.UUIDField(primary_key=True, serialize=False)),
+                ('played', models.PositiveIntegerField(default=0)),
+                ('wins', models.PositiveIntegerField(default=0)),
+                ('draws', models.PositiveIntegerField(default=0)),
+                ('losses', models.PositiveIntegerField(default=0)),
+                ('moves', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ProjectionCheckpoint',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('position', models.BigIntegerField(default=0)),
+                ('updated', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='projectedleaderboardentry',
+            index=models.Index(fields=['-wins'], name='games_proje_wins_0637bc_idx'),
+        ),
+    ]
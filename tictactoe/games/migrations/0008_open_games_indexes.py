@@ -0,0 +1,21 @@
+# Generated by Django 4.0.1 on 2026-10-19 03:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0007_event_log'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['player_1', 'status'], name='games_game_player__b56ff8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['player_2', 'status'], name='games_game_player__bff5f5_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.0.1 on 2026-10-19 03:40
+
+from datetime import timedelta
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def set_deadlines(apps, schema_editor):
+    """Gives open games a full timeout from now, so that none is reaped right away."""
+    Game = apps.get_model('games', 'Game')
+    for status, timeout in (
+        ('not_started', settings.GAMES_JOIN_TIMEOUT),
+        ('in_progress', settings.GAMES_MOVE_TIMEOUT),
+    ):
+        if timeout:
+            Game.objects.filter(status=status).update(
+                move_deadline=timezone.now() + timedelta(seconds=timeout)
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0008_open_games_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='move_deadline',
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(condition=models.Q(('move_deadline__isnull', False)), fields=['move_deadline'], name='games_game_deadline_idx'),
+        ),
+        migrations.RunPython(set_deadlines, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.0.1 on 2026-10-19 03:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0009_move_deadline'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OpeningPosition',
+            fields=[
+                ('position', models.PositiveIntegerField(primary_key=True, serialize=False)),
+                ('ply', models.PositiveSmallIntegerField()),
+                ('games', models.PositiveIntegerField(default=0)),
+                ('wins_player_1', models.PositiveIntegerField(default=0)),
+                ('wins_player_2', models.PositiveIntegerField(default=0)),
+                ('draws', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -1,15 +1,18 @@
-from typing import Tuple
-import uuid
+from typing import List, Tuple, Union
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth import get_user_model
+from tictactoe.db.ids import generate_id
 
 User = get_user_model()
 
 MARKS = {"player_1": "o", "player_2": "x"}
+GRID_LEN = 3
 
 
 class Game(models.Model):
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=generate_id, editable=False)
     player_1 = models.ForeignKey(
         User, on_delete=models.SET_NULL, null=True, related_name="games_as_p1"
     )
@@ -31,9 +34,34 @@ class Game(models.Model):
         User, on_delete=models.SET_NULL, null=True, related_name="games_pending_move"
     )
     created = models.DateTimeField(auto_now_add=True)
+    version = models.PositiveIntegerField(default=0, editable=False)
+    # Cell indices (`row * GRID_LEN + column`) of all moves, one byte per move
+    move_sequence = models.BinaryField(default=bytes, editable=False)
+    # Time by which the game must be joined or the next move made, else it is
+    # finished by the `reap_games` command; None for finished games
+    move_deadline = models.DateTimeField(null=True, editable=False)
 
     class Meta:
         ordering = ["created"]
+        indexes = [
+            models.Index(fields=["status", "created"]),
+            # Open games of a player are counted from these alone
+            models.Index(fields=["player_1", "status"]),
+            models.Index(fields=["player_2", "status"]),
+            # Only open games have a deadline, so the index stays as small as their set
+            models.Index(
+                fields=["move_deadline"],
+                name="games_game_deadline_idx",
+                condition=models.Q(move_deadline__isnull=False),
+            ),
+        ]
+
+    def save(self, *args, **kwargs) -> None:
+        """Saves the game bumping its version, so that every state change of a game
+        can be told apart by its version alone.
+        """
+        self.version += 1
+        super().save(*args, **kwargs)
 
     def is_user_in_game(self, user: User) -> bool:
         """Checks if user is part of a game.
@@ -85,8 +113,23 @@ class Game(models.Model):
         Returns:
             bool: True if given move has not been made before
         """
+        if settings.GAMES_PACKED_MOVES:
+            return row * GRID_LEN + column not in bytes(self.move_sequence)
         return not self.moves.filter(row=row, column=column).exists()
 
+    def append_move(self, row: int, column: int) -> int:
+        """Appends a move to the packed move sequence; the game is not saved.
+
+        Args:
+            row (int): row in which mark is placed
+            column (int): col in which mark is placed
+
+        Returns:
+            int: ply of the move, counted from 1
+        """
+        self.move_sequence = bytes(self.move_sequence) + bytes((row * GRID_LEN + column,))
+        return len(self.move_sequence)
+
     def __str__(self) -> str:
         return f"Game {self.id} - status {self.status}"
 
@@ -108,3 +151,181 @@ class Move(models.Model):
         (MARKS["player_2"], "Cross"),
     )
     mark = models.CharField(choices=MARK_CHOICES, max_length=1)
+
+
+def unpack_sequence(sequence: bytes) -> List[Tuple[int, int, str]]:
+    """Decodes a packed move sequence to (row, column, mark) tuples.
+
+    Players take turns starting with `player_1`, so marks follow the ply parity.
+
+    Args:
+        sequence (bytes): packed move sequence of a game
+
+    Returns:
+        List[Tuple[int, int, str]]: moves in the order they were made
+    """
+    marks = (MARKS["player_1"], MARKS["player_2"])
+    return [
+        (*divmod(cell, GRID_LEN), marks[ply % 2])
+        for ply, cell in enumerate(bytes(sequence))
+    ]
+
+
+def unpack_moves(game: Union[Game, "ArchivedGame"]) -> List[Move]:
+    """Rebuilds unsaved moves of a game from its packed move sequence.
+
+    Moves are numbered with their ply, counted from 1, in place of ids.
+
+    Args:
+        game (Union[Game, ArchivedGame]): game with `move_sequence` and players
+
+    Returns:
+        List[Move]: moves in the order they were made
+    """
+    players = (game.player_1_id, game.player_2_id)
+    return [
+        Move(
+            id=ply,
+            game_id=game.id,
+            player_id=players[(ply - 1) % 2],
+            row=row,
+            column=column,
+            mark=mark,
+        )
+        for ply, (row, column, mark) in enumerate(unpack_sequence(game.move_sequence), 1)
+    ]
+
+
+class ArchivedGame(models.Model):
+    """Finished game moved out of the `Game` table by the `archive_games` command.
+
+    Archived games keep the fields, ids and version they had as games, so that
+    read endpoints can serve them unchanged.
+    """
+
+    id = models.UUIDField(primary_key=True, editable=False)
+    player_1 = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, related_name="+"
+    )
+    player_2 = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, related_name="+"
+    )
+    status = models.CharField(choices=Game.STATUS_CHOICES, max_length=15)
+    winner = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, related_name="archived_games_won"
+    )
+    next_turn = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, related_name="+"
+    )
+    created = models.DateTimeField()
+    version = models.PositiveIntegerField(editable=False)
+    move_sequence = models.BinaryField(default=bytes, editable=False)
+    archived = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["created"]
+
+    def __str__(self) -> str:
+        return f"Archived game {self.id}"
+
+
+class ArchivedMove(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    game = models.ForeignKey(
+        ArchivedGame, on_delete=models.CASCADE, related_name="moves"
+    )
+    player = models.ForeignKey(
+        User, on_delete=models.PROTECT, null=True, related_name="+"
+    )
+    row = models.IntegerField(choices=Move.MOVE_CHOICES)
+    column = models.IntegerField(choices=Move.MOVE_CHOICES)
+    mark = models.CharField(choices=Move.MARK_CHOICES, max_length=1)
+
+
+class GameEvent(models.Model):
+    """Entry of the append-only log of everything that happened to games.
+
+    Events are appended in the transaction that changes the game and carry all
+    data projections need, so the log outlives archived or deleted games and can
+    be replayed on its own. Ids order the events.
+    """
+
+    TYPE_CHOICES = (
+        ("created", "Created"),
+        ("joined", "Joined"),
+        ("moved", "Moved"),
+        ("finished", "Finished"),
+    )
+    id = models.BigAutoField(primary_key=True)
+    game_id = models.UUIDField(db_index=True)
+    type = models.CharField(choices=TYPE_CHOICES, max_length=10)
+    # User who caused the event, if any
+    user_id = models.UUIDField(null=True)
+    data = models.JSONField(default=dict)
+    # Version of the game after the event
+    version = models.PositiveIntegerField()
+    created = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["id"]
+
+    def __str__(self) -> str:
+        return f"Event {self.id} - {self.type} game {self.game_id}"
+
+
+class ProjectionCheckpoint(models.Model):
+    """Id of the last game event applied to a projection."""
+
+    name = models.CharField(primary_key=True, max_length=50)
+    position = models.BigIntegerField(default=0)
+    updated = models.DateTimeField(auto_now=True)
+
+
+class ProjectedGame(models.Model):
+    """Current state of a game built from the event log."""
+
+    id = models.UUIDField(primary_key=True, editable=False)
+    player_1_id = models.UUIDField(null=True)
+    player_2_id = models.UUIDField(null=True)
+    status = models.CharField(choices=Game.STATUS_CHOICES, max_length=15)
+    winner_id = models.UUIDField(null=True)
+    next_turn_id = models.UUIDField(null=True)
+    version = models.PositiveIntegerField()
+    move_sequence = models.BinaryField(default=bytes)
+
+
+class ProjectedLeaderboardEntry(models.Model):
+    """Number of games won by a user, built from the event log."""
+
+    user_id = models.UUIDField(primary_key=True)
+    wins = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [models.Index(fields=["-wins"])]
+
+
+class ProjectedUserStats(models.Model):
+    """Results of finished games of a user, built from the event log."""
+
+    user_id = models.UUIDField(primary_key=True)
+    played = models.PositiveIntegerField(default=0)
+    wins = models.PositiveIntegerField(default=0)
+    draws = models.PositiveIntegerField(default=0)
+    losses = models.PositiveIntegerField(default=0)
+    moves = models.PositiveIntegerField(default=0)
+
+
+class OpeningPosition(models.Model):
+    """Results of finished games that passed through a position, built from the event log.
+
+    Positions equal up to a rotation or reflection of the board share a row, so
+    the table holds at most the 765 essentially different positions.
+    """
+
+    # Canonical board in base 3, see `tictactoe.games.openings`
+    position = models.PositiveIntegerField(primary_key=True)
+    ply = models.PositiveSmallIntegerField()
+    games = models.PositiveIntegerField(default=0)
+    wins_player_1 = models.PositiveIntegerField(default=0)
+    wins_player_2 = models.PositiveIntegerField(default=0)
+    draws = models.PositiveIntegerField(default=0)
@@ -0,0 +1,175 @@
+"""Opening book: results of finished games per position they passed through.
+
+Positions are canonicalized under the 8 symmetries of the board (rotations and
+reflections), so that equivalent openings are counted together. A board is
+encoded in base 3 with a digit per cell (0 empty, 1 for `player_1`, 2 for
+`player_2`), and its canonical code is the smallest code of its 8 images.
+
+The book is kept by the `openings` projection and served from a cached copy of
+the whole table, which holds at most 765 positions.
+"""
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from tictactoe.games.models import GRID_LEN, OpeningPosition
+from tictactoe.metrics.collectors import record_cache_access
+
+CELLS = GRID_LEN * GRID_LEN
+BOOK_CACHE_KEY = "games:openings:book"
+
+# Cell every cell is moved to by each symmetry of the board
+SYMMETRIES: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple(
+        transform(row, column)[0] * GRID_LEN + transform(row, column)[1]
+        for row in range(GRID_LEN)
+        for column in range(GRID_LEN)
+    )
+    for transform in (
+        lambda r, c: (r, c),
+        lambda r, c: (c, GRID_LEN - 1 - r),
+        lambda r, c: (GRID_LEN - 1 - r, GRID_LEN - 1 - c),
+        lambda r, c: (GRID_LEN - 1 - c, r),
+        lambda r, c: (r, GRID_LEN - 1 - c),
+        lambda r, c: (GRID_LEN - 1 - r, c),
+        lambda r, c: (c, r),
+        lambda r, c: (GRID_LEN - 1 - c, GRID_LEN - 1 - r),
+    )
+)
+
+# Games played, won by `player_1`, won by `player_2` and drawn from a position
+Results = Tuple[int, int, int, int]
+
+
+@lru_cache(maxsize=65536)
+def positions(sequence: bytes) -> Tuple[int, ...]:
+    """Returns canonical codes of all positions of a game, from the empty board on.
+
+    Args:
+        sequence (bytes): packed move sequence, players take turns starting with `player_1`
+
+    Returns:
+        Tuple[int, ...]: canonical code of the position after every ply, 0 first
+    """
+    codes = [0] * len(SYMMETRIES)
+    canonical = [0]
+    for ply, cell in enumerate(sequence):
+        digit = 1 + ply % 2
+        for i, symmetry in enumerate(SYMMETRIES):
+            codes[i] += digit * 3 ** symmetry[cell]
+        canonical.append(min(codes))
+    return tuple(canonical)
+
+
+def parse_moves(value: str) -> bytes:
+    """Parses a line of play given as comma separated cells (`row * 3 + column`).
+
+    Args:
+        value (str): e.g. `4,0`, or an empty string for the empty board
+
+    Returns:
+        bytes: packed move sequence
+
+    Raises:
+        ValueError: if a cell is not a number, is off the board or is taken
+    """
+    cells = [int(cell) for cell in value.split(",") if cell.strip()]
+    if any(not 0 <= cell < CELLS for cell in cells) or len(set(cells)) != len(cells):
+        raise ValueError("Moves must be distinct cells from 0 to 8")
+    return bytes(cells)
+
+
+def load_book() -> Dict[int, Results]:
+    """Returns results of all positions of the book, cached for `GAMES_OPENINGS_CACHE_TIMEOUT`.
+
+    Returns:
+        Dict[int, Results]: results by canonical position code
+    """
+    book = cache.get(BOOK_CACHE_KEY)
+    record_cache_access("game_openings", book is not None)
+    if book is None:
+        book = {
+            position: results
+            for position, *results in OpeningPosition.objects.values_list(
+                "position", "games", "wins_player_1", "wins_player_2", "draws"
+            ).iterator()
+        }
+        cache.set(BOOK_CACHE_KEY, book, settings.GAMES_OPENINGS_CACHE_TIMEOUT)
+    return book
+
+
+def invalidate() -> None:
+    """Drops the cached book once the current transaction commits."""
+    transaction.on_commit(lambda: cache.delete(BOOK_CACHE_KEY))
+
+
+def _results(results: Results) -> dict:
+    games, wins_player_1, wins_player_2, draws = results
+    return {
+        "games": games,
+        "wins_player_1": wins_player_1,
+        "wins_player_2": wins_player_2,
+        "draws": draws,
+    }
+
+
+def book_entry(sequence: bytes, book: Dict[int, Results]) -> dict:
+    """Builds results of a position and of the moves played from it, most popular first.
+
+    Moves leading to equivalent positions are listed once, under their first cell.
+    The win rate of a move is that of the player who makes it.
+
+    Args:
+        sequence (bytes): packed moves leading to the position
+        book (Dict[int, Results]): results by canonical position code
+
+    Returns:
+        dict: results of the position with its `continuations`
+    """
+    empty = (0, 0, 0, 0)
+    entry = _results(book.get(positions(sequence)[-1], empty))
+
+    continuations = []
+    seen = set()
+    for cell in range(CELLS):
+        if cell in sequence:
+            continue
+        position = positions(sequence + bytes((cell,)))[-1]
+        if position in seen or position not in book:
+            continue
+        seen.add(position)
+        results = _results(book[position])
+        wins = results["wins_player_1" if len(sequence) % 2 == 0 else "wins_player_2"]
+        continuations.append(
+            {
+                "row": cell // GRID_LEN,
+                "column": cell % GRID_LEN,
+                **results,
+                "win_rate": round(wins / results["games"], 4) if results["games"] else 0.0,
+            }
+        )
+
+    continuations.sort(key=lambda move: -move["games"])
+    entry["continuations"] = continuations
+    return entry
+
+
+def book_rows(sequences: Sequence[Tuple[bytes, int]]) -> Dict[int, List[int]]:
+    """Counts results of games per position they passed through.
+
+    Args:
+        sequences (Sequence[Tuple[bytes, int]]): move sequences of games with their
+            outcome: 1 or 2 for a win of that player, 0 for a draw
+
+    Returns:
+        Dict[int, List[int]]: [ply, games, wins of `player_1`, wins of `player_2`,
+            draws] by canonical position code
+    """
+    rows: Dict[int, List[int]] = {}
+    for sequence, outcome in sequences:
+        for ply, position in enumerate(positions(bytes(sequence))):
+            row = rows.setdefault(position, [ply, 0, 0, 0, 0])
+            row[1] += 1
+            row[(4, 2, 3)[outcome]] += 1
+    return rows
@@ -0,0 +1,354 @@
+"""Read models built by replaying the game event log.
+
+Every projection applies events in the order of their ids, a batch at a time,
+and stores the id of the last applied event in its checkpoint in the same
+transaction. Catching up can therefore be stopped and resumed at any point, and
+rebuilding a projection is a replay of the log from its start.
+
+Event ids are assigned before their transaction commits, so a missing id may
+belong to an event yet to be committed. Projections stop at such a gap until it
+is filled, or until it is older than `GAMES_PROJECTIONS_GAP_TIMEOUT` and taken
+for a rolled back insert.
+"""
+from collections import Counter
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Type
+import uuid
+from django.conf import settings
+from django.db import models, transaction
+from django.utils import timezone
+from tictactoe.games import openings
+from tictactoe.games.models import (
+    GRID_LEN,
+    ArchivedGame,
+    Game,
+    GameEvent,
+    OpeningPosition,
+    ProjectedGame,
+    ProjectedLeaderboardEntry,
+    ProjectedUserStats,
+    ProjectionCheckpoint,
+)
+
+
+def _uuid(value: Optional[str]) -> Optional[uuid.UUID]:
+    return None if value is None else uuid.UUID(value)
+
+
+def _save(model: Type[models.Model], rows: Iterable[models.Model], existing: Set, fields: List[str]) -> None:
+    """Inserts new rows and updates the existing ones in bulk."""
+    rows = list(rows)
+    model.objects.bulk_create([row for row in rows if row.pk not in existing])
+    model.objects.bulk_update([row for row in rows if row.pk in existing], fields)
+
+
+class Projection:
+    """Builder of a read model from game events."""
+
+    name = ""
+    model: Type[models.Model]
+
+    def reset(self) -> None:
+        """Removes all rows of the read model."""
+        self.model.objects.all().delete()
+
+    def apply(self, events: List[GameEvent]) -> None:
+        """Applies a batch of events in the order of the log.
+
+        Args:
+            events (List[GameEvent]): consecutive events of the log
+        """
+        raise NotImplementedError
+
+
+class GameStateProjection(Projection):
+    """Current state of every game, as stored on `Game`."""
+
+    name = "games"
+    model = ProjectedGame
+
+    def apply(self, events: List[GameEvent]) -> None:
+        games: Dict[uuid.UUID, ProjectedGame] = self.model.objects.in_bulk(
+            {event.game_id for event in events}
+        )
+        existing = set(games)
+
+        for event in events:
+            if event.type == "created":
+                games[event.game_id] = ProjectedGame(
+                    id=event.game_id,
+                    player_1_id=_uuid(event.data["player_1"]),
+                    player_2_id=_uuid(event.data["player_2"]),
+                    status="not_started",
+                )
+            game = games.get(event.game_id)
+            if game is None:
+                continue
+
+            if event.type == "joined":
+                setattr(game, f"{event.data['slot']}_id", event.user_id)
+                game.status = "in_progress"
+            elif event.type == "moved":
+                cell = event.data["row"] * GRID_LEN + event.data["column"]
+                game.move_sequence = bytes(game.move_sequence) + bytes((cell,))
+                game.next_turn_id = _uuid(event.data["next_turn"])
+            elif event.type == "finished":
+                game.status = "finished"
+                game.winner_id = _uuid(event.data["winner"])
+                game.next_turn_id = None
+            game.version = event.version
+
+        _save(
+            self.model,
+            games.values(),
+            existing,
+            ["player_1_id", "player_2_id", "status", "winner_id", "next_turn_id", "version", "move_sequence"],
+        )
+
+
+class LeaderboardProjection(Projection):
+    """Number of games won by every user who won any."""
+
+    name = "leaderboard"
+    model = ProjectedLeaderboardEntry
+
+    def apply(self, events: List[GameEvent]) -> None:
+        wins = Counter(
+            _uuid(event.data["winner"])
+            for event in events
+            if event.type == "finished" and event.data["winner"] is not None
+        )
+        entries = self.model.objects.in_bulk(wins)
+        existing = set(entries)
+
+        for user_id, count in wins.items():
+            entry = entries.setdefault(user_id, ProjectedLeaderboardEntry(user_id=user_id))
+            entry.wins += count
+
+        _save(self.model, entries.values(), existing, ["wins"])
+
+
+class UserStatsProjection(Projection):
+    """Results of finished games and the number of moves of every player.
+
+    Games finished before the second player joined are not counted.
+    """
+
+    name = "user_stats"
+    model = ProjectedUserStats
+
+    def apply(self, events: List[GameEvent]) -> None:
+        user_ids = set()
+        for event in events:
+            if event.type == "moved":
+                user_ids.add(event.user_id)
+            elif event.type == "finished" and None not in event.data["players"]:
+                user_ids.update(_uuid(player) for player in event.data["players"])
+        user_ids.discard(None)
+        stats = self.model.objects.in_bulk(user_ids)
+        existing = set(stats)
+        for user_id in user_ids - existing:
+            stats[user_id] = ProjectedUserStats(user_id=user_id)
+
+        for event in events:
+            if event.type == "moved" and event.user_id is not None:
+                stats[event.user_id].moves += 1
+            elif event.type == "finished" and None not in event.data["players"]:
+                winner = _uuid(event.data["winner"])
+                for user_id in map(_uuid, event.data["players"]):
+                    player = stats[user_id]
+                    player.played += 1
+                    if winner is None:
+                        player.draws += 1
+                    elif winner == user_id:
+                        player.wins += 1
+                    else:
+                        player.losses += 1
+
+        _save(self.model, stats.values(), existing, ["played", "wins", "draws", "losses", "moves"])
+
+
+class OpeningsProjection(Projection):
+    """Opening book: results of finished games per canonical position they passed through.
+
+    Games finished before the second player joined are not counted. Moves of
+    games whose `finished` event predates carrying them are read from the games.
+    """
+
+    name = "openings"
+    model = OpeningPosition
+
+    def reset(self) -> None:
+        super().reset()
+        openings.invalidate()
+
+    def apply(self, events: List[GameEvent]) -> None:
+        finished = [
+            event
+            for event in events
+            if event.type == "finished" and None not in event.data["players"]
+        ]
+        if not finished:
+            return
+
+        stored = {}
+        missing = [event.game_id for event in finished if "sequence" not in event.data]
+        for model in (Game, ArchivedGame) if missing else ():
+            stored.update(
+                model.objects.filter(pk__in=missing).values_list("id", "move_sequence")
+            )
+
+        games = []
+        for event in finished:
+            if "sequence" in event.data:
+                sequence = bytes.fromhex(event.data["sequence"])
+            else:
+                sequence = bytes(stored.get(event.game_id, b""))
+            winner = event.data["winner"]
+            games.append((sequence, 0 if winner is None else 1 + event.data["players"].index(winner)))
+
+        rows = openings.book_rows(games)
+        positions = self.model.objects.in_bulk(rows)
+        existing = set(positions)
+        for position, (ply, played, wins_player_1, wins_player_2, draws) in rows.items():
+            row = positions.setdefault(position, OpeningPosition(position=position, ply=ply))
+            row.games += played
+            row.wins_player_1 += wins_player_1
+            row.wins_player_2 += wins_player_2
+            row.draws += draws
+
+        _save(
+            self.model,
+            positions.values(),
+            existing,
+            ["games", "wins_player_1", "wins_player_2", "draws"],
+        )
+        openings.invalidate()
+
+
+PROJECTIONS: Dict[str, Projection] = {
+    projection.name: projection
+    for projection in (
+        GameStateProjection(),
+        LeaderboardProjection(),
+        UserStatsProjection(),
+        OpeningsProjection(),
+    )
+}
+
+
+def _committed(position: int, events: List[GameEvent]) -> List[GameEvent]:
+    """Cuts events off at the first gap in their ids that may still be filled.
+
+    Args:
+        position (int): id of the last applied event, 0 for the start of the log
+        events (List[GameEvent]): events following the position in the order of ids
+
+    Returns:
+        List[GameEvent]: events that can be applied in order
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.GAMES_PROJECTIONS_GAP_TIMEOUT)
+    for i, event in enumerate(events):
+        # The first event of the log may have any id
+        gap = event.id != position + 1 and (position or i)
+        if gap and event.created > cutoff:
+            return events[:i]
+        position = event.id
+    return events
+
+
+def catch_up(projection: Projection, batch_size: int = 1000) -> int:
+    """Applies the next batch of events to a projection.
+
+    The checkpoint row is locked for the duration of the batch, so concurrent
+    runs of the same projection apply every event once.
+
+    Args:
+        projection (Projection): projection to update
+        batch_size (int): maximum number of events applied
+
+    Returns:
+        int: number of applied events
+    """
+    with transaction.atomic():
+        ProjectionCheckpoint.objects.get_or_create(name=projection.name)
+        checkpoint = ProjectionCheckpoint.objects.select_for_update().get(name=projection.name)
+        events = _committed(
+            checkpoint.position,
+            list(GameEvent.objects.filter(id__gt=checkpoint.position).order_by("id")[:batch_size]),
+        )
+        if events:
+            projection.apply(events)
+            checkpoint.position = events[-1].id
+            checkpoint.save()
+
+    return len(events)
+
+
+def replay(projection: Projection, batch_size: int = 1000, rebuild: bool = False) -> int:
+    """Applies all pending events to a projection in batches.
+
+    Args:
+        projection (Projection): projection to update
+        batch_size (int): number of events applied per transaction
+        rebuild (bool): drop the read model and replay the log from its start
+
+    Returns:
+        int: number of applied events
+    """
+    if rebuild:
+        with transaction.atomic():
+            projection.reset()
+            ProjectionCheckpoint.objects.update_or_create(
+                name=projection.name, defaults={"position": 0}
+            )
+
+    applied = 0
+    while True:
+        count = catch_up(projection, batch_size)
+        applied += count
+        if count < batch_size:
+            return applied
+
+
+def _position(projection: Projection) -> int:
+    checkpoint = ProjectionCheckpoint.objects.filter(name=projection.name)
+    return checkpoint.values_list("position", flat=True).first() or 0
+
+
+def held_back(projection: Projection) -> Optional[int]:
+    """Checks if the next event of a projection is held back by a gap in event ids.
+
+    Args:
+        projection (Projection): projection to check
+
+    Returns:
+        Optional[int]: id of the held back event, None if the next event can be
+            applied or there is none
+    """
+    position = _position(projection)
+    event = GameEvent.objects.filter(id__gt=position).order_by("id").first()
+    if event is None or _committed(position, [event]):
+        return None
+    return event.id
+
+
+def lag(projection: Projection) -> Tuple[int, float]:
+    """Measures how far a projection is behind the event log.
+
+    Event ids may have gaps, so the number of events is an upper bound.
+
+    Args:
+        projection (Projection): projection to measure
+
+    Returns:
+        Tuple[int, float]: number of pending events and age of the oldest one in seconds
+    """
+    position = _position(projection)
+    pending = GameEvent.objects.filter(id__gt=position)
+    latest = pending.order_by("-id").values_list("id", flat=True).first()
+    if latest is None:
+        return 0, 0.0
+
+    oldest = pending.order_by("id").values_list("created", flat=True).first()
+    return latest - position, (timezone.now() - oldest).total_seconds()
@@ -0,0 +1,131 @@
+"""Elo ratings of players, updated as their games finish.
+
+New players move faster towards their real strength with a higher K-factor for
+their first `PROVISIONAL_GAMES` games.
+"""
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from django.db import transaction
+from django.db.models import F
+from tictactoe.games.models import GameEvent
+from tictactoe.users.models import INITIAL_RATING, User
+
+K_FACTOR = 24
+PROVISIONAL_K_FACTOR = 40
+PROVISIONAL_GAMES = 20
+
+
+def expected_score(rating: float, opponent_rating: float) -> float:
+    """Returns the expected score (1 for a win, 0.5 for a draw) against an opponent."""
+    return 1 / (1 + 10 ** ((opponent_rating - rating) / 400))
+
+
+def _k_factor(rated_games: int) -> int:
+    return PROVISIONAL_K_FACTOR if rated_games < PROVISIONAL_GAMES else K_FACTOR
+
+
+def updated_ratings(
+    player_1: Tuple[float, int], player_2: Tuple[float, int], score: float
+) -> Tuple[float, float]:
+    """Computes ratings of both players after a game between them.
+
+    Args:
+        player_1 (Tuple[float, int]): rating and number of rated games of `player_1`
+        player_2 (Tuple[float, int]): rating and number of rated games of `player_2`
+        score (float): score of `player_1`; 1 for a win, 0.5 for a draw, 0 for a loss
+
+    Returns:
+        Tuple[float, float]: new ratings of `player_1` and `player_2`
+    """
+    (rating_1, games_1), (rating_2, games_2) = player_1, player_2
+    expected = expected_score(rating_1, rating_2)
+    return (
+        rating_1 + _k_factor(games_1) * (score - expected),
+        rating_2 + _k_factor(games_2) * (expected - score),
+    )
+
+
+def _score(player_1_id, winner_id) -> float:
+    if winner_id is None:
+        return 0.5
+    return 1.0 if str(winner_id) == str(player_1_id) else 0.0
+
+
+def rate_game(player_1_id, player_2_id, winner_id: Optional[object]) -> None:
+    """Updates ratings of players of a finished game.
+
+    Must be called in the transaction finishing the game. Players are locked in
+    the order of their ids, so concurrently finishing games cannot deadlock.
+
+    Args:
+        player_1_id: id of `player_1`
+        player_2_id: id of `player_2`
+        winner_id: id of the winner, None for a draw
+    """
+    if player_1_id is None or player_2_id is None:
+        return
+
+    players = {
+        str(pk): (rating, rated_games)
+        for pk, rating, rated_games in User.objects.select_for_update()
+        .filter(pk__in=[player_1_id, player_2_id])
+        .order_by("pk")
+        .values_list("pk", "rating", "rated_games")
+    }
+    rating_1, rating_2 = updated_ratings(
+        players[str(player_1_id)], players[str(player_2_id)], _score(player_1_id, winner_id)
+    )
+    User.objects.filter(pk=player_1_id).update(rating=rating_1, rated_games=F("rated_games") + 1)
+    User.objects.filter(pk=player_2_id).update(rating=rating_2, rated_games=F("rated_games") + 1)
+
+
+def recompute(batch_size: int = 2000) -> int:
+    """Rebuilds ratings of all users by replaying finished games.
+
+    Results are streamed from the `finished` events of the log, which outlive
+    archived games, in the order the games finished, which ratings follow. Games
+    played before the log was introduced must be backfilled first. Only ratings
+    are kept in memory. Games finishing while ratings are recomputed are
+    overwritten, so moves should be paused meanwhile.
+
+    Args:
+        batch_size (int): games fetched and users updated per query
+
+    Returns:
+        int: number of replayed games
+    """
+    ratings: Dict[object, List] = defaultdict(lambda: [INITIAL_RATING, 0])
+
+    results = (
+        GameEvent.objects.filter(type="finished")
+        .order_by("id")
+        .values_list("data", flat=True)
+        .iterator(chunk_size=batch_size)
+    )
+
+    replayed = 0
+    for data in results:
+        (player_1_id, player_2_id), winner_id = data["players"], data["winner"]
+        if player_1_id is None or player_2_id is None:
+            # Games abandoned before the second player joined are not rated
+            continue
+        player_1, player_2 = ratings[player_1_id], ratings[player_2_id]
+        player_1[0], player_2[0] = updated_ratings(
+            tuple(player_1), tuple(player_2), _score(player_1_id, winner_id)
+        )
+        player_1[1] += 1
+        player_2[1] += 1
+        replayed += 1
+
+    with transaction.atomic():
+        User.objects.update(rating=INITIAL_RATING, rated_games=0)
+        User.objects.bulk_update(
+            [
+                User(pk=user_id, rating=rating, rated_games=rated_games)
+                for user_id, (rating, rated_games) in ratings.items()
+            ],
+            ["rating", "rated_games"],
+            batch_size=batch_size,
+        )
+
+    return replayed
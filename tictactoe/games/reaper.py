@@ -0,0 +1,82 @@
+"""Finishing of games whose move deadline has passed.
+
+Games that were never joined are finished without a winner (abandoned), and
+games in progress are forfeited by the player on turn. Expired games are found
+through the partial index of move deadlines and finished in bounded batches of
+set-based updates, each batch in its own short transaction.
+"""
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+from django.db import transaction
+from django.db.models import Case, F, When
+from django.utils import timezone
+from tictactoe.games import eventlog, events, metrics, ratings, snapshots
+from tictactoe.games.cache import hot_games
+from tictactoe.games.models import Game
+from tictactoe.games.services import GameService
+
+# Winner of a forfeited game: the opponent of the player on turn, who is
+# `player_1` before the first move
+FORFEIT_WINNER = Case(
+    When(next_turn_id=F("player_2_id"), then=F("player_1_id")), default=F("player_2_id")
+)
+
+
+def reap_batch(batch_size: int, now: Optional[datetime] = None) -> Dict[str, int]:
+    """Finishes a batch of games whose move deadline passed.
+
+    Rows are locked while the batch is finished; rows locked by moves in flight
+    are skipped, and games moved since they were selected are left open. Moves
+    lock the row too and check the game again once they hold the lock, so a move
+    that read the game before it was reaped is rejected instead of reopening it.
+
+    Args:
+        batch_size (int): maximum number of games finished by the batch
+        now (Optional[datetime]): games with a deadline before this moment
+            are finished, now by default
+
+    Returns:
+        Dict[str, int]: number of `abandoned` and `forfeit` games
+    """
+    now = now or timezone.now()
+    with transaction.atomic():
+        expired: Dict[object, Tuple[str, int]] = {
+            game_id: (status, version)
+            for game_id, status, version in Game.objects.select_for_update(skip_locked=True)
+            .filter(move_deadline__lt=now)
+            .order_by("move_deadline")
+            .values_list("id", "status", "version")[:batch_size]
+        }
+        if not expired:
+            return {"abandoned": 0, "forfeit": 0}
+
+        finish = {"status": "finished", "next_turn": None, "move_deadline": None}
+        for status, changes in (
+            ("not_started", {}),
+            ("in_progress", {"winner_id": FORFEIT_WINNER}),
+        ):
+            Game.objects.filter(
+                pk__in=[game_id for game_id, (current, _) in expired.items() if current == status],
+                status=status,
+                move_deadline__lt=now,
+            ).update(version=F("version") + 1, **finish, **changes)
+
+        games = [
+            game
+            for game in Game.objects.filter(pk__in=list(expired), status="finished")
+            if game.version == expired[game.id][1] + 1
+        ]
+        eventlog.record_finished(games)
+        for game in games:
+            ratings.rate_game(game.player_1_id, game.player_2_id, game.winner_id)
+            GameService._queue_finished_game_tasks(game)
+
+    counts = {"abandoned": 0, "forfeit": 0}
+    for game in games:
+        outcome = "abandoned" if expired[game.id][0] == "not_started" else "forfeit"
+        counts[outcome] += 1
+        metrics.games_reaped.inc(outcome=outcome)
+        hot_games.discard(game.id)
+        snapshots.invalidate(game.id, expired[game.id][1])
+        events.publish_timeout(game.id, game.winner_id, game.version)
+    return counts
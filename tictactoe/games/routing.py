@@ -0,0 +1,86 @@
+from bisect import bisect
+from contextlib import contextmanager
+from hashlib import blake2b
+from threading import Lock
+from typing import Iterable, Iterator, List, Optional, Tuple
+from django.conf import settings
+from tictactoe.games import metrics
+
+# Response header naming the node that owns a game; load balancers route
+# requests carrying it (or the game id in the URL) to that node
+ROUTING_HEADER = "X-Game-Route"
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent hash ring assigning keys, e.g. game ids, to nodes.
+
+    Every node is placed on the ring many times (virtual nodes), so keys spread
+    evenly and adding or removing a node only moves the keys of that node.
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), replicas: int = 128) -> None:
+        """
+        Args:
+            nodes (Iterable[str]): names of nodes, e.g. worker addresses
+            replicas (int): number of virtual nodes per node
+        """
+        self.replicas = replicas
+        self._points: List[Tuple[int, str]] = []
+        for node in nodes:
+            self.add(node)
+
+    def __len__(self) -> int:
+        return len(self._points) // self.replicas
+
+    def add(self, node: str) -> None:
+        points = [(_hash(f"{node}#{i}"), node) for i in range(self.replicas)]
+        self._points = sorted(self._points + points)
+
+    def remove(self, node: str) -> None:
+        self._points = [point for point in self._points if point[1] != node]
+
+    def node_for(self, key) -> Optional[str]:
+        """Returns the node owning a key or None if the ring is empty."""
+        if not self._points:
+            return None
+        index = bisect(self._points, (_hash(str(key)), "")) % len(self._points)
+        return self._points[index][1]
+
+
+class GameDispatcher:
+    """Serializes work on the same game within a process.
+
+    Games are spread over a fixed number of locks, so moves of a game routed to
+    its owning node run one at a time without locking rows in the database.
+    """
+
+    def __init__(self, stripes: int = 64) -> None:
+        self._locks = [Lock() for _ in range(stripes)]
+
+    @contextmanager
+    def lock(self, game_id) -> Iterator[None]:
+        with self._locks[_hash(str(game_id)) % len(self._locks)]:
+            yield
+
+
+ring = HashRing(settings.GAMES_ROUTING_NODES)
+dispatcher = GameDispatcher()
+
+
+def route(game_id) -> Optional[str]:
+    """Returns the node owning a game and counts requests it gets elsewhere.
+
+    Args:
+        game_id: id of the requested game
+
+    Returns:
+        Optional[str]: owning node or None if routing is not configured
+    """
+    node = ring.node_for(game_id)
+    if node is not None and settings.GAMES_ROUTING_NODE not in (None, node):
+        metrics.misrouted_requests.inc()
+    return node
@@ -1,11 +1,12 @@
 from rest_framework import serializers
-from tictactoe.games.models import Game, Move
+from tictactoe.games.boards import board_fields, board_moves
+from tictactoe.games.models import ArchivedGame, Game, Move
 
 
 class GameSerializer(serializers.ModelSerializer):
     class Meta:
         model = Game
-        fields = "__all__"
+        exclude = ("move_sequence", "move_deadline")
         read_only_fields = (
             "player_1",
             "player_2",
@@ -14,6 +15,20 @@ class GameSerializer(serializers.ModelSerializer):
             "next_turn",
         )
 
+    def to_representation(self, instance: Game) -> dict:
+        data = super().to_representation(instance)
+        representation = self.context.get("board")
+
+        if representation is not None:
+            data.update(
+                board_fields(
+                    board_moves(instance.id, isinstance(instance, ArchivedGame)),
+                    representation,
+                )
+            )
+
+        return data
+
 
 class MoveSerializer(serializers.ModelSerializer):
     class Meta:
@@ -1,8 +1,29 @@
-from typing import Union
-from tictactoe.games.models import Game, Move, MARKS
+from dataclasses import replace
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple, Union
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from tictactoe.games import eventlog, events, metrics, ratings, snapshots, tasks
+from tictactoe.games.cache import GameState, hot_games
+from tictactoe.games.models import Game, Move, GRID_LEN, MARKS, unpack_sequence
+from tictactoe.tasks import queue
 from tictactoe.users.models import User
 import random
 
+OPEN_STATUSES = ("not_started", "in_progress")
+TOO_MANY_OPEN_GAMES = "You have too many open games"
+
+
+def _deadline(timeout: int) -> Optional[datetime]:
+    """Returns the time `timeout` seconds from now, or None for a disabled timeout."""
+    return timezone.now() + timedelta(seconds=timeout) if timeout else None
+
+
+def _move_deadline(status: str) -> Optional[datetime]:
+    """Returns the deadline of the next move of a game in given status, None once it finished."""
+    return None if status == "finished" else _deadline(settings.GAMES_MOVE_TIMEOUT)
+
 
 class GameService:
     """Service class that manages the flow of the game.
@@ -28,7 +49,57 @@ class GameService:
         else:
             game.player_2 = user
 
-        game.save()
+        game.move_deadline = _deadline(settings.GAMES_JOIN_TIMEOUT)
+        with transaction.atomic():
+            game.save()
+            eventlog.record_created(game, user.pk)
+        metrics.games_created.inc()
+
+    @classmethod
+    def count_open_games(cls, user: user_model) -> int:
+        """Counts games of a user that have not finished yet.
+
+        Both counts are answered from the (player, status) indexes.
+
+        Args:
+            user (user_model): player whose games are counted
+
+        Returns:
+            int: number of open games
+        """
+        return sum(
+            Game.objects.filter(**{player: user, "status__in": OPEN_STATUSES}).count()
+            for player in ("player_1", "player_2")
+        )
+
+    @classmethod
+    def can_open_game(cls, user: user_model) -> bool:
+        """Checks if a user may create or join another game under `GAMES_MAX_OPEN_GAMES`.
+
+        Args:
+            user (user_model): user who opens a game
+
+        Returns:
+            bool: True if the user is below the cap of open games
+        """
+        limit = settings.GAMES_MAX_OPEN_GAMES
+        return not limit or cls.count_open_games(user) < limit
+
+    @classmethod
+    def _lock(cls, game: Game) -> None:
+        """Locks the row of a game until the end of the transaction, reloading the
+        game if it changed since it was loaded.
+
+        Changes validated against an outdated game would overwrite a change
+        committed meanwhile, e.g. a concurrent move or the reaper finishing the
+        game, with another state under the same version.
+
+        Args:
+            game (Game): game reloaded in place; must be called in a transaction
+        """
+        locked = Game.objects.select_for_update().filter(pk=game.pk)
+        if locked.values_list("version", flat=True).get() != game.version:
+            game.refresh_from_db()
 
     @classmethod
     def join_game(cls, game: Game, user: user_model) -> dict:
@@ -41,29 +112,52 @@ class GameService:
         Returns:
             dict: dict providing information about action competion or errors that occured
         """
+        with transaction.atomic():
+            cls._lock(game)
+            error = cls._join_error(game, user)
+            if error is not None:
+                return {"error": error}
+
+            if game.player_1 is None:
+                game.player_1 = user
+            else:
+                game.player_2 = user
+
+            version = game.version
+            game.status = "in_progress"
+            game.move_deadline = _deadline(settings.GAMES_MOVE_TIMEOUT)
+            game.save()
+            eventlog.record_joined(game, user.pk)
+        snapshots.invalidate(game.id, version)
+        hot_games.discard(game.id)
+        events.publish_join(game.id, user.pk, game.status, game.version)
+        metrics.matchmaking_wait.observe((timezone.now() - game.created).total_seconds())
+
+        return {"status": "Joined a game"}
+
+    @classmethod
+    def _join_error(cls, game: Game, user: user_model) -> Optional[str]:
         if game.status == "finished":
-            return {"error": "This game has already finished"}
+            return "This game has already finished"
 
         if game.is_user_in_game(user=user):
-            return {"error": "You already joined this game"}
+            return "You already joined this game"
 
         if game.is_full:
-            return {"error": "This game is already full"}
+            return "This game is already full"
 
-        if game.player_1 is None:
-            game.player_1 = user
-        else:
-            game.player_2 = user
+        if not cls.can_open_game(user):
+            return TOO_MANY_OPEN_GAMES
 
-        game.status = "in_progress"
-        game.save()
-
-        return {"status": "Joined a game"}
+        return None
 
     @classmethod
     def move(cls, game: Game, data: dict, user: user_model) -> dict:
         """Performs the user requested move in a game.
 
+        The game is locked and reloaded before the move is validated, so moves and
+        other changes of the game are applied one after another.
+
         Args:
             game (Game): Game object instance for which action ought to be performed
             data (dict): coordinates (row, column) for the move
@@ -72,34 +166,185 @@ class GameService:
         Returns:
             dict: dict providing information about action competion or errors that occured
         """
-        if not game.is_user_in_game(user=user):
-            return {"error": "You are not part of this game"}
+        with transaction.atomic():
+            cls._lock(game)
+            if not game.is_user_in_game(user=user):
+                return {"error": "You are not part of this game"}
+
+            if game.status == "finished":
+                return {"error": "This game has already finished"}
+
+            if game.status == "not_started":
+                return {"error": "Wait for the other player to join"}
+
+            version = game.version
+            player, mark = game.get_next_player_and_mark()
+            if player != user:
+                return {"error": "This is not your turn now"}
+
+            if not game.is_move_valid(row=data["row"], column=data["column"]):
+                return {"error": "You cannot make this move"}
+
+            ply = game.append_move(row=data["row"], column=data["column"])
+            move = Move(
+                game=game,
+                player=user,
+                row=data["row"],
+                column=data["column"],
+                mark=mark,
+            )
+            if settings.GAMES_PACKED_MOVES:
+                move.id = ply
+            else:
+                move.save()
+            cls._update_game_status(game=game)
+            eventlog.record_move(move, game)
+            if game.status == "finished":
+                cls._finish_game(game)
+        metrics.moves.inc()
+
+        snapshots.invalidate(game.id, version)
+        hot_games.discard(game.id)
+        events.publish_move(move, game.status, game.winner_id, game.next_turn_id, game.version)
 
-        if game.status == "finished":
-            return {"error": "This game has already finished"}
+        return {"move": move}
 
-        if game.status == "not_started":
-            return {"error": "Wait for the other player to join"}
+    @classmethod
+    def move_cached(cls, game_id, data: dict, user: user_model) -> dict:
+        """Performs the user requested move validated against the hot game cache.
 
-        player, mark = game.get_next_player_and_mark()
-        if player != user:
-            return {"error": "This is not your turn now"}
+        The move is written through to the database with an update conditional on
+        the version it was validated against. If the game changed meanwhile, e.g.
+        in another process, the state is dropped from the cache and the move is
+        validated and written again on the current state.
 
-        if not game.is_move_valid(row=data["row"], column=data["column"]):
-            return {"error": "You cannot make this move"}
+        Args:
+            game_id: id of the game in which the move is performed
+            data (dict): coordinates (row, column) for the move
+            user (user_model): user who performs the move
 
-        move = Move.objects.create(
-            game=game,
-            player=user,
-            row=data["row"],
-            column=data["column"],
-            mark=mark,
-        )
+        Returns:
+            dict: dict providing information about action competion or errors that occured
 
-        cls._update_game_status(game=game)
+        Raises:
+            Game.DoesNotExist: if there is no such game
+        """
+        row, column = data["row"], data["column"]
+        state = hot_games.get(game_id)
+        if state is not None and state.move_error(user.pk, row, column) is not None:
+            # Moves rejected by a cached state are checked again on the current one
+            state = None
+
+        while True:
+            if state is None:
+                state = GameState.load(game_id)
+                hot_games.put(state)
+                error = state.move_error(user.pk, row, column)
+                if error is not None:
+                    return {"error": error}
+
+            played, mark = cls._played(state, row, column)
+            move = Move(game_id=state.id, player=user, row=row, column=column, mark=mark)
+            with transaction.atomic():
+                updated = Game.objects.filter(pk=state.id, version=state.version).update(
+                    next_turn_id=played.next_turn_id,
+                    winner_id=played.winner_id,
+                    status=played.status,
+                    version=played.version,
+                    move_sequence=played.move_sequence,
+                    move_deadline=_move_deadline(played.status),
+                )
+                if updated:
+                    if settings.GAMES_PACKED_MOVES:
+                        move.id = len(played.move_sequence)
+                    else:
+                        move.save()
+                    eventlog.record_move(move, played)
+                    if played.status == "finished":
+                        cls._finish_game(played)
+            if updated:
+                break
+            # The game changed since the state was read
+            hot_games.discard(state.id)
+            state = None
+
+        hot_games.put(played)
+        snapshots.invalidate(state.id, state.version)
+        events.publish_move(
+            move, played.status, played.winner_id, played.next_turn_id, played.version
+        )
+        metrics.moves.inc()
 
         return {"move": move}
 
+    @classmethod
+    def _played(cls, state: GameState, row: int, column: int) -> Tuple[GameState, str]:
+        """Returns the state of a game after a valid move of the player on turn.
+
+        Args:
+            state (GameState): state the move is made in
+            row (int): row in which mark is placed
+            column (int): col in which mark is placed
+
+        Returns:
+            Tuple[GameState, str]: state after the move and the mark placed
+        """
+        player_id, mark = state.next_player_and_mark()
+        board = state.board
+        board[row][column] = mark
+        winning_mark = Grid(board=board).find_winner()
+
+        played = replace(
+            state,
+            next_turn_id=state.player_2_id if player_id == state.player_1_id else state.player_1_id,
+            version=state.version + 1,
+            move_sequence=state.move_sequence + bytes((row * GRID_LEN + column,)),
+        )
+        if winning_mark is not None:
+            played = replace(played, status="finished", next_turn_id=None)
+        if winning_mark not in (None, "draw"):
+            winner_id = state.player_1_id if winning_mark == MARKS["player_1"] else state.player_2_id
+            played = replace(played, winner_id=winner_id)
+        return played, mark
+
+    @classmethod
+    def _finish_game(cls, game: Union[Game, GameState]) -> None:
+        """Rates the players of a game finished by a move and queues work following its end.
+
+        Shared by moves of stored and of cached games. Must be called in the
+        transaction finishing the game, once its result is set.
+
+        Args:
+            game (Union[Game, GameState]): finished game
+        """
+        ratings.rate_game(game.player_1_id, game.player_2_id, game.winner_id)
+        cls._queue_finished_game_tasks(game)
+        metrics.games_finished.inc(outcome="draw" if game.winner_id is None else "win")
+
+    @classmethod
+    def _queue_finished_game_tasks(cls, game: Union[Game, GameState]) -> None:
+        """Queues work following the end of a game that moves need not wait for.
+
+        Must be called in the transaction finishing the game, so that tasks are
+        queued only if the game is finished.
+
+        Args:
+            game (Union[Game, GameState]): finished game
+        """
+        queue.enqueue(tasks.update_projections, key=f"update_projections:{game.id}")
+        if game.player_1_id is None or game.player_2_id is None:
+            # Games abandoned before the second player joined count in no stats
+            return
+        queue.enqueue(
+            tasks.update_user_stats,
+            {
+                "players": [str(game.player_1_id), str(game.player_2_id)],
+                "winner": None if game.winner_id is None else str(game.winner_id),
+                "moves": len(game.move_sequence),
+            },
+            key=f"update_user_stats:{game.id}",
+        )
+
     @classmethod
     def _update_game_status(cls, game: Game) -> None:
         """Updates the status of a game after checking if there are any winners or if game has concluded without one.
@@ -129,16 +374,30 @@ class GameService:
             game.winner = winner
             game.status = "finished"
             game.next_turn = None
+        game.move_deadline = _move_deadline(game.status)
         game.save()
 
 
 class Grid:
     """Supporting class that allows to find a winner of a game (if any)."""
 
-    def __init__(self, game: Game, grid_len: int = 3) -> None:
-        self.grid_len = grid_len
-        self.moves = game.moves
-        self.grid = [[None] * self.grid_len for _ in range(self.grid_len)]
+    def __init__(
+        self,
+        game: Optional[Game] = None,
+        grid_len: int = 3,
+        board: Optional[List[List[Union[str, None]]]] = None,
+    ) -> None:
+        """Creates a grid for a stored game or for an in-memory board.
+
+        Args:
+            game (Optional[Game]): game whose moves populate the grid
+            grid_len (int): length of the grid side
+            board (Optional[List[List[Union[str, None]]]]): already populated grid
+                of marks used instead of game's moves
+        """
+        self.grid_len = len(board) if board is not None else grid_len
+        self.game = game
+        self.grid = board or [[None] * self.grid_len for _ in range(self.grid_len)]
         self.rng = range(self.grid_len)
 
     def find_winner(self) -> Union[str, None]:
@@ -155,10 +414,18 @@ class Grid:
 
     def _prepare_grid(self) -> None:
         """Populates grid with all of the moves performed for given game."""
+        if self.game is None:
+            return
+
+        if settings.GAMES_PACKED_MOVES:
+            for row, col, mark in unpack_sequence(self.game.move_sequence):
+                self.grid[row][col] = mark
+            return
+
         for row in self.rng:
             for col in self.rng:
                 try:
-                    self.grid[row][col] = self.moves.get(row=row, column=col).mark
+                    self.grid[row][col] = self.game.moves.get(row=row, column=col).mark
                 except Move.DoesNotExist:
                     pass
 
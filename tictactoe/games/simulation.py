@@ -0,0 +1,193 @@
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple, Union
+import random
+from tictactoe.games.models import Game, MARKS
+from tictactoe.games.services import GameService, Grid
+
+Board = List[List[Union[str, None]]]
+Cell = Tuple[int, int]
+
+GRID_LEN = 3
+
+
+class RandomPlayer:
+    """Simulated player that picks any free cell."""
+
+    name = "random"
+
+    def choose(self, board: Board, mark: str) -> Cell:
+        return random.choice(free_cells(board))
+
+
+class AIPlayer:
+    """Simulated player that plays perfectly using a memoized minimax search.
+
+    Equally good moves are picked at random so that simulated games differ.
+    """
+
+    name = "ai"
+
+    def choose(self, board: Board, mark: str) -> Cell:
+        cells = tuple(cell for row in board for cell in row)
+        scores = _move_scores(cells, mark)
+        best = max(scores.values())
+
+        return random.choice([cell for cell, score in scores.items() if score == best])
+
+
+PLAYERS = {player.name: player for player in (RandomPlayer, AIPlayer)}
+
+
+@dataclass
+class SimulationStats:
+    """Aggregated results of simulated games that can be merged across workers."""
+
+    games: int = 0
+    moves: int = 0
+    outcomes: Counter = field(default_factory=Counter)
+    phases: Dict[str, float] = field(default_factory=lambda: defaultdict(float))
+
+    def merge(self, other: "SimulationStats") -> "SimulationStats":
+        self.games += other.games
+        self.moves += other.moves
+        self.outcomes.update(other.outcomes)
+        for phase, elapsed in other.phases.items():
+            self.phases[phase] += elapsed
+        return self
+
+
+def free_cells(board: Board) -> List[Cell]:
+    """Returns coordinates of all empty cells of a board."""
+    return [
+        (row, col)
+        for row, marks in enumerate(board)
+        for col, mark in enumerate(marks)
+        if mark is None
+    ]
+
+
+@lru_cache(maxsize=None)
+def _move_scores(cells: Tuple[Union[str, None], ...], mark: str) -> Dict[Cell, int]:
+    """Scores every available move from the point of view of the player with `mark`.
+
+    Quicker wins (and slower losses) score higher, draws score 0.
+    """
+    other = MARKS["player_2"] if mark == MARKS["player_1"] else MARKS["player_1"]
+    scores = {}
+
+    for i, cell in enumerate(cells):
+        if cell is not None:
+            continue
+        child = cells[:i] + (mark,) + cells[i + 1:]
+        board = [list(child[r * GRID_LEN:(r + 1) * GRID_LEN]) for r in range(GRID_LEN)]
+        result = Grid(board=board).find_winner()
+
+        if result == mark:
+            score = 1 + child.count(None)
+        elif result == "draw":
+            score = 0
+        else:
+            score = -max(_move_scores(child, other).values())
+        scores[(i // GRID_LEN, i % GRID_LEN)] = score
+
+    return scores
+
+
+def play_memory_game(player_1, player_2) -> SimulationStats:
+    """Plays a single game using only the in-memory game rules.
+
+    Args:
+        player_1: simulated player using `player_1` mark
+        player_2: simulated player using `player_2` mark
+
+    Returns:
+        SimulationStats: stats of a played game
+    """
+    stats = SimulationStats(games=1)
+    board = [[None] * GRID_LEN for _ in range(GRID_LEN)]
+    turns = ((player_1, MARKS["player_1"]), (player_2, MARKS["player_2"]))
+    result = None
+
+    while result is None:
+        player, mark = turns[stats.moves % 2]
+
+        start = perf_counter()
+        row, col = player.choose(board, mark)
+        chosen = perf_counter()
+        board[row][col] = mark
+        result = Grid(board=board).find_winner()
+        stats.phases["choose"] += chosen - start
+        stats.phases["rules"] += perf_counter() - chosen
+        stats.moves += 1
+
+    stats.outcomes[result] += 1
+    return stats
+
+
+def play_service_game(users: Tuple, player_1, player_2) -> SimulationStats:
+    """Plays a single game through `GameService` against the database.
+
+    Args:
+        users (Tuple): two users taking part in the game
+        player_1: simulated player of the game's `player_1`
+        player_2: simulated player of the game's `player_2`
+
+    Returns:
+        SimulationStats: stats of a played game
+    """
+    stats = SimulationStats(games=1)
+
+    start = perf_counter()
+    game = Game.objects.create()
+    GameService.set_up_player(game=game, user=users[0])
+    GameService.join_game(game=game, user=users[1])
+    stats.phases["setup"] += perf_counter() - start
+
+    players = {game.player_1: player_1, game.player_2: player_2}
+    board = [[None] * GRID_LEN for _ in range(GRID_LEN)]
+
+    while game.status != "finished":
+        user, mark = game.get_next_player_and_mark()
+
+        start = perf_counter()
+        row, col = players[user].choose(board, mark)
+        chosen = perf_counter()
+        result = GameService.move(game=game, data={"row": row, "column": col}, user=user)
+        stats.phases["choose"] += chosen - start
+        stats.phases["move"] += perf_counter() - chosen
+
+        if "error" in result:
+            raise RuntimeError(result["error"])
+        board[row][col] = mark
+        stats.moves += 1
+
+    outcome = Grid(board=board).find_winner()
+    stats.outcomes[outcome] += 1
+    return stats
+
+
+def run_memory_games(
+    games: int, player_1: str, player_2: str, seed: Optional[int] = None
+) -> SimulationStats:
+    """Plays a batch of in-memory games; used as a process pool task.
+
+    Args:
+        games (int): number of games to play
+        player_1 (str): name of the `player_1` simulated player
+        player_2 (str): name of the `player_2` simulated player
+        seed (Optional[int]): seed of the random generator
+
+    Returns:
+        SimulationStats: merged stats of all played games
+    """
+    random.seed(seed)
+    players = (PLAYERS[player_1](), PLAYERS[player_2]())
+    stats = SimulationStats()
+
+    for _ in range(games):
+        stats.merge(play_memory_game(*players))
+
+    return stats
@@ -0,0 +1,196 @@
+from datetime import datetime, tzinfo
+from typing import Iterable, List, Optional
+import json
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import QuerySet
+from django.utils import timezone
+from rest_framework import ISO_8601
+from rest_framework.settings import api_settings
+from tictactoe.games.boards import BOARD_REPRESENTATIONS, board_fields, board_moves
+from tictactoe.games.models import ArchivedGame, ArchivedMove, Game, Move, unpack_moves
+from tictactoe.metrics.collectors import record_cache_access
+from tictactoe.metrics.middleware import timed_serialization
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+# Payload keys mapped to the columns they are read from, in `GameSerializer` and
+# `MoveSerializer` field order
+GAME_FIELDS = {
+    "id": "id",
+    "status": "status",
+    "created": "created",
+    "version": "version",
+    "player_1": "player_1_id",
+    "player_2": "player_2_id",
+    "winner": "winner_id",
+    "next_turn": "next_turn_id",
+}
+MOVE_FIELDS = {
+    "id": "id",
+    "row": "row",
+    "column": "column",
+    "mark": "mark",
+    "game": "game_id",
+    "player": "player_id",
+}
+GAME_UUID_FIELDS = ("id", "player_1", "player_2", "winner", "next_turn")
+MOVE_UUID_FIELDS = ("game", "player")
+
+
+def dumps(data) -> bytes:
+    """Encodes data as compact JSON, using `orjson` when it is installed.
+
+    Args:
+        data: JSON serializable data
+
+    Returns:
+        bytes: encoded data
+    """
+    with timed_serialization():
+        if orjson is not None:
+            return orjson.dumps(data)
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def format_datetime(value: datetime, tz: Optional[tzinfo] = None) -> str:
+    """Formats a datetime the same way DRF `DateTimeField` does.
+
+    Args:
+        value (datetime): datetime to format
+        tz (Optional[tzinfo]): timezone to convert aware datetimes to; defaults to
+            the current timezone
+
+    Returns:
+        str: formatted datetime
+    """
+    if timezone.is_aware(value):
+        value = value.astimezone(tz or timezone.get_current_timezone())
+    if api_settings.DATETIME_FORMAT.lower() == ISO_8601:
+        value = value.isoformat()
+        return value[:-6] + "Z" if value.endswith("+00:00") else value
+    return value.strftime(api_settings.DATETIME_FORMAT)
+
+
+def _rows_to_payload(rows: Iterable[tuple], fields: dict, uuid_fields: tuple) -> List[dict]:
+    keys = list(fields)
+    tz = timezone.get_current_timezone()
+    payload = []
+    # Rows are fetched before timing, so that queries are not counted as serialization
+    rows = list(rows)
+    with timed_serialization():
+        for row in rows:
+            item = dict(zip(keys, row))
+            for key in uuid_fields:
+                if item[key] is not None:
+                    item[key] = str(item[key])
+            if "created" in item:
+                item["created"] = format_datetime(item["created"], tz)
+            payload.append(item)
+
+    return payload
+
+
+def game_values(queryset: QuerySet) -> QuerySet:
+    """Narrows a game queryset down to tuples of the columns of a game payload."""
+    return queryset.values_list(*GAME_FIELDS.values())
+
+
+def games_payload(rows: Iterable[tuple]) -> List[dict]:
+    """Builds game payloads from `game_values()` tuples."""
+    return _rows_to_payload(rows, GAME_FIELDS, GAME_UUID_FIELDS)
+
+
+def moves_payload(rows: Iterable[tuple]) -> List[dict]:
+    """Builds move payloads from tuples of `MOVE_FIELDS` columns."""
+    return _rows_to_payload(rows, MOVE_FIELDS, MOVE_UUID_FIELDS)
+
+
+def _cache_key(kind: str, game_id, version: int) -> str:
+    return f"games:{kind}:{game_id}:{version}"
+
+
+def _cached(kind: str, game_id, version: int, build) -> bytes:
+    key = _cache_key(kind, game_id, version)
+    payload = cache.get(key)
+    record_cache_access(f"game_{kind}", payload is not None)
+
+    if payload is None:
+        payload = build()
+        cache.set(key, payload, settings.GAMES_SNAPSHOT_CACHE_TIMEOUT)
+
+    return payload
+
+
+def game_snapshot(
+    game_id, version: int, board: Optional[str] = None, archived: bool = False
+) -> Optional[bytes]:
+    """Returns the JSON payload of a game in given version, cached per version.
+
+    Archived games keep the version they were archived in and their payload
+    does not change, so they share cache entries with the live game.
+
+    Args:
+        game_id: id of the game
+        version (int): current version of the game
+        board (Optional[str]): board representation added to the payload, one of
+            `BOARD_REPRESENTATIONS`
+        archived (bool): whether the game is read from the archive tables
+
+    Returns:
+        Optional[bytes]: encoded game or None if the game does not exist
+    """
+
+    def build():
+        model = ArchivedGame if archived else Game
+        payload = games_payload(game_values(model.objects.filter(pk=game_id)))
+        if not payload:
+            return None
+        if board is not None:
+            payload[0].update(board_fields(board_moves(game_id, archived), board))
+        return dumps(payload[0])
+
+    kind = "snapshot" if board is None else f"snapshot_{board}"
+    return _cached(kind, game_id, version, build)
+
+
+def moves_snapshot(game_id, version: int, archived: bool = False) -> bytes:
+    """Returns the JSON payload of moves of a game in given version, cached per version.
+
+    Args:
+        game_id: id of the game
+        version (int): current version of the game
+        archived (bool): whether the game is read from the archive tables
+
+    Returns:
+        bytes: encoded list of moves
+    """
+
+    def build():
+        if settings.GAMES_PACKED_MOVES:
+            model = ArchivedGame if archived else Game
+            games = model.objects.filter(pk=game_id).only(
+                "move_sequence", "player_1", "player_2"
+            )
+            moves = [move for game in games for move in unpack_moves(game)]
+            rows = [[getattr(move, column) for column in MOVE_FIELDS.values()] for move in moves]
+            return dumps(moves_payload(rows))
+
+        model = ArchivedMove if archived else Move
+        rows = (
+            model.objects.filter(game_id=game_id)
+            .order_by("id")
+            .values_list(*MOVE_FIELDS.values())
+        )
+        return dumps(moves_payload(rows))
+
+    return _cached("moves", game_id, version, build)
+
+
+def invalidate(game_id, version: int) -> None:
+    """Drops cached payloads of a game version that has just been superseded."""
+    kinds = ["snapshot", "moves"] + [f"snapshot_{board}" for board in BOARD_REPRESENTATIONS]
+    cache.delete_many([_cache_key(kind, game_id, version) for kind in kinds])
@@ -0,0 +1,33 @@
+"""Background tasks run after changes of games, see `tictactoe.tasks`."""
+from typing import List, Optional
+from django.conf import settings
+from tictactoe.games import projections
+from tictactoe.tasks import queue
+from tictactoe.tasks.queue import task
+from tictactoe.users import stats
+
+
+@task
+def update_projections() -> None:
+    """Applies pending game events to all projections.
+
+    Events held back by a gap in event ids are applied by a run queued for when
+    the gap times out, once per held back event.
+    """
+    held_back = []
+    for projection in projections.PROJECTIONS.values():
+        projections.replay(projection)
+        held_back.append(projections.held_back(projection))
+    event_id = min(filter(None, held_back), default=None)
+    if event_id is not None:
+        queue.enqueue(
+            update_projections,
+            key=f"update_projections:gap:{event_id}",
+            delay=settings.GAMES_PROJECTIONS_GAP_TIMEOUT,
+        )
+
+
+@task
+def update_user_stats(players: List[str], winner: Optional[str], moves: int) -> None:
+    """Counts a finished game in stats of its players."""
+    stats.record_game(players, winner, moves)
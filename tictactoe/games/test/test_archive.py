@@ -0,0 +1,107 @@
+from datetime import timedelta
+from io import StringIO
+from django.core.cache import cache
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from tictactoe.games.archive import archive_batch
+from tictactoe.games.models import ArchivedGame, ArchivedMove, Game
+from tictactoe.games.services import GameService
+from tictactoe.users.test.factories import UserFactory
+
+
+class TestArchive(APITestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.player_1 = UserFactory()
+        self.player_2 = UserFactory()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.player_1.auth_token}")
+        self.old = timezone.now() - timedelta(days=60)
+        self.game = self._play_won_game(created=self.old)
+
+    def _play_won_game(self, created) -> Game:
+        game = Game.objects.create(
+            player_1=self.player_1, player_2=self.player_2, status="in_progress"
+        )
+        for row, column in ((0, 0), (1, 0), (0, 1), (1, 1), (0, 2)):
+            user, _ = game.get_next_player_and_mark()
+            GameService.move(game, {"row": row, "column": column}, user)
+        Game.objects.filter(pk=game.pk).update(created=created)
+        game.refresh_from_db()
+        return game
+
+    def _archive(self) -> int:
+        return archive_batch(timezone.now() - timedelta(days=30), batch_size=10)
+
+    def test_archive_batch_moves_old_finished_games(self):
+        recent = self._play_won_game(created=timezone.now())
+        unfinished = Game.objects.create(player_1=self.player_1)
+        Game.objects.filter(pk=unfinished.pk).update(created=self.old)
+
+        self.assertEqual(1, self._archive())
+
+        self.assertFalse(Game.objects.filter(pk=self.game.pk).exists())
+        self.assertEqual(
+            {recent.pk, unfinished.pk}, set(Game.objects.values_list("pk", flat=True))
+        )
+        archived = ArchivedGame.objects.get(pk=self.game.pk)
+        self.assertEqual(self.game.version, archived.version)
+        self.assertEqual(self.game.winner_id, archived.winner_id)
+        self.assertEqual(5, ArchivedMove.objects.filter(game=archived).count())
+        self.assertEqual(0, self._archive())
+
+    def test_archive_games_command_runs_in_batches(self):
+        for _ in range(2):
+            self._play_won_game(created=self.old)
+        out = StringIO()
+
+        call_command("archive_games", "--days=30", "--batch-size=2", stdout=out)
+
+        self.assertEqual(0, Game.objects.count())
+        self.assertEqual(3, ArchivedGame.objects.count())
+        self.assertIn("Archived 3 games in 2 batches", out.getvalue())
+
+    def test_read_endpoints_fall_back_to_archive(self):
+        urls = [
+            reverse("game-detail", kwargs={"pk": self.game.pk}),
+            reverse("game-detail", kwargs={"pk": self.game.pk}) + "?board=string",
+            reverse("game-moves", kwargs={"pk": self.game.pk}),
+        ]
+        before = [self.client.get(url) for url in urls]
+        cache.clear()
+
+        self._archive()
+
+        for url, expected in zip(urls, before):
+            response = self.client.get(url)
+            self.assertEqual(status.HTTP_200_OK, response.status_code)
+            self.assertEqual(expected.content, response.content)
+            self.assertEqual(expected["ETag"], response["ETag"])
+
+    def test_browsable_api_falls_back_to_archive(self):
+        self._archive()
+
+        response = self.client.get(
+            reverse("game-moves", kwargs={"pk": self.game.pk}), HTTP_ACCEPT="text/html"
+        )
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+
+    def test_writes_to_archived_game_are_not_found(self):
+        self._archive()
+
+        response = self.client.post(
+            reverse("game-move", kwargs={"pk": self.game.pk}), {"row": 2, "column": 2}
+        )
+
+        self.assertEqual(status.HTTP_404_NOT_FOUND, response.status_code)
+
+    def test_highscores_count_archived_wins(self):
+        self._play_won_game(created=timezone.now())
+        self._archive()
+
+        response = self.client.get(reverse("highscore-detail", kwargs={"pk": self.player_1.pk}))
+
+        self.assertEqual(2, response.data["wins_count"])
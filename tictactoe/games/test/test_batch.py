@@ -0,0 +1,70 @@
+import numpy as np
+from django.test import TestCase, override_settings
+from tictactoe.games.batch import evaluate_boards, load_boards
+from tictactoe.games.models import Game, Move
+from tictactoe.users.test.factories import UserFactory
+
+
+class TestEvaluateBoards(TestCase):
+    def test_winners_and_draws(self):
+        boards = np.array(
+            [
+                [[1, 1, 1], [-1, -1, 0], [0, 0, 0]],
+                [[-1, 1, 0], [-1, 1, 0], [-1, 0, 0]],
+                [[1, -1, 0], [-1, 1, 0], [0, 0, 1]],
+                [[1, -1, -1], [0, -1, 1], [-1, 0, 1]],
+                [[1, -1, 1], [1, -1, -1], [-1, 1, 1]],
+                [[0, 0, 0], [0, 1, 0], [0, 0, 0]],
+            ],
+            dtype=np.int8,
+        )
+        winners, draws = evaluate_boards(boards)
+
+        self.assertEqual([1, -1, 1, -1, 0, 0], winners.tolist())
+        self.assertEqual([False, False, False, False, True, False], draws.tolist())
+
+    def test_k_in_a_row_on_bigger_board(self):
+        boards = np.zeros((2, 5, 5), dtype=np.int8)
+        boards[0, 1, 2] = boards[0, 2, 3] = boards[0, 3, 4] = -1
+        boards[1, 4, 0] = boards[1, 4, 1] = 1
+
+        winners, _ = evaluate_boards(boards, win_len=3)
+
+        self.assertEqual([-1, 0], winners.tolist())
+
+    def test_invalid_shape(self):
+        self.assertRaises(ValueError, evaluate_boards, np.zeros((2, 3, 4)))
+
+
+class TestLoadBoards(TestCase):
+    def test_load_boards(self):
+        player_1, player_2 = UserFactory(), UserFactory()
+        game = Game.objects.create(player_1=player_1, player_2=player_2)
+        empty_game = Game.objects.create()
+        Move.objects.create(game=game, player=player_1, row=0, column=2, mark="o")
+        Move.objects.create(game=game, player=player_2, row=1, column=1, mark="x")
+
+        with self.assertNumQueries(1):
+            game_ids, boards = load_boards([game.id, empty_game.id])
+
+        self.assertEqual([game.id, empty_game.id], game_ids)
+        self.assertEqual([[0, 0, 1], [0, -1, 0], [0, 0, 0]], boards[0].tolist())
+        self.assertFalse(boards[1].any())
+
+    @override_settings(GAMES_PACKED_MOVES=True)
+    def test_load_boards_from_packed_moves(self):
+        game = Game.objects.create(player_1=UserFactory(), player_2=UserFactory())
+        game.append_move(0, 2)
+        game.append_move(1, 1)
+        game.save()
+        empty_game = Game.objects.create()
+
+        with self.assertNumQueries(1):
+            game_ids, boards = load_boards([game.id, empty_game.id])
+
+        self.assertEqual([game.id, empty_game.id], game_ids)
+        self.assertEqual([[0, 0, 1], [0, -1, 0], [0, 0, 0]], boards[0].tolist())
+        self.assertFalse(boards[1].any())
+
+        game_ids, boards = load_boards()
+        self.assertEqual([game.id], game_ids)
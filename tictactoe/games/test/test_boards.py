@@ -0,0 +1,61 @@
+from base64 import b64decode
+import struct
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from tictactoe.games.boards import board_bitboard, board_string
+from tictactoe.games.models import Game, Move
+from tictactoe.games.serializers import GameSerializer
+from tictactoe.users.test.factories import UserFactory
+
+
+class TestBoards(APITestCase):
+    moves = [(0, 1, "o"), (0, 0, "x"), (1, 0, "x"), (1, 2, "o")]
+
+    def setUp(self) -> None:
+        self.player_1 = UserFactory()
+        self.player_2 = UserFactory()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.player_1.auth_token}")
+        self.game = Game.objects.create(
+            player_1=self.player_1, player_2=self.player_2, status="in_progress"
+        )
+        for row, column, mark in self.moves:
+            player = self.player_1 if mark == "o" else self.player_2
+            Move.objects.create(game=self.game, player=player, row=row, column=column, mark=mark)
+        self.url = reverse("game-detail", kwargs={"pk": self.game.id})
+
+    def test_board_string(self):
+        self.assertEqual("xo_x_o___", board_string(self.moves))
+
+    def test_board_bitboard(self):
+        o_mask, x_mask = struct.unpack(">HH", b64decode(board_bitboard(self.moves)))
+
+        self.assertEqual(0b000100010, o_mask)
+        self.assertEqual(0b000001001, x_mask)
+
+    def test_game_with_board(self):
+        for representation, board in (
+            ("string", "xo_x_o___"),
+            ("bitboard", board_bitboard(self.moves)),
+        ):
+            response = self.client.get(self.url, {"board": representation})
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(board, response.json()["board"])
+            self.assertEqual(4, response.json()["move_count"])
+
+    def test_game_without_board(self):
+        response = self.client.get(self.url)
+
+        self.assertNotIn("board", response.json())
+
+    def test_unsupported_board(self):
+        response = self.client.get(self.url, {"board": "png"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_serializer_with_board(self):
+        data = GameSerializer(self.game, context={"board": "string"}).data
+
+        self.assertEqual("xo_x_o___", data["board"])
+        self.assertEqual(4, data["move_count"])
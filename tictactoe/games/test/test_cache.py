@@ -0,0 +1,140 @@
+from unittest import mock
+from django.db import connection
+from django.db.models import F
+from django.test import SimpleTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from tictactoe.games.cache import GameState, HotGameCache, hot_games
+from tictactoe.games.models import Game
+from tictactoe.games.services import GameService
+from tictactoe.users.models import User
+from tictactoe.users.test.factories import UserFactory
+
+
+def _state(game_id: int, version: int = 1) -> GameState:
+    return GameState(game_id, None, None, None, None, "in_progress", version, b"")
+
+
+class TestHotGameCache(SimpleTestCase):
+    def test_evicts_least_recently_used(self):
+        cache = HotGameCache(max_size=2)
+        for game_id in (1, 2):
+            cache.put(_state(game_id))
+        cache.get(1)
+        cache.put(_state(3))
+
+        self.assertIsNotNone(cache.get(1))
+        self.assertIsNone(cache.get(2))
+        self.assertIsNotNone(cache.get(3))
+
+    def test_keeps_newer_version(self):
+        cache = HotGameCache(max_size=2)
+        cache.put(_state(1, version=5))
+        cache.put(_state(1, version=4))
+
+        self.assertEqual(5, cache.get(1).version)
+
+    def test_shared_backend(self):
+        writer = HotGameCache(max_size=2, backend="default")
+        reader = HotGameCache(max_size=2, backend="default")
+
+        writer.put(_state(1, version=3))
+
+        self.assertEqual(3, reader.get(1).version)
+        writer.discard(1)
+        reader.clear()
+        self.assertIsNone(reader.get(1))
+
+
+class TestCachedMoves(APITestCase):
+    def setUp(self) -> None:
+        hot_games.clear()
+        self.player_1 = User.objects.get(pk=UserFactory().pk)
+        self.player_2 = User.objects.get(pk=UserFactory().pk)
+        self.game = Game.objects.create(
+            player_1=self.player_1, player_2=self.player_2, status="in_progress"
+        )
+        self.url = reverse("game-move", kwargs={"pk": self.game.id})
+
+    def _move(self, user: User, row: int, column: int):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {user.auth_token}")
+        return self.client.post(self.url, {"row": row, "column": column})
+
+    def test_cached_moves_do_not_read_game(self):
+        self._move(self.player_1, 0, 0)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self._move(self.player_2, 1, 1)
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        game_reads = [
+            query["sql"]
+            for query in queries
+            if query["sql"].startswith("SELECT") and '"games_game"' in query["sql"]
+        ]
+        self.assertEqual([], game_reads)
+
+    def test_cached_moves_play_the_game(self):
+        for user, row, column in (
+            (self.player_1, 0, 0),
+            (self.player_2, 1, 0),
+            (self.player_1, 0, 1),
+            (self.player_2, 1, 1),
+            (self.player_1, 0, 2),
+        ):
+            self.assertEqual(status.HTTP_200_OK, self._move(user, row, column).status_code)
+        self.game.refresh_from_db()
+
+        self.assertEqual("finished", self.game.status)
+        self.assertEqual(self.player_1, self.game.winner)
+        self.assertIsNone(self.game.next_turn)
+        self.assertEqual(5, self.game.moves.count())
+        self.assertEqual(bytes((0, 3, 1, 4, 2)), bytes(self.game.move_sequence))
+        self.assertEqual(self.game.version, hot_games.get(self.game.id).version)
+
+    def test_rejects_invalid_moves(self):
+        self._move(self.player_1, 0, 0)
+
+        self.assertEqual("This is not your turn now", self._move(self.player_1, 2, 2).data["error"])
+        self.assertEqual("You cannot make this move", self._move(self.player_2, 0, 0).data["error"])
+
+    def test_stale_rejection_is_checked_on_current_state(self):
+        self._move(self.player_1, 0, 0)
+        # Another process plays a move without updating this process' cache
+        Game.objects.filter(pk=self.game.pk).update(
+            move_sequence=bytes((0, 4)), next_turn=self.player_1, version=F("version") + 1
+        )
+
+        response = self._move(self.player_1, 2, 2)
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.game.refresh_from_db()
+        self.assertEqual(bytes((0, 4, 8)), bytes(self.game.move_sequence))
+
+    def test_stale_state_is_not_written(self):
+        self._move(self.player_1, 0, 0)
+        # Another process plays two moves without updating this process' cache
+        Game.objects.filter(pk=self.game.pk).update(
+            move_sequence=bytes((0, 4, 8)), next_turn=self.player_2, version=F("version") + 2
+        )
+
+        with mock.patch.object(GameService, "move", wraps=GameService.move) as move:
+            response = self._move(self.player_2, 1, 0)
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        move.assert_not_called()
+        self.game.refresh_from_db()
+        self.assertEqual(bytes((0, 4, 8, 3)), bytes(self.game.move_sequence))
+        self.assertEqual(self.game.version, hot_games.get(self.game.id).version)
+
+    def test_unknown_game(self):
+        self.url = reverse("game-move", kwargs={"pk": "3f4cd4a4-1f5e-4f4e-9d0c-8cf6b8d9c6a1"})
+
+        self.assertEqual(status.HTTP_404_NOT_FOUND, self._move(self.player_1, 0, 0).status_code)
+
+    def test_malformed_game_id(self):
+        self.url = reverse("game-move", kwargs={"pk": "not-a-game"})
+
+        self.assertEqual(status.HTTP_404_NOT_FOUND, self._move(self.player_1, 0, 0).status_code)
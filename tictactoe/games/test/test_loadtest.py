@@ -0,0 +1,34 @@
+from django.test import TransactionTestCase
+from tictactoe.games.benchmarking import percentile
+from tictactoe.games.loadtest import Fixtures, run_scenario, seed
+from tictactoe.users.models import User
+
+
+class TestLoadTest(TransactionTestCase):
+    def test_percentile(self):
+        values = list(range(1, 101))
+
+        self.assertEqual(50, percentile(values, 50))
+        self.assertEqual(95, percentile(values, 95))
+        self.assertEqual(100, percentile(values, 100))
+        self.assertEqual(0.0, percentile([], 99))
+
+    def test_opponent(self):
+        user, other = User(username="user"), User(username="other")
+
+        self.assertEqual(other, Fixtures([user, other], {}, []).opponent(user))
+        with self.assertRaises(ValueError):
+            Fixtures([user], {}, []).opponent(user)
+
+    def test_run_read_scenarios(self):
+        fixtures = seed(users=4, games=12)
+
+        for name in ("moves_list", "game_list"):
+            result = run_scenario(name, fixtures, requests=6, concurrency=2)
+
+            self.assertEqual(6, result["requests"])
+            self.assertEqual(0, result["errors"])
+            self.assertGreater(result["queries_per_request"]["mean"], 0)
+            self.assertLessEqual(
+                result["latency_ms"]["p50"], result["latency_ms"]["p99"]
+            )
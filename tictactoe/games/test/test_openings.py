@@ -0,0 +1,143 @@
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from tictactoe.games import projections
+from tictactoe.games.models import Game, GameEvent, OpeningPosition
+from tictactoe.games.openings import SYMMETRIES, book_rows, parse_moves, positions
+from tictactoe.games.services import GameService
+from tictactoe.tasks import queue
+from tictactoe.users.models import User
+from tictactoe.users.test.factories import UserFactory
+
+# Cells as `row * 3 + column`
+WIN = (0, 3, 1, 4, 2)
+DRAW = (0, 1, 2, 4, 3, 5, 7, 6, 8)
+
+
+class TestPositions(SimpleTestCase):
+    def test_symmetries_are_distinct_permutations(self):
+        self.assertEqual(8, len(set(SYMMETRIES)))
+        for symmetry in SYMMETRIES:
+            self.assertEqual(list(range(9)), sorted(symmetry))
+
+    def test_equivalent_positions_share_a_code(self):
+        corners = {positions(bytes((cell,)))[-1] for cell in (0, 2, 6, 8)}
+        edges = {positions(bytes((cell,)))[-1] for cell in (1, 3, 5, 7)}
+        center = positions(bytes((4,)))[-1]
+
+        self.assertEqual(1, len(corners))
+        self.assertEqual(1, len(edges))
+        self.assertEqual(3, len(corners | edges | {center}))
+        self.assertEqual(positions(bytes((0, 4)))[-1], positions(bytes((8, 4)))[-1])
+        self.assertNotEqual(positions(bytes((0, 4)))[-1], positions(bytes((4, 0)))[-1])
+
+    def test_number_of_distinct_positions_per_ply(self):
+        # Known counts of essentially different positions; no game is won before ply 5
+        sequences = [b""]
+        for expected in (3, 12, 38, 108):
+            sequences = [
+                sequence + bytes((cell,))
+                for sequence in sequences
+                for cell in range(9)
+                if cell not in sequence
+            ]
+            self.assertEqual(expected, len({positions(sequence)[-1] for sequence in sequences}))
+
+    def test_book_rows(self):
+        rows = book_rows([(bytes(WIN), 1), (bytes(DRAW), 0), (bytes((8, 3)), 2)])
+
+        self.assertEqual([0, 3, 1, 1, 1], rows[0])
+        self.assertEqual([1, 3, 1, 1, 1], rows[positions(bytes((0,)))[-1]])
+
+    def test_parse_moves(self):
+        self.assertEqual(b"", parse_moves(""))
+        self.assertEqual(bytes((4, 0)), parse_moves("4,0"))
+        for value in ("9", "1,1", "a"):
+            with self.assertRaises(ValueError):
+                parse_moves(value)
+
+
+class TestOpeningBook(APITestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.player_1 = User.objects.get(pk=UserFactory().pk)
+        self.player_2 = User.objects.get(pk=UserFactory().pk)
+
+    def _play(self, cells) -> Game:
+        game = Game.objects.create(
+            player_1=self.player_1, player_2=self.player_2, status="in_progress"
+        )
+        for cell in cells:
+            user, _ = game.get_next_player_and_mark()
+            GameService.move(game, {"row": cell // 3, "column": cell % 3}, user)
+        return game
+
+    def _book(self, moves: str = "") -> dict:
+        response = self.client.get(reverse("openings"), {"moves": moves})
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        return response.json()
+
+    def test_book_is_updated_as_games_finish(self):
+        self._play(WIN)
+        self._play(WIN)
+        self._play(DRAW)
+        self._play((4, 0))
+        queue.run_pending()
+
+        book = self._book()
+        self.assertEqual(
+            {"games": 3, "wins_player_1": 2, "wins_player_2": 0, "draws": 1},
+            {key: value for key, value in book.items() if key != "continuations"},
+        )
+        self.assertEqual(
+            [
+                {
+                    "row": 0,
+                    "column": 0,
+                    "games": 3,
+                    "wins_player_1": 2,
+                    "wins_player_2": 0,
+                    "draws": 1,
+                    "win_rate": 0.6667,
+                }
+            ],
+            book["continuations"],
+        )
+
+        # All finished games opened with a mirror image of this line
+        line = self._book("2,5")
+        self.assertEqual(3, line["games"])
+        self.assertEqual(
+            [(0, 1, 2), (2, 2, 1)],
+            [(move["row"], move["column"], move["games"]) for move in line["continuations"]],
+        )
+
+    def test_cached_book_is_dropped_on_update(self):
+        self._play(WIN)
+        with self.captureOnCommitCallbacks(execute=True):
+            queue.run_pending()
+        self.assertEqual(1, self._book()["games"])
+
+        self._play(DRAW)
+        with self.captureOnCommitCallbacks(execute=True):
+            queue.run_pending()
+        self.assertEqual(2, self._book()["games"])
+
+    def test_rebuild_reads_moves_of_older_events(self):
+        self._play(WIN)
+        self._play(DRAW)
+        for event in GameEvent.objects.filter(type="finished"):
+            del event.data["sequence"]
+            event.save()
+
+        projections.replay(projections.PROJECTIONS["openings"], rebuild=True)
+
+        self.assertEqual(2, OpeningPosition.objects.get(position=0).games)
+        self.assertEqual(2, self._book()["games"])
+
+    def test_invalid_moves(self):
+        response = self.client.get(reverse("openings"), {"moves": "4,4"})
+
+        self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
@@ -0,0 +1,87 @@
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from tictactoe.games.models import Game, Move, unpack_moves, unpack_sequence
+from tictactoe.games.services import GameService
+from tictactoe.users.models import User
+from tictactoe.users.test.factories import UserFactory
+
+
+class TestPackedMoves(APITestCase):
+    cells = ((0, 0), (1, 0), (0, 1), (1, 1), (0, 2))
+
+    def setUp(self) -> None:
+        cache.clear()
+        # Factories assign string ids, read the users back to compare them with
+        # players loaded from the database
+        self.player_1 = User.objects.get(pk=UserFactory().pk)
+        self.player_2 = User.objects.get(pk=UserFactory().pk)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.player_1.auth_token}")
+        self.game = Game.objects.create(
+            player_1=self.player_1, player_2=self.player_2, status="in_progress"
+        )
+
+    def _play(self, cells) -> None:
+        for row, column in cells:
+            user, _ = self.game.get_next_player_and_mark()
+            result = GameService.move(self.game, {"row": row, "column": column}, user)
+            self.assertNotIn("error", result)
+
+    def test_unpack_sequence(self):
+        self.assertEqual(
+            [(1, 1, "o"), (0, 2, "x"), (2, 0, "o")], unpack_sequence(bytes((4, 2, 6)))
+        )
+
+    def test_sequence_is_kept_with_move_rows(self):
+        self._play(self.cells[:2])
+        self.game.refresh_from_db()
+
+        self.assertEqual(bytes((0, 3)), bytes(self.game.move_sequence))
+        self.assertEqual(2, self.game.moves.count())
+
+    @override_settings(GAMES_PACKED_MOVES=True)
+    def test_packed_game_has_no_move_rows(self):
+        self._play(self.cells)
+        self.game.refresh_from_db()
+
+        self.assertFalse(Move.objects.exists())
+        self.assertEqual("finished", self.game.status)
+        self.assertEqual(self.player_1, self.game.winner)
+        moves = unpack_moves(self.game)
+        self.assertEqual([1, 2, 3, 4, 5], [move.id for move in moves])
+        self.assertEqual(
+            [self.player_1.id, self.player_2.id] * 2 + [self.player_1.id],
+            [move.player_id for move in moves],
+        )
+
+    @override_settings(GAMES_PACKED_MOVES=True)
+    def test_packed_move_cannot_repeat_cell(self):
+        self._play(self.cells[:1])
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.player_2.auth_token}")
+
+        response = self.client.post(
+            reverse("game-move", kwargs={"pk": self.game.id}), {"row": 0, "column": 0}
+        )
+
+        self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+        self.assertEqual("You cannot make this move", response.data["error"])
+
+    def test_packed_payloads_match_move_rows(self):
+        self._play(self.cells[:3])
+        urls = [
+            reverse("game-moves", kwargs={"pk": self.game.id}),
+            reverse("game-detail", kwargs={"pk": self.game.id}) + "?board=bitboard",
+        ]
+        rows = [self.client.get(url).json() for url in urls]
+        cache.clear()
+
+        with override_settings(GAMES_PACKED_MOVES=True):
+            packed = [self.client.get(url).json() for url in urls]
+            browsable = self.client.get(urls[0], HTTP_ACCEPT="text/html")
+
+        for move in rows[0]:
+            move["id"] = rows[0].index(move) + 1
+        self.assertEqual(rows, packed)
+        self.assertEqual(status.HTTP_200_OK, browsable.status_code)
@@ -0,0 +1,177 @@
+from collections import Counter
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.db.models import Q
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from tictactoe.games import eventlog, projections, tasks
+from tictactoe.games.cache import hot_games
+from tictactoe.games.metrics import projection_lag
+from tictactoe.games.models import Game, GameEvent, ProjectedGame
+from tictactoe.games.services import GameService
+from tictactoe.games.simulation import RandomPlayer, play_service_game
+from tictactoe.tasks.models import Task
+from tictactoe.users.models import User
+from tictactoe.users.test.factories import UserFactory
+
+STATE_FIELDS = ("player_1_id", "player_2_id", "status", "winner_id", "next_turn_id", "version")
+
+
+def _state(game) -> tuple:
+    return tuple(getattr(game, field) for field in STATE_FIELDS) + (bytes(game.move_sequence),)
+
+
+class TestProjections(TestCase):
+    def setUp(self) -> None:
+        hot_games.clear()
+        self.users = [User.objects.get(pk=UserFactory().pk) for _ in range(3)]
+        for i in range(6):
+            users = (self.users[i % 3], self.users[(i + 1) % 3])
+            play_service_game(users, RandomPlayer(), RandomPlayer())
+
+        self.waiting = Game.objects.create()
+        GameService.set_up_player(game=self.waiting, user=self.users[0])
+        self.in_progress = Game.objects.create()
+        GameService.set_up_player(game=self.in_progress, user=self.users[1])
+        GameService.join_game(game=self.in_progress, user=self.users[2])
+        self.in_progress.refresh_from_db()
+        GameService.move_cached(
+            self.in_progress.id, {"row": 1, "column": 1}, self.in_progress.player_1
+        )
+
+    def _replay(self, **kwargs) -> None:
+        for projection in projections.PROJECTIONS.values():
+            projections.replay(projection, **kwargs)
+
+    def _assert_projections_match_games(self) -> None:
+        self.assertEqual(
+            {game.id: _state(game) for game in Game.objects.all()},
+            {game.id: _state(game) for game in ProjectedGame.objects.all()},
+        )
+
+        wins = Counter(Game.objects.exclude(winner=None).values_list("winner_id", flat=True))
+        leaderboard = projections.PROJECTIONS["leaderboard"].model.objects.order_by("-wins")
+        self.assertEqual(wins, {entry.user_id: entry.wins for entry in leaderboard})
+
+        stats = projections.PROJECTIONS["user_stats"].model.objects.in_bulk()
+        for user in self.users:
+            finished = Game.objects.filter(Q(player_1=user) | Q(player_2=user), status="finished")
+            self.assertEqual(finished.count(), stats[user.id].played)
+            self.assertEqual(wins[user.id], stats[user.id].wins)
+            self.assertEqual(finished.filter(winner=None).count(), stats[user.id].draws)
+            self.assertEqual(
+                stats[user.id].played, stats[user.id].wins + stats[user.id].draws + stats[user.id].losses
+            )
+            self.assertEqual(user.moves.count(), stats[user.id].moves)
+
+    def test_log_records_game_history(self):
+        game = Game.objects.filter(status="finished").first()
+
+        events = list(GameEvent.objects.filter(game_id=game.id))
+
+        self.assertEqual(["created", "joined"], [event.type for event in events[:2]])
+        self.assertEqual(["moved"] * len(game.move_sequence), [event.type for event in events[2:-1]])
+        self.assertEqual("finished", events[-1].type)
+        self.assertEqual(sorted(event.version for event in events), [event.version for event in events])
+        self.assertEqual(game.version, events[-1].version)
+
+    def test_projections_match_games(self):
+        self._replay()
+
+        self._assert_projections_match_games()
+
+    def test_catch_up_resumes_from_checkpoint(self):
+        projection = projections.PROJECTIONS["games"]
+        total = GameEvent.objects.count()
+
+        self.assertEqual(5, projections.catch_up(projection, batch_size=5))
+        pending, age = projections.lag(projection)
+        self.assertEqual(total - 5, pending)
+        self.assertGreaterEqual(age, 0)
+
+        self.assertEqual(total - 5, projections.replay(projection, batch_size=7))
+        self.assertEqual((0, 0.0), projections.lag(projection))
+        self._replay()
+        self._assert_projections_match_games()
+
+    def test_rebuild_replays_whole_log(self):
+        self._replay()
+        ProjectedGame.objects.update(status="not_started")
+
+        out = StringIO()
+        call_command("replay_events", "--rebuild", "--batch-size", "10", stdout=out)
+
+        self.assertIn(f"games: applied {GameEvent.objects.count()} events", out.getvalue())
+        self._assert_projections_match_games()
+
+    def test_backfill_logs_games_played_before_the_log(self):
+        GameEvent.objects.all().delete()
+
+        self.assertEqual(Game.objects.count(), eventlog.backfill(batch_size=3))
+        self.assertEqual(0, eventlog.backfill())
+
+        self._replay(rebuild=True)
+        self._assert_projections_match_games()
+
+    def test_reports_lag(self):
+        projections.replay(projections.PROJECTIONS["leaderboard"])
+
+        events, seconds = projection_lag()
+
+        pending = {dict(labels)["projection"]: value for _, labels, value in events.samples()}
+        ages = {dict(labels)["projection"]: value for _, labels, value in seconds.samples()}
+        self.assertEqual(0, pending["leaderboard"])
+        self.assertEqual(GameEvent.objects.count(), pending["games"])
+        self.assertEqual(0, ages["leaderboard"])
+        self.assertGreater(ages["games"], 0)
+
+    @override_settings(GAMES_PROJECTIONS_GAP_TIMEOUT=60)
+    def test_waits_for_events_committed_out_of_order(self):
+        projection = projections.PROJECTIONS["leaderboard"]
+        projections.replay(projection)
+        game = Game.objects.filter(status="finished").exclude(winner=None).first()
+        position = GameEvent.objects.order_by("-id").first().id
+        finished = eventlog._finished_event(game)
+        # The event of a later transaction commits before the one with the lower id
+        finished.id = position + 2
+        finished.save()
+        wins = projection.model.objects.get(user_id=game.winner_id).wins
+
+        self.assertEqual(0, projections.replay(projection))
+
+        finished.id = position + 1
+        finished.save()
+        self.assertEqual(2, projections.replay(projection))
+        self.assertEqual(wins + 2, projection.model.objects.get(user_id=game.winner_id).wins)
+
+    @override_settings(GAMES_PROJECTIONS_GAP_TIMEOUT=60)
+    def test_runs_are_queued_again_once_per_held_back_event(self):
+        def reruns():
+            keys = Task.objects.values_list("idempotency_key", flat=True)
+            return list(keys.filter(idempotency_key__startswith="update_projections:gap:"))
+
+        tasks.update_projections()
+        # Events committed after a run are applied by the run their change queues
+        GameService.set_up_player(Game.objects.create(), self.users[0])
+        self.assertEqual([], reruns())
+
+        tasks.update_projections()
+        finished = eventlog._finished_event(Game.objects.filter(status="finished").first())
+        finished.id = GameEvent.objects.order_by("-id").first().id + 2
+        finished.save()
+        tasks.update_projections()
+        tasks.update_projections()
+
+        self.assertEqual([f"update_projections:gap:{finished.id}"], reruns())
+
+    @override_settings(GAMES_PROJECTIONS_GAP_TIMEOUT=60)
+    def test_moves_past_gaps_that_timed_out(self):
+        projection = projections.PROJECTIONS["leaderboard"]
+        projections.replay(projection)
+        finished = eventlog._finished_event(Game.objects.filter(status="finished").first())
+        finished.id = GameEvent.objects.order_by("-id").first().id + 2
+        finished.created = timezone.now() - timedelta(seconds=61)
+        finished.save()
+
+        self.assertEqual(1, projections.replay(projection))
@@ -0,0 +1,134 @@
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from tictactoe.games.archive import archive_batch
+from tictactoe.games.cache import hot_games
+from tictactoe.games.models import Game
+from tictactoe.games.ratings import (
+    K_FACTOR,
+    PROVISIONAL_K_FACTOR,
+    expected_score,
+    recompute,
+    updated_ratings,
+)
+from tictactoe.games.services import GameService
+from tictactoe.users.models import INITIAL_RATING, User
+from tictactoe.users.test.factories import UserFactory
+
+WIN = ((0, 0), (1, 0), (0, 1), (1, 1), (0, 2))
+DRAW = ((0, 0), (0, 1), (0, 2), (1, 1), (1, 0), (1, 2), (2, 1), (2, 0), (2, 2))
+
+
+class TestElo(SimpleTestCase):
+    def test_expected_score(self):
+        self.assertEqual(0.5, expected_score(1500, 1500))
+        self.assertAlmostEqual(1, expected_score(1900, 1500) + expected_score(1500, 1900))
+        self.assertAlmostEqual(0.909, expected_score(1900, 1500), places=3)
+
+    def test_updated_ratings(self):
+        self.assertEqual((1520, 1480), updated_ratings((1500, 0), (1500, 0), 1))
+        self.assertEqual((1500, 1500), updated_ratings((1500, 50), (1500, 50), 0.5))
+
+        rating_1, rating_2 = updated_ratings((1500, 50), (1500, 0), 0)
+        self.assertEqual(1500 - K_FACTOR / 2, rating_1)
+        self.assertEqual(1500 + PROVISIONAL_K_FACTOR / 2, rating_2)
+
+
+class TestRatings(APITestCase):
+    def setUp(self) -> None:
+        hot_games.clear()
+        self.player_1 = User.objects.get(pk=UserFactory().pk)
+        self.player_2 = User.objects.get(pk=UserFactory().pk)
+
+    def _play(self, moves, cached: bool = False) -> Game:
+        game = Game.objects.create(
+            player_1=self.player_1, player_2=self.player_2, status="in_progress"
+        )
+        for row, column in moves:
+            game.refresh_from_db()
+            user, _ = game.get_next_player_and_mark()
+            if cached:
+                GameService.move_cached(game.id, {"row": row, "column": column}, user)
+            else:
+                GameService.move(game, {"row": row, "column": column}, user)
+        game.refresh_from_db()
+        return game
+
+    def _ratings(self) -> list:
+        return [
+            tuple(User.objects.values_list("rating", "rated_games").get(pk=player.pk))
+            for player in (self.player_1, self.player_2)
+        ]
+
+    def test_win_updates_ratings(self):
+        game = self._play(WIN)
+
+        self.assertEqual(self.player_1.id, game.winner_id)
+        self.assertEqual([(1520, 1), (1480, 1)], self._ratings())
+
+    def test_cached_moves_update_ratings(self):
+        self._play(WIN, cached=True)
+
+        self.assertEqual([(1520, 1), (1480, 1)], self._ratings())
+
+    def test_draw_between_equal_players(self):
+        game = self._play(DRAW)
+
+        self.assertEqual("finished", game.status)
+        self.assertIsNone(game.winner_id)
+        self.assertEqual([(INITIAL_RATING, 1), (INITIAL_RATING, 1)], self._ratings())
+
+    def test_leaderboard(self):
+        self._play(WIN)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.player_1.auth_token}")
+
+        response = self.client.get(reverse("leaderboard"))
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        ratings = [user["rating"] for user in response.data["results"]]
+        self.assertEqual(sorted(ratings, reverse=True), ratings)
+        self.assertEqual(str(self.player_1.id), str(response.data["results"][0]["id"]))
+
+    def test_recompute_replays_all_finished_games(self):
+        first = self._play(WIN)
+        Game.objects.filter(pk=first.pk).update(created=timezone.now() - timedelta(days=60))
+        archive_batch(timezone.now() - timedelta(days=30), batch_size=10)
+        self._play(DRAW)
+        self._play(WIN)
+        Game.objects.create(player_1=self.player_1, player_2=self.player_2, status="in_progress")
+        expected = self._ratings()
+        User.objects.update(rating=1000, rated_games=0)
+
+        out = StringIO()
+        call_command("recompute_ratings", "--batch-size", "1", stdout=out)
+
+        self.assertIn("Replayed 3 games", out.getvalue())
+        for (rating, games), (expected_rating, expected_games) in zip(self._ratings(), expected):
+            self.assertAlmostEqual(expected_rating, rating)
+            self.assertEqual(expected_games, games)
+
+    def test_recompute_replays_games_in_the_order_they_finished(self):
+        # The first game created finishes last
+        first = Game.objects.create(
+            player_1=self.player_1, player_2=self.player_2, status="in_progress"
+        )
+        for row, column in WIN[:-1]:
+            user, _ = first.get_next_player_and_mark()
+            GameService.move(first, {"row": row, "column": column}, user)
+        self._play(DRAW)
+        self._play(WIN)
+        user, _ = first.get_next_player_and_mark()
+        GameService.move(first, {"row": WIN[-1][0], "column": WIN[-1][1]}, user)
+        expected = self._ratings()
+        User.objects.update(rating=1000, rated_games=0)
+
+        self.assertEqual(3, recompute())
+
+        for (rating, games), (expected_rating, expected_games) in zip(self._ratings(), expected):
+            self.assertAlmostEqual(expected_rating, rating)
+            self.assertEqual(expected_games, games)
@@ -0,0 +1,141 @@
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from tictactoe.games.cache import GameState, hot_games
+from tictactoe.games.models import Game, GameEvent
+from tictactoe.games.reaper import reap_batch
+from tictactoe.games.services import GameService
+from tictactoe.tasks.models import Task
+from tictactoe.users.models import INITIAL_RATING, User
+from tictactoe.users.test.factories import UserFactory
+
+
+@override_settings(GAMES_JOIN_TIMEOUT=600, GAMES_MOVE_TIMEOUT=60)
+class TestReaper(APITestCase):
+    def setUp(self) -> None:
+        hot_games.clear()
+        self.player_1 = User.objects.get(pk=UserFactory().pk)
+        self.player_2 = User.objects.get(pk=UserFactory().pk)
+
+    def _started_game(self) -> Game:
+        game = Game.objects.create()
+        GameService.set_up_player(game, self.player_1)
+        GameService.join_game(game, self.player_2)
+        game.refresh_from_db()
+        return game
+
+    def _expire(self, game: Game) -> None:
+        Game.objects.filter(pk=game.pk).update(move_deadline=timezone.now() - timedelta(seconds=1))
+
+    def test_deadlines_follow_the_game(self):
+        game = Game.objects.create()
+        GameService.set_up_player(game, self.player_1)
+        created = timezone.now()
+        self.assertAlmostEqual(600, (game.move_deadline - created).total_seconds(), delta=5)
+
+        GameService.join_game(game, self.player_2)
+        self.assertAlmostEqual(60, (game.move_deadline - created).total_seconds(), delta=5)
+
+        for row, column in ((0, 0), (1, 0), (0, 1), (1, 1)):
+            user, _ = game.get_next_player_and_mark()
+            GameService.move(game, {"row": row, "column": column}, user)
+            self.assertIsNotNone(game.move_deadline)
+        user, _ = game.get_next_player_and_mark()
+        GameService.move_cached(game.id, {"row": 0, "column": 2}, user)
+        game.refresh_from_db()
+        self.assertEqual("finished", game.status)
+        self.assertIsNone(game.move_deadline)
+
+    def test_open_games_before_deadline_are_kept(self):
+        self._started_game()
+
+        self.assertEqual({"abandoned": 0, "forfeit": 0}, reap_batch(10))
+
+    def test_game_never_joined_is_abandoned(self):
+        game = Game.objects.create()
+        GameService.set_up_player(game, self.player_1)
+        self._expire(game)
+
+        self.assertEqual({"abandoned": 1, "forfeit": 0}, reap_batch(10))
+        game.refresh_from_db()
+        self.assertEqual("finished", game.status)
+        self.assertIsNone(game.winner_id)
+        self.assertEqual(
+            ["tictactoe.games.tasks.update_projections"],
+            list(Task.objects.values_list("name", flat=True)),
+        )
+
+    def test_player_on_turn_forfeits(self):
+        game = self._started_game()
+        # The creator is seated in a random slot, `player_1` moves first
+        first, second = game.player_1, game.player_2
+        GameService.move(game, {"row": 0, "column": 0}, first)
+        self._expire(game)
+        version = game.version
+        hot_games.put(GameState.load(game.id))
+
+        self.assertEqual({"abandoned": 0, "forfeit": 1}, reap_batch(10))
+        game.refresh_from_db()
+        self.assertEqual(
+            ("finished", first.pk, version + 1), (game.status, game.winner_id, game.version)
+        )
+        self.assertIsNone(game.move_deadline)
+        self.assertIsNone(hot_games.get(game.id))
+        self.assertEqual("finished", GameEvent.objects.filter(game_id=game.id).latest("id").type)
+        self.assertGreater(User.objects.get(pk=first.pk).rating, INITIAL_RATING)
+        self.assertEqual(
+            {"error": "This game has already finished"},
+            GameService.move_cached(game.id, {"row": 1, "column": 1}, second),
+        )
+
+    def test_first_player_forfeits_before_first_move(self):
+        game = self._started_game()
+        self._expire(game)
+
+        reap_batch(10)
+
+        game.refresh_from_db()
+        self.assertEqual(game.player_2_id, game.winner_id)
+
+    def test_moves_racing_the_reaper_are_rejected(self):
+        game = self._started_game()
+        self._expire(game)
+        # Both moves read the game before the reaper finished it
+        stale = Game.objects.get(pk=game.pk)
+        hot_games.put(GameState.load(game.id))
+        state = hot_games.get(game.id)
+
+        reap_batch(10)
+        game.refresh_from_db()
+        first = User.objects.get(pk=game.player_1_id)
+        hot_games.put(state)
+
+        finished = {"error": "This game has already finished"}
+        self.assertEqual(finished, GameService.move(stale, {"row": 0, "column": 0}, first))
+        self.assertEqual(finished, GameService.move_cached(game.id, {"row": 0, "column": 0}, first))
+        reaped = Game.objects.get(pk=game.pk)
+        self.assertEqual(
+            ("finished", game.player_2_id, game.version, b""),
+            (reaped.status, reaped.winner_id, reaped.version, bytes(reaped.move_sequence)),
+        )
+        self.assertEqual(
+            ["created", "joined", "finished"],
+            list(GameEvent.objects.filter(game_id=game.id).values_list("type", flat=True)),
+        )
+
+    def test_command_reaps_in_batches(self):
+        for _ in range(3):
+            self._expire(self._started_game())
+        game = Game.objects.create()
+        GameService.set_up_player(game, self.player_1)
+        self._expire(game)
+        self._started_game()
+
+        out = StringIO()
+        call_command("reap_games", "--batch-size", "2", stdout=out)
+
+        self.assertIn("Reaped 4 games in 2 batches: 1 abandoned, 3 forfeit", out.getvalue())
+        self.assertEqual(1, Game.objects.exclude(status="finished").count())
@@ -0,0 +1,107 @@
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from time import sleep
+from unittest import mock
+import uuid
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from tictactoe.games import metrics
+from tictactoe.games.models import Game
+from tictactoe.games.routing import ROUTING_HEADER, GameDispatcher, HashRing
+from tictactoe.users.test.factories import UserFactory
+
+NODES = ["worker-1", "worker-2", "worker-3", "worker-4"]
+
+
+class SimulatedWorker:
+    """Worker process owning in-memory states of its shard of games."""
+
+    def __init__(self) -> None:
+        self.dispatcher = GameDispatcher(stripes=4)
+        self.states = defaultdict(list)
+
+    def move(self, game_id, cell: int) -> None:
+        with self.dispatcher.lock(game_id):
+            # Read-modify-write that would lose moves if not serialized
+            state = list(self.states[game_id])
+            sleep(0)
+            self.states[game_id] = state + [cell]
+
+
+class TestHashRing(SimpleTestCase):
+    def setUp(self) -> None:
+        self.keys = [str(uuid.uuid4()) for _ in range(4000)]
+
+    def test_spreads_keys_evenly(self):
+        ring = HashRing(NODES)
+        owners = Counter(ring.node_for(key) for key in self.keys)
+
+        self.assertEqual(set(NODES), set(owners))
+        for count in owners.values():
+            self.assertTrue(600 < count < 1400, owners)
+
+    def test_removing_node_moves_only_its_keys(self):
+        ring = HashRing(NODES)
+        before = {key: ring.node_for(key) for key in self.keys}
+
+        ring.remove("worker-4")
+
+        for key in self.keys:
+            if before[key] != "worker-4":
+                self.assertEqual(before[key], ring.node_for(key))
+        self.assertEqual(3, len(ring))
+
+    def test_empty_ring(self):
+        self.assertIsNone(HashRing().node_for("game"))
+
+    def test_simulated_workers_own_games(self):
+        ring = HashRing(NODES)
+        workers = {node: SimulatedWorker() for node in NODES}
+        game_ids = [str(uuid.uuid4()) for _ in range(20)]
+        requests = [(game_id, cell) for cell in range(20) for game_id in game_ids]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(
+                executor.map(
+                    lambda request: workers[ring.node_for(request[0])].move(*request),
+                    requests,
+                )
+            )
+
+        for game_id in game_ids:
+            owners = [node for node, worker in workers.items() if game_id in worker.states]
+            self.assertEqual([ring.node_for(game_id)], owners)
+            self.assertEqual(20, len(workers[owners[0]].states[game_id]))
+
+
+class TestRoutingHeader(APITestCase):
+    def setUp(self) -> None:
+        user = UserFactory()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {user.auth_token}")
+        self.game = Game.objects.create(player_1=user)
+        self.ring = HashRing(NODES)
+        self.owner = self.ring.node_for(self.game.id)
+
+    def _get(self):
+        with mock.patch("tictactoe.games.routing.ring", self.ring):
+            return self.client.get(reverse("game-detail", kwargs={"pk": self.game.id}))
+
+    def test_header_names_owner(self):
+        self.assertEqual(self.owner, self._get()[ROUTING_HEADER])
+
+    def test_counts_misrouted_requests(self):
+        other = next(node for node in NODES if node != self.owner)
+
+        with mock.patch.object(metrics.misrouted_requests, "inc") as inc:
+            with override_settings(GAMES_ROUTING_NODE=other):
+                self._get()
+            with override_settings(GAMES_ROUTING_NODE=self.owner):
+                self._get()
+
+        inc.assert_called_once_with()
+
+    def test_no_header_without_nodes(self):
+        response = self.client.get(reverse("game-detail", kwargs={"pk": self.game.id}))
+
+        self.assertNotIn(ROUTING_HEADER, response)
@@ -190,3 +190,26 @@ class TestGameService(TestCase):
 
         self.assertEqual("finished", self.game.status)
         self.assertEqual(None, self.game.winner)
+
+    def test_writers_starting_from_the_same_version(self):
+        creator, joining, late = (
+            User.objects.get(pk=user.pk) for user in (self.player_1, self.player_2, self.player_3)
+        )
+        GameService.set_up_player(self.game, creator)
+        stale = Game.objects.get(pk=self.game.pk)
+
+        self.assertEqual("Joined a game", GameService.join_game(self.game, joining)["status"])
+        results = GameService.join_game(stale, late)
+
+        self.assertEqual("This game is already full", results["error"])
+        self.assertEqual(self.game.version, Game.objects.get(pk=self.game.pk).version)
+
+        first = User.objects.get(pk=self.game.player_1_id)
+        game, stale = (Game.objects.get(pk=self.game.pk) for _ in range(2))
+        self.assertIn("move", GameService.move(game, {"row": 0, "column": 0}, first))
+        results = GameService.move(stale, {"row": 1, "column": 1}, first)
+
+        self.assertEqual("This is not your turn now", results["error"])
+        stored = Game.objects.get(pk=self.game.pk)
+        self.assertEqual(bytes((0,)), bytes(stored.move_sequence))
+        self.assertEqual(game.version, stored.version)
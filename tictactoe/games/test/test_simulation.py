@@ -0,0 +1,44 @@
+from django.test import TestCase
+from tictactoe.games.models import Game
+from tictactoe.games.services import Grid
+from tictactoe.games.simulation import (
+    AIPlayer,
+    RandomPlayer,
+    play_service_game,
+    run_memory_games,
+)
+from tictactoe.users.test.factories import UserFactory
+
+
+class TestSimulation(TestCase):
+    def test_grid_from_board(self):
+        board = [["o", "x", None], ["x", "o", None], [None, None, "o"]]
+
+        self.assertEqual("o", Grid(board=board).find_winner())
+
+    def test_ai_player_takes_winning_move(self):
+        board = [["x", "x", None], ["o", "o", None], [None, None, None]]
+
+        self.assertEqual((0, 2), AIPlayer().choose(board, "x"))
+
+    def test_ai_games_are_draws(self):
+        stats = run_memory_games(10, "ai", "ai", seed=1)
+
+        self.assertEqual(10, stats.games)
+        self.assertEqual({"draw": 10}, dict(stats.outcomes))
+        self.assertEqual(90, stats.moves)
+
+    def test_memory_games_are_never_unfinished(self):
+        stats = run_memory_games(50, "random", "random", seed=1)
+
+        self.assertEqual(50, sum(stats.outcomes.values()))
+        self.assertTrue(set(stats.outcomes) <= {"o", "x", "draw"})
+
+    def test_service_game(self):
+        users = (UserFactory(), UserFactory())
+        stats = play_service_game(users, AIPlayer(), RandomPlayer())
+        game = Game.objects.filter(player_1__in=users).get()
+
+        self.assertEqual("finished", game.status)
+        self.assertEqual(stats.moves, game.moves.count())
+        self.assertEqual(1, sum(stats.outcomes.values()))
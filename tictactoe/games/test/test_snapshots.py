@@ -0,0 +1,130 @@
+from unittest import mock
+import json
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+from tictactoe.games import snapshots
+from tictactoe.games.models import Game
+from tictactoe.games.serializers import GameSerializer, MoveSerializer
+from tictactoe.games.services import GameService
+from tictactoe.users.test.factories import UserFactory
+
+
+class TestSnapshots(APITestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.player_1 = UserFactory()
+        self.player_2 = UserFactory()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.player_1.auth_token}")
+        self.game = Game.objects.create(
+            player_1=self.player_1, player_2=self.player_2, status="in_progress"
+        )
+        GameService.move(self.game, {"row": 1, "column": 1}, self.player_1)
+
+    def _drf_payload(self, data) -> bytes:
+        return JSONRenderer().render(data)
+
+    def test_game_detail_matches_serializer(self):
+        response = self.client.get(reverse("game-detail", kwargs={"pk": self.game.id}))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._drf_payload(GameSerializer(self.game).data), response.content)
+
+    def test_game_list_matches_serializer(self):
+        Game.objects.create()
+        response = self.client.get(reverse("game-list"))
+        games = Game.objects.all()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(2, response.json()["count"])
+        self.assertEqual(
+            json.loads(self._drf_payload(GameSerializer(games, many=True).data)),
+            response.json()["results"],
+        )
+
+    def test_moves_match_serializer(self):
+        response = self.client.get(reverse("game-moves", kwargs={"pk": self.game.id}))
+
+        self.assertEqual(
+            self._drf_payload(MoveSerializer(self.game.moves.all(), many=True).data),
+            response.content,
+        )
+
+    def test_missing_game(self):
+        for pk in (UserFactory().id, "not-a-uuid"):
+            response = self.client.get(reverse("game-detail", kwargs={"pk": pk}))
+
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_snapshots_are_cached_per_version(self):
+        url = reverse("game-moves", kwargs={"pk": self.game.id})
+        self.client.get(url)
+
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(1, len(response.json()))
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.player_2.auth_token}")
+        self.client.post(reverse("game-move", kwargs={"pk": self.game.id}), {"row": 0, "column": 0})
+
+        self.assertEqual(2, len(self.client.get(url).json()))
+
+    def test_encoding_without_orjson(self):
+        data = {"id": "a", "results": [1, None, "ż"]}
+
+        with mock.patch.object(snapshots, "orjson", None):
+            self.assertEqual(json.loads(snapshots.dumps(data)), data)
+            self.assertEqual(b'{"a":1}', snapshots.dumps({"a": 1}))
+
+
+class TestConditionalRequests(APITestCase):
+    def setUp(self) -> None:
+        self.player_1 = UserFactory()
+        self.player_2 = UserFactory()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.player_1.auth_token}")
+        self.game = Game.objects.create(
+            player_1=self.player_1, player_2=self.player_2, status="in_progress"
+        )
+        GameService.move(self.game, {"row": 1, "column": 1}, self.player_1)
+
+    def _move_queries(self, queries) -> list:
+        return [query for query in queries if "games_move" in query["sql"]]
+
+    def test_not_modified(self):
+        for url in (
+            reverse("game-detail", kwargs={"pk": self.game.id}),
+            reverse("game-moves", kwargs={"pk": self.game.id}),
+        ):
+            etag = self.client.get(url)["ETag"]
+
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+            self.assertEqual(etag, response["ETag"])
+            self.assertEqual(b"", response.content)
+            self.assertEqual([], self._move_queries(queries))
+
+    def test_tag_changes_with_each_move(self):
+        url = reverse("game-moves", kwargs={"pk": self.game.id})
+        etag = self.client.get(url)["ETag"]
+        GameService.move(self.game, {"row": 0, "column": 0}, self.player_2)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(etag, response["ETag"])
+        self.assertEqual(2, len(response.json()))
+
+    def test_tag_depends_on_board_representation(self):
+        url = reverse("game-detail", kwargs={"pk": self.game.id})
+        etag = self.client.get(url)["ETag"]
+
+        response = self.client.get(url, {"board": "string"}, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual("____o____", response.json()["board"])
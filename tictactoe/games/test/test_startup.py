@@ -0,0 +1,23 @@
+from io import StringIO
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from tictactoe.config import Api
+
+
+class TestStartup(SimpleTestCase):
+    def test_api_configuration_strips_unused_apps(self):
+        for app in ("django.contrib.admin", "django.contrib.sessions", "storages"):
+            self.assertNotIn(app, Api.INSTALLED_APPS)
+        self.assertNotIn("django.contrib.sessions.middleware.SessionMiddleware", Api.MIDDLEWARE)
+        self.assertEqual(
+            ("rest_framework.renderers.JSONRenderer",),
+            Api.REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"],
+        )
+
+    def test_bench_startup_serves_first_request(self):
+        out = StringIO()
+
+        call_command("bench_startup", "--configurations", "Api", "--runs", "1", stdout=out)
+
+        self.assertIn("Api: process", out.getvalue())
+        self.assertIn("401 Unauthorized", out.getvalue())
@@ -0,0 +1,95 @@
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from tictactoe.games import throttling
+from tictactoe.games.models import Game
+from tictactoe.games.services import TOO_MANY_OPEN_GAMES, GameService
+from tictactoe.games.throttling import TokenBucketStore, parse_rate, throttle_wait
+from tictactoe.users.models import User
+from tictactoe.users.test.factories import UserFactory
+
+
+class TestTokenBuckets(SimpleTestCase):
+    def setUp(self) -> None:
+        throttling.buckets.clear()
+
+    def test_parse_rate(self):
+        self.assertEqual((10, 10.0), parse_rate("10/s"))
+        self.assertEqual((30, 0.5), parse_rate("30/min"))
+        self.assertEqual((3600, 1.0), parse_rate("3600/hour"))
+
+    def test_burst_then_refill(self):
+        store = TokenBucketStore(10)
+        waits = [store.take("key", 3, 1.0) for _ in range(4)]
+
+        self.assertEqual([0.0, 0.0, 0.0], waits[:3])
+        self.assertAlmostEqual(1.0, waits[3], places=2)
+
+    def test_store_keeps_most_recent_buckets(self):
+        store = TokenBucketStore(2)
+        for key in ("a", "b", "a", "c"):
+            store.take(key, 1, 1.0)
+
+        self.assertEqual(["a", "c"], list(store._buckets))
+
+    @override_settings(GAMES_THROTTLE_RATES={"move": "2/s", "move_ip": "3/s"})
+    def test_user_and_ip_limits(self):
+        self.assertFalse(throttle_wait("move", "user-1", "10.0.0.1"))
+        self.assertFalse(throttle_wait("move", "user-1", "10.0.0.2"))
+        self.assertTrue(throttle_wait("move", "user-1", "10.0.0.3"))
+        self.assertFalse(throttle_wait("move", "user-2", "10.0.0.1"))
+        self.assertFalse(throttle_wait("move", "user-3", "10.0.0.1"))
+        self.assertTrue(throttle_wait("move", "user-4", "10.0.0.1"))
+        self.assertFalse(throttle_wait("move", "user-4", "10.0.0.2"))
+        self.assertFalse(throttle_wait("create", "user-1", "10.0.0.1"))
+
+
+class TestGameLimits(APITestCase):
+    def setUp(self) -> None:
+        throttling.buckets.clear()
+        self.user = User.objects.get(pk=UserFactory().pk)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.user.auth_token}")
+
+    @override_settings(GAMES_THROTTLE_RATES={"create": "2/min"}, GAMES_MAX_OPEN_GAMES=0)
+    def test_create_is_throttled(self):
+        responses = [self.client.post(reverse("game-list"), {}) for _ in range(3)]
+
+        self.assertEqual(
+            [status.HTTP_201_CREATED, status.HTTP_201_CREATED, status.HTTP_429_TOO_MANY_REQUESTS],
+            [response.status_code for response in responses],
+        )
+        self.assertEqual("30", responses[2]["Retry-After"])
+
+    @override_settings(GAMES_THROTTLE_RATES={"move": "1/s"})
+    def test_move_is_throttled(self):
+        game = Game.objects.create(player_1=self.user, status="in_progress")
+        url = reverse("game-move", kwargs={"pk": game.id})
+
+        self.client.post(url, {"row": 0, "column": 0})
+        response = self.client.post(url, {"row": 1, "column": 1})
+
+        self.assertEqual(status.HTTP_429_TOO_MANY_REQUESTS, response.status_code)
+
+    @override_settings(GAMES_THROTTLE_RATES={}, GAMES_MAX_OPEN_GAMES=2)
+    def test_open_games_cap(self):
+        for _ in range(2):
+            self.assertEqual(
+                status.HTTP_201_CREATED, self.client.post(reverse("game-list"), {}).status_code
+            )
+
+        response = self.client.post(reverse("game-list"), {})
+        self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+        self.assertEqual(TOO_MANY_OPEN_GAMES, response.data["error"])
+
+        other_game = Game.objects.create()
+        GameService.set_up_player(other_game, User.objects.get(pk=UserFactory().pk))
+        response = self.client.post(reverse("game-join-game", kwargs={"pk": other_game.id}), {})
+        self.assertEqual(TOO_MANY_OPEN_GAMES, response.data["error"])
+
+        Game.objects.filter(player_1=self.user).update(status="finished")
+        Game.objects.filter(player_2=self.user).update(status="finished")
+        self.assertEqual(0, GameService.count_open_games(self.user))
+        self.assertEqual(
+            status.HTTP_201_CREATED, self.client.post(reverse("game-list"), {}).status_code
+        )
@@ -0,0 +1,149 @@
+from typing import List
+from unittest import skipUnless
+import asyncio
+import json
+from asgiref.sync import async_to_sync, sync_to_async
+from asgiref.testing import ApplicationCommunicator
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from tictactoe.games.cache import hot_games
+from tictactoe.games.events import PostgresBroker
+from tictactoe.games.models import Game
+from tictactoe.games.websocket import CLOSE_NOT_FOUND, CLOSE_UNAUTHORIZED, game_socket
+from tictactoe.users.models import User
+from tictactoe.users.test.factories import UserFactory
+
+
+class TestGameSocket(TestCase):
+    clients = 50
+
+    def setUp(self) -> None:
+        hot_games.clear()
+        self.player_1 = User.objects.get(pk=UserFactory().pk)
+        self.player_2 = User.objects.get(pk=UserFactory().pk)
+        self.game = Game.objects.create(
+            player_1=self.player_1, player_2=self.player_2, status="in_progress"
+        )
+        self.tokens = {user.pk: user.auth_token.key for user in (self.player_1, self.player_2)}
+
+    def _communicator(self, user: User, path: str = None) -> ApplicationCommunicator:
+        scope = {
+            "type": "websocket",
+            "path": path or f"/ws/games/{self.game.id}/",
+            "query_string": f"token={self.tokens[user.pk]}".encode(),
+            "headers": [],
+        }
+        return ApplicationCommunicator(game_socket, scope)
+
+    async def _connect(self, users: List[User]) -> List[ApplicationCommunicator]:
+        communicators = [self._communicator(user) for user in users]
+        for communicator in communicators:
+            await communicator.send_input({"type": "websocket.connect"})
+        for communicator in communicators:
+            self.assertEqual({"type": "websocket.accept"}, await communicator.receive_output(5))
+        return communicators
+
+    async def _receive(self, communicator: ApplicationCommunicator) -> dict:
+        message = await communicator.receive_output(5)
+        return json.loads(message["text"])
+
+    async def _disconnect(self, communicators: List[ApplicationCommunicator]) -> None:
+        for communicator in communicators:
+            await communicator.send_input({"type": "websocket.disconnect", "code": 1000})
+            await communicator.wait(5)
+
+    def test_moves_fan_out_to_all_clients(self):
+        async def scenario():
+            users = [self.player_1, self.player_2] * (self.clients // 2)
+            communicators = await self._connect(users)
+
+            await communicators[0].send_input(
+                {"type": "websocket.receive", "text": json.dumps({"row": 1, "column": 1})}
+            )
+            events = await asyncio.gather(*map(self._receive, communicators))
+            await self._disconnect(communicators)
+            return events
+
+        events = async_to_sync(scenario)()
+
+        self.assertEqual(self.clients, len(events))
+        for event in events:
+            self.assertEqual("move", event["type"])
+            self.assertEqual({"row": 1, "column": 1}, {k: event["move"][k] for k in ("row", "column")})
+            self.assertEqual(str(self.player_2.id), event["next_turn"])
+        self.assertTrue(self.game.moves.filter(row=1, column=1).exists())
+
+    def test_rest_moves_are_pushed(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Token {self.tokens[self.player_1.pk]}")
+
+        async def scenario():
+            communicators = await self._connect([self.player_2])
+            await sync_to_async(client.post)(
+                reverse("game-move", kwargs={"pk": self.game.id}), {"row": 0, "column": 0}
+            )
+            event = await self._receive(communicators[0])
+            await self._disconnect(communicators)
+            return event
+
+        event = async_to_sync(scenario)()
+
+        self.assertEqual("move", event["type"])
+        self.assertEqual(str(self.player_1.id), event["move"]["player"])
+
+    def test_rejected_move_is_answered_to_sender_only(self):
+        async def scenario():
+            communicators = await self._connect([self.player_2, self.player_1])
+            await communicators[0].send_input(
+                {"type": "websocket.receive", "text": json.dumps({"row": 0, "column": 0})}
+            )
+            error = await self._receive(communicators[0])
+            nothing = await communicators[1].receive_nothing(0.1)
+            await self._disconnect(communicators)
+            return error, nothing
+
+        error, nothing = async_to_sync(scenario)()
+
+        self.assertEqual({"type": "error", "error": "This is not your turn now"}, error)
+        self.assertTrue(nothing)
+
+    def test_rejects_unknown_game_and_anonymous_users(self):
+        async def close_code(communicator):
+            await communicator.send_input({"type": "websocket.connect"})
+            return (await communicator.receive_output(5))["code"]
+
+        unknown = self._communicator(
+            self.player_1, "/ws/games/3f4cd4a4-1f5e-4f4e-9d0c-8cf6b8d9c6a1/"
+        )
+        anonymous = self._communicator(self.player_1)
+        anonymous.scope["query_string"] = b""
+        probing = self._communicator(
+            self.player_1, "/ws/games/3f4cd4a4-1f5e-4f4e-9d0c-8cf6b8d9c6a1/"
+        )
+        probing.scope["query_string"] = b""
+
+        self.assertEqual(CLOSE_NOT_FOUND, async_to_sync(close_code)(unknown))
+        self.assertEqual(CLOSE_UNAUTHORIZED, async_to_sync(close_code)(anonymous))
+        self.assertEqual(CLOSE_UNAUTHORIZED, async_to_sync(close_code)(probing))
+
+
+@skipUnless(connection.vendor == "postgresql", "LISTEN/NOTIFY needs PostgreSQL")
+class TestPostgresBroker(TransactionTestCase):
+    def test_events_reach_subscribers_of_other_brokers(self):
+        publisher, subscriber = PostgresBroker(poll_interval=0.1), PostgresBroker(poll_interval=0.1)
+
+        async def scenario():
+            subscription = subscriber.subscribe("games:1")
+            # Give the listener time to connect
+            await asyncio.sleep(1)
+            await sync_to_async(publisher.publish)("games:1", {"type": "move", "version": 2})
+            try:
+                self.assertEqual(
+                    {"type": "move", "version": 2}, await asyncio.wait_for(subscription.get(), 5)
+                )
+            finally:
+                subscriber.unsubscribe(subscription)
+
+        async_to_sync(scenario)()
@@ -0,0 +1,137 @@
+"""Token bucket rate limits of game actions per user and per client IP.
+
+Every bucket holds up to the number of requests of its rate (e.g. 10 for
+`10/s`) and refills continuously at that rate, so short bursts pass while the
+sustained rate is capped. Buckets are kept in a fixed-size LRU store in the
+process, or in a shared Django cache so that all processes see the same buckets.
+"""
+from collections import OrderedDict
+from functools import lru_cache
+from math import ceil
+from threading import Lock
+from typing import Optional, Tuple
+import time
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import BaseThrottle
+from tictactoe.games import metrics
+
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+# Tokens left in a bucket and the time they were counted at
+Bucket = Tuple[float, float]
+
+
+@lru_cache(maxsize=None)
+def parse_rate(rate: str) -> Tuple[int, float]:
+    """Parses a rate such as `10/s` or `30/min`.
+
+    Args:
+        rate (str): number of requests per period (`s`, `min`, `hour` or `day`)
+
+    Returns:
+        Tuple[int, float]: capacity of the bucket and tokens added per second
+    """
+    requests, period = rate.split("/")
+    return int(requests), int(requests) / PERIODS[period[0]]
+
+
+def _take(bucket: Optional[Bucket], capacity: int, refill: float, now: float) -> Tuple[Bucket, float]:
+    tokens, updated = bucket if bucket is not None else (capacity, now)
+    tokens = min(capacity, tokens + (now - updated) * refill)
+    if tokens >= 1:
+        return (tokens - 1, now), 0.0
+    return (tokens, now), (1 - tokens) / refill
+
+
+class TokenBucketStore:
+    """Token buckets kept in a bounded LRU map, optionally in a shared cache.
+
+    Updates of buckets in a shared cache are not atomic, so concurrent requests
+    of the same client on different processes may occasionally both pass.
+    """
+
+    def __init__(self, max_size: int, backend: Optional[str] = None) -> None:
+        """
+        Args:
+            max_size (int): maximum number of buckets kept in the process
+            backend (Optional[str]): alias of a Django cache shared by processes
+        """
+        self.max_size = max_size
+        self.backend = backend
+        self._buckets: "OrderedDict[str, Bucket]" = OrderedDict()
+        self._lock = Lock()
+
+    def take(self, key: str, capacity: int, refill: float) -> float:
+        """Takes a token from a bucket if there is one.
+
+        Args:
+            key (str): key of the bucket
+            capacity (int): maximum number of tokens in the bucket
+            refill (float): tokens added per second
+
+        Returns:
+            float: 0 if a token was taken, or seconds until one is available
+        """
+        now = time.time()
+        if self.backend is not None:
+            cache = caches[self.backend]
+            bucket, wait = _take(cache.get(key), capacity, refill, now)
+            cache.set(key, bucket, ceil(capacity / refill))
+            return wait
+
+        with self._lock:
+            bucket, wait = _take(self._buckets.get(key), capacity, refill, now)
+            self._buckets[key] = bucket
+            self._buckets.move_to_end(key)
+            if len(self._buckets) > self.max_size:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+buckets = TokenBucketStore(settings.GAMES_THROTTLE_STORE_SIZE, settings.GAMES_THROTTLE_BACKEND)
+
+
+def throttle_wait(scope: str, user_id=None, ip: Optional[str] = None) -> float:
+    """Takes tokens of an action from buckets of a user and of a client IP.
+
+    Rates are read from `GAMES_THROTTLE_RATES`, under the scope for users and
+    under `<scope>_ip` for client IPs; scopes without a rate are not limited.
+
+    Args:
+        scope (str): throttled action, e.g. `move`
+        user_id: id of the authenticated user, if any
+        ip (Optional[str]): address of the client, if known
+
+    Returns:
+        float: 0 if the action is allowed, or seconds until it will be
+    """
+    rates = settings.GAMES_THROTTLE_RATES
+    wait = 0.0
+    for kind, ident, rate in (("user", user_id, rates.get(scope)), ("ip", ip, rates.get(f"{scope}_ip"))):
+        if ident is not None and rate:
+            wait = max(wait, buckets.take(f"throttle:{scope}:{kind}:{ident}", *parse_rate(rate)))
+    if wait:
+        metrics.throttled_requests.inc(scope=scope)
+    return wait
+
+
+class GameRateThrottle(BaseThrottle):
+    """Throttles actions of a view named in its `throttle_scopes` mapping."""
+
+    def allow_request(self, request, view) -> bool:
+        scope = getattr(view, "throttle_scopes", {}).get(getattr(view, "action", None))
+        if scope is None:
+            return True
+
+        user = request.user
+        user_id = user.pk if user and user.is_authenticated else None
+        self.wait_time = throttle_wait(scope, user_id, self.get_ident(request))
+        return not self.wait_time
+
+    def wait(self) -> float:
+        return self.wait_time
@@ -1,14 +1,29 @@
-from typing import Union
+from collections import OrderedDict
+from typing import Callable, Tuple, Union
+import uuid
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.utils.cache import get_conditional_response, quote_etag
 from rest_framework import viewsets, mixins, status
 from rest_framework.decorators import action
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.generics import get_object_or_404
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
-from tictactoe.games.models import Game
+from tictactoe.db.mixins import ReplicaReadMixin
+from tictactoe.games import openings, snapshots
+from tictactoe.games.boards import get_board_representation
+from tictactoe.games.cache import hot_games
+from tictactoe.games.routing import ROUTING_HEADER, dispatcher, route
+from tictactoe.games.models import ArchivedGame, Game, unpack_moves
 from tictactoe.games.serializers import GameSerializer, MoveSerializer
-from tictactoe.games.services import GameService
+from tictactoe.games.services import TOO_MANY_OPEN_GAMES, GameService
+from tictactoe.games.throttling import GameRateThrottle
+from tictactoe.metrics.mixins import SerializationTimingMixin
 
 
 class GameViewSet(
+    ReplicaReadMixin,
+    SerializationTimingMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
@@ -17,11 +32,131 @@ class GameViewSet(
     queryset = Game.objects.all()
     serializer_class = GameSerializer
     permission_classes = (IsAuthenticated,)
+    replica_actions = ("list", "retrieve", "moves")
+    # Actions that fall back to the archive tables when a game is not found
+    archive_actions = ("retrieve", "moves")
+    throttle_classes = (GameRateThrottle,)
+    # Throttled actions with their scopes in `GAMES_THROTTLE_RATES`
+    throttle_scopes = {"create": "create", "move": "move"}
+
+    def create(self, request, *args, **kwargs) -> Response:
+        if not GameService.can_open_game(request.user):
+            return Response({"error": TOO_MANY_OPEN_GAMES}, status=status.HTTP_400_BAD_REQUEST)
+        return super().create(request, *args, **kwargs)
 
     def perform_create(self, serializer: GameSerializer) -> None:
         game = serializer.save()
         GameService.set_up_player(game=game, user=self.request.user)
 
+    def finalize_response(self, request, response, *args, **kwargs):
+        """Tells clients and load balancers which node owns the requested game."""
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if self.lookup_field in kwargs and response.status_code != status.HTTP_404_NOT_FOUND:
+            node = route(kwargs[self.lookup_field])
+            if node is not None:
+                response[ROUTING_HEADER] = node
+
+        return response
+
+    def _renders_json(self, request) -> bool:
+        """Checks if the response can skip DRF serializers and renderers.
+
+        Fast read paths encode payloads straight from database tuples and are
+        only used for JSON responses; other formats (e.g. the browsable API) go
+        through the regular serializers.
+        """
+        return request.accepted_renderer.format == "json"
+
+    def get_object(self) -> Union[Game, ArchivedGame]:
+        """Returns the requested game, looking it up in the archive tables if it
+        has already been archived and the action only reads it.
+        """
+        try:
+            return super().get_object()
+        except Http404:
+            if self.action not in self.archive_actions:
+                raise
+            return get_object_or_404(
+                ArchivedGame.objects.all(), pk=self.kwargs[self.lookup_field]
+            )
+
+    def _get_version(self) -> Tuple[int, bool]:
+        """Returns the current version of the requested game and whether it is
+        archived, with a single query for games that are not archived.
+        """
+        pk = self.kwargs[self.lookup_field]
+        try:
+            queryset = self.get_queryset().values_list("version", flat=True)
+            return get_object_or_404(queryset, pk=pk), False
+        except Http404:
+            queryset = ArchivedGame.objects.values_list("version", flat=True)
+            return get_object_or_404(queryset, pk=pk), True
+
+    def _snapshot_response(self, request, etag: str, snapshot: Callable[[], bytes]) -> HttpResponse:
+        """Answers with `304 Not Modified` if the client's tag matches, without
+        building the payload at all, and with the encoded payload otherwise.
+
+        Args:
+            request (Request): handled request
+            etag (str): strong entity tag of the current payload
+            snapshot (Callable[[], bytes]): function returning the encoded payload
+
+        Returns:
+            HttpResponse: response with the `ETag` header
+        """
+        etag = quote_etag(etag)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(snapshot(), content_type="application/json")
+        response["ETag"] = etag
+
+        return response
+
+    def list(self, request, *args, **kwargs) -> Union[Response, HttpResponse]:
+        if not self._renders_json(request):
+            return super().list(request, *args, **kwargs)
+
+        queryset = snapshots.game_values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            return HttpResponse(
+                snapshots.dumps(snapshots.games_payload(queryset)),
+                content_type="application/json",
+            )
+
+        payload = OrderedDict(
+            [
+                ("count", self.paginator.page.paginator.count),
+                ("next", self.paginator.get_next_link()),
+                ("previous", self.paginator.get_previous_link()),
+                ("results", snapshots.games_payload(page)),
+            ]
+        )
+        return HttpResponse(snapshots.dumps(payload), content_type="application/json")
+
+    def get_serializer_context(self) -> dict:
+        context = super().get_serializer_context()
+        if self.action == "retrieve":
+            context["board"] = get_board_representation(self.request.query_params)
+        return context
+
+    def retrieve(self, request, *args, **kwargs) -> Union[Response, HttpResponse]:
+        """Returns a game, optionally with its encoded board and number of moves
+        when requested with the `board` query parameter (`string` or `bitboard`).
+        """
+        if not self._renders_json(request):
+            return super().retrieve(request, *args, **kwargs)
+
+        board = get_board_representation(request.query_params)
+        version, archived = self._get_version()
+        return self._snapshot_response(
+            request,
+            f"game-{version}" if board is None else f"game-{version}-{board}",
+            lambda: snapshots.game_snapshot(
+                self.kwargs["pk"], version, board=board, archived=archived
+            ),
+        )
+
     @action(detail=True, methods=["post"])
     def join_game(self, request, pk: Union[int, None] = None) -> Response:
         game = self.get_object()
@@ -34,24 +169,69 @@ class GameViewSet(
 
     @action(detail=True, methods=["post"], serializer_class=MoveSerializer)
     def move(self, request, pk: Union[int, None] = None) -> Response:
-        game = self.get_object()
-        serializer = self.serializer_class(data=request.data)
+        """Performs a move; active games are validated against the hot game cache
+        instead of loading the game and rebuilding its board from the database.
+        """
+        if not hot_games.enabled:
+            game = self.get_object()
         serializer = self.get_serializer(data=request.data)
 
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-        result = GameService.move(
-            game=game, data=serializer.validated_data, user=request.user
-        )
+        if hot_games.enabled:
+            try:
+                game_id = uuid.UUID(pk)
+            except ValueError:
+                raise Http404
+            # Moves of a game are serialized on the node owning it, so they do not
+            # race for the cached state
+            try:
+                with dispatcher.lock(game_id):
+                    result = GameService.move_cached(
+                        game_id=game_id, data=serializer.validated_data, user=request.user
+                    )
+            except Game.DoesNotExist:
+                raise Http404
+        else:
+            result = GameService.move(
+                game=game, data=serializer.validated_data, user=request.user
+            )
 
         if "error" in result:
             return Response(result, status=status.HTTP_400_BAD_REQUEST)
 
-        return Response(self.serializer_class(result["move"]).data)
+        return Response(self.get_serializer(result["move"]).data)
 
     @action(detail=True, methods=["get"], serializer_class=MoveSerializer)
-    def moves(self, request, pk: Union[int, None] = None) -> Response:
-        queryset = self.get_object().moves.all()
+    def moves(self, request, pk: Union[int, None] = None) -> Union[Response, HttpResponse]:
+        if self._renders_json(request):
+            version, archived = self._get_version()
+            return self._snapshot_response(
+                request,
+                f"moves-{version}",
+                lambda: snapshots.moves_snapshot(pk, version, archived=archived),
+            )
+
+        game = self.get_object()
+        queryset = unpack_moves(game) if settings.GAMES_PACKED_MOVES else game.moves.all()
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
+
+
+class OpeningBookViewSet(ReplicaReadMixin, viewsets.ViewSet):
+    """
+    Results of finished games from a position, and of the moves played from it
+    """
+
+    permission_classes = (AllowAny,)
+    replica_actions = ("list",)
+
+    def list(self, request) -> HttpResponse:
+        try:
+            sequence = openings.parse_moves(request.query_params.get("moves", ""))
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        entry = openings.book_entry(sequence, openings.load_book())
+        return HttpResponse(snapshots.dumps(entry), content_type="application/json")
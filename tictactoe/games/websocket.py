@@ -0,0 +1,117 @@
+"""ASGI application of per-game WebSocket channels.
+
+Clients connect to `/ws/games/<id>/?token=<auth token>` (or send the token in
+the `Authorization` header) and receive `join` and `move` events of the game as
+JSON messages. Players send moves as `{"row": 0, "column": 1}` messages; they are
+played by `GameService` like moves made with the REST API, and rejected moves are
+answered with an `error` message to the sender only.
+"""
+from time import time
+from typing import Optional
+from urllib.parse import parse_qs
+import asyncio
+import json
+import re
+from asgiref.sync import sync_to_async
+from rest_framework.authtoken.models import Token
+from tictactoe.games import events, metrics
+from tictactoe.games.cache import hot_games
+from tictactoe.games.models import Game
+from tictactoe.games.routing import dispatcher
+from tictactoe.games.serializers import MoveSerializer
+from tictactoe.games.services import GameService
+from tictactoe.games.throttling import throttle_wait
+from tictactoe.users.models import User
+
+PATH = re.compile(r"^/ws/games/(?P<pk>[0-9a-f-]{36})/$")
+
+# Close codes in the range reserved for applications
+CLOSE_NOT_FOUND = 4404
+CLOSE_UNAUTHORIZED = 4401
+
+
+def _authenticate(scope: dict) -> Optional[User]:
+    """Returns the user of the token sent in the query string or headers."""
+    key = parse_qs(scope.get("query_string", b"").decode()).get("token", [None])[0]
+    for name, value in scope.get("headers", ()):
+        if name == b"authorization" and value.startswith(b"Token "):
+            key = value[len(b"Token "):].decode()
+
+    if not key:
+        return None
+    token = Token.objects.select_related("user").filter(key=key).first()
+    return token.user if token is not None and token.user.is_active else None
+
+
+def _move(game_id: str, user: User, data) -> dict:
+    """Performs a move sent over a socket like the `move` endpoint does."""
+    serializer = MoveSerializer(data=data)
+    if not serializer.is_valid():
+        return {"error": serializer.errors}
+    if throttle_wait("move", user.pk):
+        return {"error": "Request was throttled."}
+
+    try:
+        if hot_games.enabled:
+            with dispatcher.lock(game_id):
+                return GameService.move_cached(game_id, serializer.validated_data, user)
+        game = Game.objects.get(pk=game_id)
+        return GameService.move(game=game, data=serializer.validated_data, user=user)
+    except Game.DoesNotExist:
+        return {"error": "Not found."}
+
+
+async def _send_json(send, data: dict) -> None:
+    await send({"type": "websocket.send", "text": json.dumps(data)})
+
+
+async def _forward_events(subscription: events.Subscription, send) -> None:
+    while True:
+        event = await subscription.get()
+        await _send_json(send, event)
+        metrics.websocket_message_latency.observe(time() - event["published"])
+
+
+async def game_socket(scope: dict, receive, send) -> None:
+    """Serves a WebSocket connection to the channel of a single game."""
+    message = await receive()
+    if message["type"] != "websocket.connect":
+        return
+
+    # Anonymous clients are turned away before they can tell which games exist
+    user = await sync_to_async(_authenticate)(scope)
+    if user is None:
+        await send({"type": "websocket.close", "code": CLOSE_UNAUTHORIZED})
+        return
+    match = PATH.match(scope["path"])
+    game_id = match["pk"] if match else None
+    if game_id is None or not await sync_to_async(Game.objects.filter(pk=game_id).exists)():
+        await send({"type": "websocket.close", "code": CLOSE_NOT_FOUND})
+        return
+
+    subscription = events.get_broker().subscribe(events.game_channel(game_id))
+    await send({"type": "websocket.accept"})
+    metrics.websocket_connections.inc()
+    forwarding = asyncio.ensure_future(_forward_events(subscription, send))
+
+    try:
+        while True:
+            message = await receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            if message["type"] != "websocket.receive":
+                continue
+
+            try:
+                data = json.loads(message.get("text") or message.get("bytes") or "")
+            except ValueError:
+                await _send_json(send, {"type": "error", "error": "Invalid JSON"})
+                continue
+            result = await sync_to_async(_move)(game_id, user, data)
+            # Successful moves reach the sender with the published `move` event
+            if "error" in result:
+                await _send_json(send, {"type": "error", "error": result["error"]})
+    finally:
+        forwarding.cancel()
+        subscription.close()
+        metrics.websocket_connections.inc(-1)
@@ -0,0 +1,16 @@
+from django.apps import AppConfig
+from django.conf import settings
+
+
+class MetricsConfig(AppConfig):
+    name = "tictactoe.metrics"
+
+    def ready(self) -> None:
+        from tictactoe.metrics.collectors import db_connections
+        from tictactoe.metrics.registry import REGISTRY
+
+        if settings.METRICS_MULTIPROCESS_DIR:
+            REGISTRY.configure_multiprocess(
+                settings.METRICS_MULTIPROCESS_DIR, settings.METRICS_FLUSH_INTERVAL
+            )
+        REGISTRY.register_collector(db_connections)
@@ -0,0 +1,39 @@
+from typing import List
+from django.db import connections
+from tictactoe.metrics.registry import REGISTRY, Gauge, Metric
+
+cache_requests = REGISTRY.counter(
+    "cache_requests", "Cache lookups by cache and result (hit or miss)."
+)
+
+
+def record_cache_access(cache: str, hit: bool) -> None:
+    """Counts a cache lookup; hit ratio is `hit / (hit + miss)` of this counter.
+
+    Args:
+        cache (str): name of the cache
+        hit (bool): True if the lookup was a hit
+    """
+    cache_requests.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def db_connections() -> List[Metric]:
+    """Reports server-side connection usage of every PostgreSQL database.
+
+    Returns:
+        List[Metric]: gauge of connections per database alias and state
+    """
+    gauge = Gauge("db_connections", "Open database server connections by state.")
+
+    for connection in connections.all():
+        if connection.vendor != "postgresql":
+            continue
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT coalesce(state, 'unknown'), count(*) FROM pg_stat_activity "
+                "WHERE datname = current_database() GROUP BY 1"
+            )
+            for state, count in cursor.fetchall():
+                gauge.set(count, alias=connection.alias, state=state)
+
+    return [gauge]
@@ -0,0 +1,140 @@
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Iterator, Optional
+import random
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from tictactoe.metrics.registry import REGISTRY
+
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+request_duration = REGISTRY.histogram(
+    "http_request_duration_seconds", "Total time spent handling a request."
+)
+request_db_duration = REGISTRY.histogram(
+    "http_request_db_duration_seconds", "Time spent executing SQL during a request."
+)
+request_db_queries = REGISTRY.histogram(
+    "http_request_db_queries", "Number of SQL queries run by a request.", QUERY_BUCKETS
+)
+request_serialization_duration = REGISTRY.histogram(
+    "http_request_serialization_duration_seconds",
+    "Time spent serializing and rendering the response body of a request.",
+)
+
+
+class RequestTimings:
+    """Timings collected for a single sampled request."""
+
+    def __init__(self) -> None:
+        self.queries = 0
+        self.db = 0.0
+        self.serialization = 0.0
+        self.total = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        """Database execute wrapper counting and timing every query."""
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db += perf_counter() - start
+            self.queries += 1
+
+    @property
+    def server_timing(self) -> str:
+        """Timings formatted as a `Server-Timing` header value."""
+        return (
+            f'db;dur={self.db * 1000:.2f};desc="{self.queries} queries", '
+            f"serialization;dur={self.serialization * 1000:.2f}, "
+            f"total;dur={self.total * 1000:.2f}"
+        )
+
+
+_current_timings: ContextVar[Optional[RequestTimings]] = ContextVar("timings", default=None)
+
+
+@contextmanager
+def timed_serialization() -> Iterator[None]:
+    """Adds the time spent in the block to serialization time of the sampled request.
+
+    Serializers and encoders of response payloads run in such a block; outside of a
+    sampled request it does nothing.
+    """
+    timings = _current_timings.get()
+    if timings is None:
+        yield
+        return
+
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        timings.serialization += perf_counter() - start
+
+
+class QueryInstrumentationMiddleware:
+    """Records SQL count, SQL time, serialization time and total time per view.
+
+    Serialization time covers rendering of DRF responses and the blocks run in
+    `timed_serialization()`, i.e. serializers of viewsets with
+    `SerializationTimingMixin` and encoders of fast path payloads. Measurements of a
+    sampled request are aggregated into the metrics registry and returned in the
+    `Server-Timing` response header. The middleware removes
+    itself from the stack when `METRICS_SAMPLE_RATE` is 0, so disabled
+    instrumentation costs nothing.
+    """
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+        self.sample_rate = settings.METRICS_SAMPLE_RATE
+        self.server_timing = settings.METRICS_SERVER_TIMING
+
+        if self.sample_rate <= 0:
+            raise MiddlewareNotUsed
+
+    def __call__(self, request):
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        timings = request.timings = RequestTimings()
+        token = _current_timings.set(timings)
+        start = perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timings))
+                response = self.get_response(request)
+        finally:
+            _current_timings.reset(token)
+        timings.total = perf_counter() - start
+
+        match = request.resolver_match
+        labels = {
+            "view": match.view_name if match else "unresolved",
+            "method": request.method,
+        }
+        request_duration.observe(timings.total, **labels)
+        request_db_duration.observe(timings.db, **labels)
+        request_db_queries.observe(timings.queries, **labels)
+        request_serialization_duration.observe(timings.serialization, **labels)
+
+        if self.server_timing:
+            response["Server-Timing"] = timings.server_timing
+
+        return response
+
+    def process_template_response(self, request, response):
+        timings = getattr(request, "timings", None)
+
+        if timings is not None:
+            start = perf_counter()
+
+            def record_serialization(rendered):
+                timings.serialization += perf_counter() - start
+
+            response.add_post_render_callback(record_serialization)
+
+        return response
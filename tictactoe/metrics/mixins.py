@@ -0,0 +1,20 @@
+from tictactoe.metrics.middleware import timed_serialization
+
+
+class SerializationTimingMixin:
+    """Viewset mixin recording the time serializers spend building response data.
+
+    The data of a serializer is built by `to_representation` when it is first read,
+    which is timed for the serializers returned by `get_serializer`.
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        to_representation = serializer.to_representation
+
+        def timed_to_representation(instance):
+            with timed_serialization():
+                return to_representation(instance)
+
+        serializer.to_representation = timed_to_representation
+        return serializer
@@ -0,0 +1,300 @@
+from threading import Lock
+from time import monotonic
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+import json
+import os
+import tempfile
+
+Labels = Tuple[Tuple[str, str], ...]
+Sample = Tuple[str, Labels, float]
+
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+
+def _labels(labels: dict) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (key, value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n"))
+        for key, value in labels
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+class Metric:
+    """Base class of in-process metrics kept per set of label values."""
+
+    type = ""
+
+    def __init__(
+        self, name: str, documentation: str, registry: Optional["Registry"] = None
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.registry = registry
+        self._lock = Lock()
+        self._values: Dict[Labels, object] = {}
+
+    def _changed(self) -> None:
+        if self.registry is not None:
+            self.registry.changed()
+
+    def samples(self) -> Iterator[Sample]:
+        """Yields (name, labels, value) samples of the metric."""
+        raise NotImplementedError
+
+    def dump(self) -> dict:
+        """Returns a JSON serializable snapshot of the metric."""
+        with self._lock:
+            values = [[list(map(list, labels)), value] for labels, value in self._values.items()]
+        return {"type": self.type, "documentation": self.documentation, "values": values}
+
+    def merge(self, snapshot: dict) -> None:
+        """Adds values of a snapshot taken in another process to the metric."""
+        with self._lock:
+            for labels, value in snapshot["values"]:
+                key = tuple(map(tuple, labels))
+                self._values[key] = self._add(self._values.get(key), value)
+
+    def _add(self, current, value):
+        return value if current is None else current + value
+
+
+class Counter(Metric):
+    """Monotonically increasing value."""
+
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = _labels(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+        self._changed()
+
+    def samples(self) -> Iterator[Sample]:
+        with self._lock:
+            values = list(self._values.items())
+        for labels, value in values:
+            yield f"{self.name}_total", labels, value
+
+
+class Gauge(Metric):
+    """Value that can arbitrarily go up and down."""
+
+    type = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[_labels(labels)] = value
+        self._changed()
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = _labels(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+        self._changed()
+
+    def samples(self) -> Iterator[Sample]:
+        with self._lock:
+            values = list(self._values.items())
+        for labels, value in values:
+            yield self.name, labels, value
+
+
+class Histogram(Metric):
+    """Distribution of observed values counted in cumulative buckets."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        registry: Optional["Registry"] = None,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, registry)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = _labels(labels)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                # Bucket counts followed by the overall count and sum
+                counts = self._values[key] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            counts[-2] += 1
+            counts[-1] += value
+        self._changed()
+
+    def dump(self) -> dict:
+        return {**super().dump(), "buckets": list(self.buckets)}
+
+    def _add(self, current, value):
+        return value if current is None else [a + b for a, b in zip(current, value)]
+
+    def samples(self) -> Iterator[Sample]:
+        with self._lock:
+            values = [(labels, list(counts)) for labels, counts in self._values.items()]
+        for labels, counts in values:
+            for bound, count in zip(self.buckets, counts):
+                yield f"{self.name}_bucket", labels + (("le", repr(bound)),), count
+            yield f"{self.name}_bucket", labels + (("le", "+Inf"),), counts[-2]
+            yield f"{self.name}_count", labels, counts[-2]
+            yield f"{self.name}_sum", labels, counts[-1]
+
+
+class MultiProcessStore:
+    """Shares metrics of many processes, e.g. gunicorn workers, through files.
+
+    Every process periodically dumps a snapshot of its metrics into its own file
+    in a shared directory, so writers never contend for a lock. Scrapes merge the
+    snapshots of all processes.
+    """
+
+    def __init__(self, directory: str, flush_interval: float = 1.0) -> None:
+        self.directory = directory
+        self.flush_interval = flush_interval
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.directory, f"metrics_{os.getpid()}.json")
+
+    def write(self, snapshot: Dict[str, dict]) -> None:
+        """Atomically replaces the snapshot file of the current process."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, self.path)
+
+    def read(self) -> Iterator[Dict[str, dict]]:
+        """Yields snapshots of all processes."""
+        for filename in os.listdir(self.directory):
+            if filename.startswith("metrics_") and filename.endswith(".json"):
+                try:
+                    with open(os.path.join(self.directory, filename)) as f:
+                        yield json.load(f)
+                except (OSError, ValueError):
+                    continue
+
+
+class Registry:
+    """Collection of metrics rendered in the Prometheus text exposition format."""
+
+    metric_classes = {"counter": Counter, "gauge": Gauge, "histogram": Histogram}
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Metric] = {}
+        self._collectors: List[Callable[[], Iterable[Metric]]] = []
+        self._lock = Lock()
+        self.store: Optional[MultiProcessStore] = None
+        self._next_flush = 0.0
+        self._collected: List[Metric] = []
+        self._collected_at: Optional[float] = None
+        self._collect_lock = Lock()
+
+    def _get_or_create(self, metric_class, name: str, documentation: str, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = metric_class(
+                    name, documentation, registry=self, **kwargs
+                )
+        return metric
+
+    def counter(self, name: str, documentation: str) -> Counter:
+        return self._get_or_create(Counter, name, documentation)
+
+    def gauge(self, name: str, documentation: str) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation)
+
+    def histogram(
+        self, name: str, documentation: str, buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, buckets=buckets)
+
+    def register_collector(self, collector: Callable[[], Iterable[Metric]]) -> None:
+        """Registers a callable producing metrics computed at scrape time.
+
+        Collected metrics describe shared state (e.g. database rows), so they are
+        rendered by the scraped process only and never stored across processes.
+        """
+        if collector not in self._collectors:
+            self._collectors.append(collector)
+
+    @property
+    def metrics(self) -> List[Metric]:
+        with self._lock:
+            return list(self._metrics.values())
+
+    def configure_multiprocess(self, directory: str, flush_interval: float = 1.0) -> None:
+        self.store = MultiProcessStore(directory, flush_interval)
+
+    def changed(self) -> None:
+        """Flushes a snapshot of metrics if the multiprocess flush interval passed."""
+        if self.store is not None and monotonic() >= self._next_flush:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.store is not None:
+            self._next_flush = monotonic() + self.store.flush_interval
+            self.store.write({metric.name: metric.dump() for metric in self.metrics})
+
+    def _merged_metrics(self) -> List[Metric]:
+        if self.store is None:
+            return self.metrics
+
+        self.flush()
+        merged: Dict[str, Metric] = {}
+        for snapshot in self.store.read():
+            for name, data in snapshot.items():
+                if name not in merged:
+                    kwargs = {"buckets": data["buckets"]} if "buckets" in data else {}
+                    merged[name] = self.metric_classes[data["type"]](
+                        name, data["documentation"], **kwargs
+                    )
+                merged[name].merge(data)
+
+        return list(merged.values())
+
+    def _collect(self, max_age: float) -> List[Metric]:
+        """Runs collectors, or returns their metrics of a run at most `max_age` seconds old."""
+        with self._collect_lock:
+            if self._collected_at is None or monotonic() - self._collected_at >= max_age:
+                self._collected = [metric for collector in self._collectors for metric in collector()]
+                self._collected_at = monotonic()
+            return self._collected
+
+    def render(self, collect_interval: float = 0.0) -> str:
+        """Renders all metrics, merged across processes, in the text exposition format.
+
+        Args:
+            collect_interval (float): seconds for which metrics of collectors, which
+                may query the database, are reused by subsequent scrapes
+
+        Returns:
+            str: metrics page
+        """
+        metrics = self._merged_metrics() + self._collect(collect_interval)
+
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
@@ -0,0 +1,97 @@
+from unittest import mock
+import re
+from django.urls import reverse
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+from tictactoe.games.models import Game
+from tictactoe.metrics.middleware import request_db_queries, timed_serialization
+from tictactoe.users.test.factories import UserFactory
+
+
+class TestQueryInstrumentationMiddleware(APITestCase):
+    def setUp(self) -> None:
+        self.user = UserFactory()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.user.auth_token}")
+
+    def _recorded_requests(self) -> float:
+        return sum(
+            value
+            for name, labels, value in request_db_queries.samples()
+            if name.endswith("_count") and ("view", "game-list") in labels
+        )
+
+    def test_server_timing_header(self):
+        response = self.client.get(reverse("game-list"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertRegex(
+            response["Server-Timing"],
+            r'^db;dur=[\d.]+;desc="\d+ queries", '
+            r"serialization;dur=[\d.]+, total;dur=[\d.]+$",
+        )
+
+    def _serialization_time(self, response) -> float:
+        return float(re.search(r"serialization;dur=([\d.]+)", response["Server-Timing"])[1])
+
+    def test_serialization_time_of_fast_paths_and_serializers(self):
+        for _ in range(20):
+            Game.objects.create(player_1=self.user)
+        game = Game.objects.create(player_1=self.user)
+
+        # Fast path encoding payloads straight from database tuples
+        self.assertGreater(self._serialization_time(self.client.get(reverse("game-list"))), 0)
+        # DRF serializer
+        with mock.patch(
+            "tictactoe.metrics.mixins.timed_serialization", wraps=timed_serialization
+        ) as timed:
+            response = self.client.get(reverse("game-detail", args=[game.id]), {"format": "api"})
+        self.assertEqual(1, timed.call_count)
+        self.assertGreater(self._serialization_time(response), 0)
+
+    def test_queries_are_aggregated_per_view(self):
+        recorded = self._recorded_requests()
+        self.client.get(reverse("game-list"))
+
+        self.assertEqual(recorded + 1, self._recorded_requests())
+
+    @override_settings(METRICS_SAMPLE_RATE=0)
+    def test_disabled_sampling(self):
+        recorded = self._recorded_requests()
+        response = self.client.get(reverse("game-list"))
+
+        self.assertFalse(response.has_header("Server-Timing"))
+        self.assertEqual(recorded, self._recorded_requests())
+
+    def test_metrics_endpoint(self):
+        self.client.get(reverse("game-list"))
+        response = self.client.get(reverse("metrics"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(
+            b'http_request_duration_seconds_count{method="GET",view="game-list"}',
+            response.content,
+        )
+
+    @override_settings(METRICS_COLLECT_INTERVAL=0)
+    def test_game_metrics(self):
+        self.client.post(reverse("game-list"), {})
+        response = self.client.get(reverse("metrics"))
+
+        self.assertIn(b"games_created_total", response.content)
+        self.assertIn(b'active_games{status="not_started"} 1', response.content)
+
+    @override_settings(METRICS_ALLOWED_IPS=["10.0.0.0/8"], METRICS_TOKEN="secret")
+    def test_metrics_endpoint_access(self):
+        url = reverse("metrics")
+        self.client.credentials()
+
+        self.assertEqual(status.HTTP_403_FORBIDDEN, self.client.get(url).status_code)
+        self.assertEqual(
+            status.HTTP_403_FORBIDDEN,
+            self.client.get(url, HTTP_AUTHORIZATION="Bearer wrong").status_code,
+        )
+        self.assertEqual(
+            status.HTTP_200_OK, self.client.get(url, HTTP_AUTHORIZATION="Bearer secret").status_code
+        )
+        self.assertEqual(status.HTTP_200_OK, self.client.get(url, REMOTE_ADDR="10.1.2.3").status_code)
@@ -0,0 +1,84 @@
+from unittest import mock
+import tempfile
+from django.test import SimpleTestCase
+from tictactoe.metrics.registry import Gauge, Registry
+
+
+class TestRegistry(SimpleTestCase):
+    def setUp(self) -> None:
+        self.registry = Registry()
+
+    def test_counter(self):
+        counter = self.registry.counter("games_created", "Created games.")
+        counter.inc()
+        counter.inc(2)
+
+        self.assertIn("# TYPE games_created counter", self.registry.render())
+        self.assertIn("games_created_total 3", self.registry.render())
+
+    def test_histogram(self):
+        histogram = self.registry.histogram("latency", "Latency.", buckets=(0.1, 1))
+        histogram.observe(0.05, view="game-list")
+        histogram.observe(0.5, view="game-list")
+        histogram.observe(5, view="game-list")
+        page = self.registry.render()
+
+        self.assertIn('latency_bucket{view="game-list",le="0.1"} 1', page)
+        self.assertIn('latency_bucket{view="game-list",le="1"} 2', page)
+        self.assertIn('latency_bucket{view="game-list",le="+Inf"} 3', page)
+        self.assertIn('latency_count{view="game-list"} 3', page)
+        self.assertIn('latency_sum{view="game-list"} 5.55', page)
+
+    def test_metric_is_registered_once(self):
+        self.assertIs(
+            self.registry.gauge("active_games", "Active games."),
+            self.registry.gauge("active_games", "Active games."),
+        )
+
+    def test_metrics_are_merged_across_processes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for pid, observations in ((100, (0.05, 0.5)), (200, (5,))):
+                with mock.patch("os.getpid", return_value=pid):
+                    registry = Registry()
+                    registry.configure_multiprocess(directory, flush_interval=60)
+                    registry.counter("moves", "Moves.").inc(len(observations))
+                    histogram = registry.histogram(
+                        "latency", "Latency.", buckets=(0.1, 1)
+                    )
+                    for value in observations:
+                        histogram.observe(value)
+                    registry.flush()
+
+            page = Registry()
+            page.configure_multiprocess(directory)
+            with mock.patch("os.getpid", return_value=300):
+                rendered = page.render()
+
+        self.assertIn("moves_total 3", rendered)
+        self.assertIn('latency_bucket{le="1"} 2', rendered)
+        self.assertIn('latency_bucket{le="+Inf"} 3', rendered)
+
+    def test_collectors_are_rendered(self):
+        def collector():
+            gauge = Gauge("active_games", "Active games.")
+            gauge.set(4, status="in_progress")
+            return [gauge]
+
+        self.registry.register_collector(collector)
+
+        self.assertIn('active_games{status="in_progress"} 4', self.registry.render())
+
+    def test_collected_metrics_are_reused_within_the_interval(self):
+        calls = []
+
+        def collector():
+            calls.append(1)
+            gauge = Gauge("active_games", "Active games.")
+            gauge.set(len(calls), status="in_progress")
+            return [gauge]
+
+        self.registry.register_collector(collector)
+
+        self.registry.render(collect_interval=60)
+        self.assertIn('active_games{status="in_progress"} 1', self.registry.render(collect_interval=60))
+        self.assertIn('active_games{status="in_progress"} 2', self.registry.render())
@@ -0,0 +1,40 @@
+from ipaddress import ip_address, ip_network
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+from tictactoe.metrics.registry import REGISTRY
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def is_allowed(request) -> bool:
+    """Checks if a request may read metrics.
+
+    Requests carrying `METRICS_TOKEN` as a bearer token are allowed, as are
+    requests from addresses in `METRICS_ALLOWED_IPS` networks.
+
+    Args:
+        request: incoming request
+
+    Returns:
+        bool: True if the request may read metrics
+    """
+    token = settings.METRICS_TOKEN
+    authorization = request.META.get("HTTP_AUTHORIZATION", "")
+    if token and constant_time_compare(authorization, f"Bearer {token}"):
+        return True
+
+    try:
+        address = ip_address(request.META.get("REMOTE_ADDR", ""))
+    except ValueError:
+        return False
+    return any(address in ip_network(network, strict=False) for network in settings.METRICS_ALLOWED_IPS)
+
+
+def metrics(request) -> HttpResponse:
+    """Exposes collected metrics in the Prometheus text exposition format."""
+    if not is_allowed(request):
+        return HttpResponseForbidden()
+    return HttpResponse(
+        REGISTRY.render(settings.METRICS_COLLECT_INTERVAL), content_type=CONTENT_TYPE
+    )
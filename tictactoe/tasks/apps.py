@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
+
+
+class TasksConfig(AppConfig):
+    name = "tictactoe.tasks"
+
+    def ready(self) -> None:
+        import tictactoe.tasks.metrics  # noqa: F401 registers the queue collector
+
+        # Registers tasks defined in `tasks` modules of installed apps
+        autodiscover_modules("tasks")
@@ -0,0 +1,51 @@
+from datetime import timedelta
+from time import monotonic, sleep
+from django.core.management.base import BaseCommand
+from tictactoe.tasks import queue
+
+
+class Command(BaseCommand):
+    help = "Runs queued background tasks until interrupted, or until the queue is drained."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument(
+            "--interval", type=float, default=0.5, help="seconds to sleep when no task is due"
+        )
+        parser.add_argument(
+            "--once", action="store_true", help="exit once no task is due instead of polling"
+        )
+        parser.add_argument(
+            "--recover-after",
+            type=float,
+            default=300,
+            help="seconds after which tasks left running by a dead worker are queued again",
+        )
+        parser.add_argument(
+            "--purge-days",
+            type=float,
+            default=7,
+            help="days after which done tasks and their idempotency keys are deleted",
+        )
+
+    def handle(self, *args, **options):
+        processed = 0
+        maintained = None
+
+        while True:
+            if maintained is None or monotonic() - maintained > options["recover_after"]:
+                recovered = queue.recover(options["recover_after"])
+                purged = queue.purge(timedelta(days=options["purge_days"]))
+                if recovered or purged:
+                    self.stdout.write(f"Queued {recovered} lost tasks, purged {purged} done tasks")
+                maintained = monotonic()
+
+            count = queue.run_pending(options["batch_size"])
+            processed += count
+            if count:
+                continue
+            if options["once"]:
+                break
+            sleep(options["interval"])
+
+        self.stdout.write(f"Ran {processed} tasks")
@@ -0,0 +1,44 @@
+from typing import List
+from django.db.models import Count, Min
+from django.utils import timezone
+from tictactoe.metrics.registry import REGISTRY, Gauge, Metric
+from tictactoe.tasks.models import Task
+
+TASK_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300)
+
+task_latency = REGISTRY.histogram(
+    "task_latency_seconds", "Time between a task being due and a worker starting it.", TASK_BUCKETS
+)
+task_duration = REGISTRY.histogram(
+    "task_duration_seconds", "Time taken to run a task.", TASK_BUCKETS
+)
+tasks_processed = REGISTRY.counter(
+    "tasks_processed", "Tasks run by workers by result (done, retried or failed)."
+)
+
+
+def queue_depth() -> List[Metric]:
+    """Reports the number of tasks per status and the age of the oldest due task.
+
+    Returns:
+        List[Metric]: gauges of queue depth and of the oldest due task
+    """
+    depth = Gauge("task_queue_depth", "Tasks in the queue by status.")
+    counts = (
+        Task.objects.exclude(status="done")
+        .order_by()
+        .values_list("status")
+        .annotate(count=Count("id"))
+    )
+    for status, count in counts:
+        depth.set(count, status=status)
+
+    oldest = Gauge("task_queue_oldest_seconds", "Time the oldest due task has been waiting.")
+    now = timezone.now()
+    due = Task.objects.filter(status="queued", run_after__lte=now).aggregate(Min("run_after"))
+    oldest.set((now - due["run_after__min"]).total_seconds() if due["run_after__min"] else 0)
+
+    return [depth, oldest]
+
+
+REGISTRY.register_collector(queue_depth)
@@ -0,0 +1,33 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Task(models.Model):
+    """Background task queued in the database and run by `run_tasks` workers."""
+
+    STATUS_CHOICES = (
+        ("queued", "Queued"),
+        ("running", "Running"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+    )
+    id = models.BigAutoField(primary_key=True)
+    # Name under which the task function is registered
+    name = models.CharField(max_length=100)
+    kwargs = models.JSONField(default=dict)
+    # Queueing a task with the key of a task still in the table is a no-op
+    idempotency_key = models.CharField(max_length=200, unique=True, null=True)
+    status = models.CharField(choices=STATUS_CHOICES, max_length=10, default="queued")
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField()
+    run_after = models.DateTimeField(default=timezone.now)
+    created = models.DateTimeField(default=timezone.now)
+    started = models.DateTimeField(null=True)
+    finished = models.DateTimeField(null=True)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "run_after"])]
+
+    def __str__(self) -> str:
+        return f"Task {self.id} - {self.name} {self.status}"
@@ -0,0 +1,179 @@
+"""Database-backed queue of background tasks.
+
+Tasks are rows inserted in the transaction of the change that triggers them, so
+they are queued exactly when that change commits and never before, and no broker
+besides the database is needed. `run_tasks` workers claim due tasks with
+`SELECT ... FOR UPDATE SKIP LOCKED`, run each of them in a transaction together
+with marking it done, and retry failed ones with exponential backoff.
+"""
+from datetime import timedelta
+from typing import Callable, Dict, List, Optional, Union
+import logging
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from tictactoe.tasks import metrics
+from tictactoe.tasks.models import Task
+
+logger = logging.getLogger(__name__)
+
+TASKS: Dict[str, Callable] = {}
+
+
+def task(func: Optional[Callable] = None, *, name: Optional[str] = None) -> Callable:
+    """Registers a function as a task, under its dotted path by default.
+
+    Task functions receive the JSON serializable keyword arguments they were
+    queued with. They may run more than once if a worker dies while running them,
+    so they should be safe to repeat.
+    """
+
+    def register(func: Callable) -> Callable:
+        func.task_name = name or f"{func.__module__}.{func.__qualname__}"
+        TASKS[func.task_name] = func
+        return func
+
+    return register(func) if func is not None else register
+
+
+def enqueue(
+    func: Union[Callable, str],
+    kwargs: Optional[dict] = None,
+    key: Optional[str] = None,
+    delay: float = 0,
+    max_attempts: Optional[int] = None,
+) -> None:
+    """Queues a task; call it in the transaction of the change triggering it.
+
+    Args:
+        func (Union[Callable, str]): registered task function or its name
+        kwargs (Optional[dict]): JSON serializable keyword arguments of the task
+        key (Optional[str]): idempotency key; the task is not queued again while
+            a task with the same key is kept in the queue
+        delay (float): seconds after which the task is due
+        max_attempts (Optional[int]): runs before the task is marked as failed
+    """
+    now = timezone.now()
+    Task.objects.bulk_create(
+        [
+            Task(
+                name=func if isinstance(func, str) else func.task_name,
+                kwargs=kwargs or {},
+                idempotency_key=key,
+                max_attempts=max_attempts or settings.TASKS_MAX_ATTEMPTS,
+                run_after=now + timedelta(seconds=delay),
+                created=now,
+            )
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def claim(batch_size: int) -> List[Task]:
+    """Marks a batch of due tasks as running; locked tasks are left to other workers.
+
+    Args:
+        batch_size (int): maximum number of claimed tasks
+
+    Returns:
+        List[Task]: claimed tasks
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        tasks = list(
+            Task.objects.select_for_update(skip_locked=True)
+            .filter(status="queued", run_after__lte=now)
+            .order_by("run_after")[:batch_size]
+        )
+        Task.objects.filter(pk__in=[task.pk for task in tasks]).update(
+            status="running", started=now, attempts=F("attempts") + 1
+        )
+
+    for task in tasks:
+        metrics.task_latency.observe((now - task.run_after).total_seconds(), task=task.name)
+        task.status, task.started, task.attempts = "running", now, task.attempts + 1
+    return tasks
+
+
+def execute(task: Task) -> bool:
+    """Runs a claimed task, then marks it done or schedules its retry.
+
+    Args:
+        task (Task): claimed task
+
+    Returns:
+        bool: True if the task succeeded
+    """
+    try:
+        with transaction.atomic():
+            func = TASKS.get(task.name)
+            if func is None:
+                raise LookupError(f"Task {task.name} is not registered")
+            func(**task.kwargs)
+            Task.objects.filter(pk=task.pk).update(
+                status="done", finished=timezone.now(), last_error=""
+            )
+    except Exception as error:
+        logger.exception("Task %s (%s) failed", task.pk, task.name)
+        retry = task.attempts < task.max_attempts
+        delay = settings.TASKS_RETRY_DELAY * 2 ** (task.attempts - 1)
+        Task.objects.filter(pk=task.pk).update(
+            status="queued" if retry else "failed",
+            run_after=timezone.now() + timedelta(seconds=delay),
+            finished=None if retry else timezone.now(),
+            last_error=repr(error),
+        )
+        result = "retried" if retry else "failed"
+    else:
+        result = "done"
+
+    metrics.task_duration.observe(
+        (timezone.now() - task.started).total_seconds(), task=task.name
+    )
+    metrics.tasks_processed.inc(task=task.name, result=result)
+    return result == "done"
+
+
+def run_pending(batch_size: int = 100) -> int:
+    """Claims and runs a batch of due tasks.
+
+    Args:
+        batch_size (int): maximum number of tasks run
+
+    Returns:
+        int: number of tasks run
+    """
+    tasks = claim(batch_size)
+    for task in tasks:
+        execute(task)
+    return len(tasks)
+
+
+def recover(timeout: float) -> int:
+    """Queues again tasks left running by workers that died.
+
+    Args:
+        timeout (float): seconds after which a running task is considered lost
+
+    Returns:
+        int: number of queued tasks
+    """
+    return Task.objects.filter(
+        status="running", started__lt=timezone.now() - timedelta(seconds=timeout)
+    ).update(status="queued", run_after=timezone.now())
+
+
+def purge(older_than: timedelta) -> int:
+    """Deletes tasks done before the given time, releasing their idempotency keys.
+
+    Args:
+        older_than (timedelta): age of finished tasks to delete
+
+    Returns:
+        int: number of deleted tasks
+    """
+    deleted, _ = Task.objects.filter(
+        status="done", finished__lt=timezone.now() - older_than
+    ).delete()
+    return deleted
@@ -0,0 +1,141 @@
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from tictactoe.games.models import Game, ProjectedLeaderboardEntry
+from tictactoe.games.services import GameService
+from tictactoe.tasks import queue
+from tictactoe.tasks.metrics import queue_depth
+from tictactoe.tasks.models import Task
+from tictactoe.users.models import User
+from tictactoe.users.test.factories import UserFactory
+
+calls = []
+
+
+@queue.task(name="test.record")
+def record(value: int) -> None:
+    calls.append(value)
+
+
+@queue.task(name="test.fail")
+def fail() -> None:
+    Task.objects.filter(name="test.record").delete()
+    raise RuntimeError("boom")
+
+
+@override_settings(TASKS_MAX_ATTEMPTS=3, TASKS_RETRY_DELAY=10)
+class TestQueue(TestCase):
+    def setUp(self) -> None:
+        calls.clear()
+
+    def test_runs_due_tasks(self):
+        queue.enqueue(record, {"value": 1})
+        queue.enqueue("test.record", {"value": 2}, delay=60)
+
+        self.assertEqual(1, queue.run_pending())
+
+        self.assertEqual([1], calls)
+        self.assertEqual(
+            ["done", "queued"], list(Task.objects.order_by("id").values_list("status", flat=True))
+        )
+        self.assertEqual(0, queue.run_pending())
+
+    def test_tasks_are_queued_with_the_transaction(self):
+        try:
+            with transaction.atomic():
+                queue.enqueue(record, {"value": 1})
+                raise ValueError
+        except ValueError:
+            pass
+
+        self.assertFalse(Task.objects.exists())
+
+    def test_idempotency_key(self):
+        queue.enqueue(record, {"value": 1}, key="once")
+        queue.enqueue(record, {"value": 2}, key="once")
+        queue.run_pending()
+        queue.enqueue(record, {"value": 3}, key="once")
+        queue.run_pending()
+
+        self.assertEqual([1], calls)
+
+        queue.purge(timedelta(0))
+        queue.enqueue(record, {"value": 4}, key="once")
+        queue.run_pending()
+        self.assertEqual([1, 4], calls)
+
+    def test_retries_with_backoff_until_failed(self):
+        queue.enqueue(record, {"value": 1})
+        queue.enqueue(fail)
+        task = Task.objects.get(name="test.fail")
+
+        for attempt in range(3):
+            Task.objects.filter(pk=task.pk).update(run_after=timezone.now())
+            with self.assertLogs("tictactoe.tasks.queue", "ERROR"):
+                queue.run_pending()
+            task.refresh_from_db()
+            self.assertEqual(attempt + 1, task.attempts)
+            if attempt < 2:
+                self.assertEqual("queued", task.status)
+                delay = task.run_after - timezone.now()
+                self.assertAlmostEqual(10 * 2 ** attempt, delay.total_seconds(), delta=1)
+
+        self.assertEqual("failed", task.status)
+        self.assertIn("boom", task.last_error)
+        # Writes of a failed task are rolled back
+        self.assertTrue(Task.objects.filter(name="test.record").exists())
+
+    def test_recovers_tasks_of_dead_workers(self):
+        queue.enqueue(record, {"value": 1})
+        queue.claim(10)
+
+        self.assertEqual(0, queue.recover(timeout=60))
+        Task.objects.update(started=timezone.now() - timedelta(minutes=2))
+        self.assertEqual(1, queue.recover(timeout=60))
+        queue.run_pending()
+
+        self.assertEqual([1], calls)
+
+    def test_reports_queue_depth(self):
+        queue.enqueue(record, {"value": 1})
+        queue.enqueue(record, {"value": 2}, delay=60)
+        Task.objects.filter(kwargs__value=1).update(run_after=timezone.now() - timedelta(seconds=30))
+
+        depth, oldest = queue_depth()
+
+        self.assertEqual([("task_queue_depth", (("status", "queued"),), 2)], list(depth.samples()))
+        self.assertGreaterEqual(next(oldest.samples())[2], 30)
+
+    def test_run_tasks_command(self):
+        for value in range(3):
+            queue.enqueue(record, {"value": value})
+
+        out = StringIO()
+        call_command("run_tasks", "--once", "--batch-size", "2", stdout=out)
+
+        self.assertEqual([0, 1, 2], calls)
+        self.assertIn("Ran 3 tasks", out.getvalue())
+
+
+class TestFinishedGameTasks(TestCase):
+    def test_projections_are_updated_in_background(self):
+        player_1 = User.objects.get(pk=UserFactory().pk)
+        player_2 = User.objects.get(pk=UserFactory().pk)
+        game = Game.objects.create(player_1=player_1, player_2=player_2, status="in_progress")
+
+        for row, column in ((0, 0), (1, 0), (0, 1), (1, 1), (0, 2)):
+            user, _ = game.get_next_player_and_mark()
+            GameService.move(game, {"row": row, "column": column}, user)
+
+        self.assertEqual(
+            {"tictactoe.games.tasks.update_projections", "tictactoe.games.tasks.update_user_stats"},
+            set(Task.objects.filter(status="queued").values_list("name", flat=True)),
+        )
+        self.assertFalse(ProjectedLeaderboardEntry.objects.exists())
+
+        queue.run_pending()
+
+        self.assertEqual(1, ProjectedLeaderboardEntry.objects.get(user_id=player_1.id).wins)
@@ -1,12 +1,18 @@
+from django.apps import apps
 from django.conf import settings
 from django.urls import path, re_path, include, reverse_lazy
 from django.conf.urls.static import static
-from django.contrib import admin
 from django.views.generic.base import RedirectView
 from rest_framework.routers import DefaultRouter
 from rest_framework.authtoken import views
-from tictactoe.users.views import UserViewSet, UserCreateViewSet, HighscoreViewSet
-from tictactoe.games.views import GameViewSet
+from tictactoe.users.views import (
+    UserViewSet,
+    UserCreateViewSet,
+    HighscoreViewSet,
+    LeaderboardViewSet,
+)
+from tictactoe.games.views import GameViewSet, OpeningBookViewSet
+from tictactoe.metrics.views import metrics
 
 router = DefaultRouter()
 router.register(r"users", UserViewSet)
@@ -15,17 +21,31 @@ router.register(r"games", GameViewSet)
 
 highscore_list = HighscoreViewSet.as_view({"get": "list"})
 highscore_detail = HighscoreViewSet.as_view({"get": "retrieve"})
+leaderboard = LeaderboardViewSet.as_view({"get": "list"})
+openings = OpeningBookViewSet.as_view({"get": "list"})
 # from pprint import pprint
 # pprint(router.urls)
 
 urlpatterns = [
-    path("admin/", admin.site.urls),
     path("api/v1/", include(router.urls)),
     path("api/v1/highscores/<uuid:pk>/", highscore_detail, name="highscore-detail"),
     path("api/v1/highscores/", highscore_list, name="highscore-list"),
+    path("api/v1/leaderboard/", leaderboard, name="leaderboard"),
+    path("api/v1/analysis/openings/", openings, name="openings"),
     path("api-token-auth/", views.obtain_auth_token),
-    path("api-auth/", include("rest_framework.urls", namespace="rest_framework")),
+    path("metrics", metrics, name="metrics"),
     # the 'api-root' from django rest-frameworks default router
     # http://www.django-rest-framework.org/api-guide/routers/#defaultrouter
     re_path(r"^$", RedirectView.as_view(url=reverse_lazy("api-root"), permanent=False)),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+
+# The admin and browsable API login are left out of API-only workers (see the
+# `Api` configuration), so that they do not import them at all
+if apps.is_installed("django.contrib.admin"):
+    from django.contrib import admin
+
+    urlpatterns.append(path("admin/", admin.site.urls))
+if apps.is_installed("django.contrib.sessions"):
+    urlpatterns.append(
+        path("api-auth/", include("rest_framework.urls", namespace="rest_framework"))
+    )
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+from tictactoe.users import stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares stats counters of randomly sampled users with a fresh aggregate "
+        "of their finished games; fails if any differ."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sample", type=int, default=100, help="number of sampled users")
+        parser.add_argument(
+            "--fix", action="store_true", help="overwrite wrong counters with fresh ones"
+        )
+
+    def handle(self, *args, **options):
+        mismatches = stats.check(options["sample"], fix=options["fix"])
+
+        for stored, expected in mismatches:
+            differences = ", ".join(
+                f"{counter} {getattr(stored, counter)} != {getattr(expected, counter)}"
+                for counter in stats.COUNTERS
+                if getattr(stored, counter) != getattr(expected, counter)
+            )
+            self.stdout.write(f"User {stored.user_id}: {differences}")
+
+        if mismatches and not options["fix"]:
+            raise CommandError(f"Stats of {len(mismatches)} sampled users are inconsistent")
+        self.stdout.write(
+            f"Fixed stats of {len(mismatches)} sampled users"
+            if mismatches
+            else f"Stats of {options['sample']} sampled users are consistent"
+        )
@@ -0,0 +1,23 @@
+# Generated by Django 4.0.1 on 2026-10-19 03:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_time_ordered_ids'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='rated_games',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='rating',
+            field=models.FloatField(db_index=True, default=1500.0, editable=False),
+        ),
+    ]
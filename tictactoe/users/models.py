@@ -1,19 +1,46 @@
-import uuid
 from django.db import models
 from django.conf import settings
 from django.dispatch import receiver
 from django.contrib.auth.models import AbstractUser
 from django.db.models.signals import post_save
 from rest_framework.authtoken.models import Token
+from tictactoe.db.ids import generate_id
+
+
+INITIAL_RATING = 1500.0
 
 
 class User(AbstractUser):
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=generate_id, editable=False)
+    # Elo rating, updated when a game of the user finishes
+    rating = models.FloatField(default=INITIAL_RATING, db_index=True, editable=False)
+    rated_games = models.PositiveIntegerField(default=0, editable=False)
 
     def __str__(self):
         return self.username
 
 
+class UserStats(models.Model):
+    """Results of finished games of a user, counted as games finish."""
+
+    user = models.OneToOneField(
+        User, on_delete=models.CASCADE, primary_key=True, related_name="stats"
+    )
+    played = models.PositiveIntegerField(default=0)
+    wins = models.PositiveIntegerField(default=0)
+    losses = models.PositiveIntegerField(default=0)
+    draws = models.PositiveIntegerField(default=0)
+    # Consecutive wins (positive) or losses (negative) up to the last game
+    streak = models.IntegerField(default=0)
+    # Moves of both players in all finished games of the user
+    total_moves = models.PositiveIntegerField(default=0)
+
+    @property
+    def average_moves(self) -> float:
+        """Average number of moves of a finished game of the user."""
+        return self.total_moves / self.played if self.played else 0.0
+
+
 @receiver(post_save, sender=settings.AUTH_USER_MODEL)
 def create_auth_token(sender, instance=None, created=False, **kwargs):
     if created:
@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import User
+from .models import User, UserStats
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -46,3 +46,29 @@ class UserHighscoreSerializer(serializers.ModelSerializer):
             "username",
             "wins_count",
         )
+
+
+class UserRatingSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = (
+            "id",
+            "username",
+            "rating",
+            "rated_games",
+        )
+
+
+class UserStatsSerializer(serializers.ModelSerializer):
+    average_moves = serializers.FloatField()
+
+    class Meta:
+        model = UserStats
+        fields = (
+            "played",
+            "wins",
+            "losses",
+            "draws",
+            "streak",
+            "average_moves",
+        )
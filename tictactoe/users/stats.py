@@ -0,0 +1,163 @@
+"""Per-user counters of finished games kept in `UserStats`.
+
+Counters are incremented by a background task queued when a game finishes (see
+`tictactoe.games.tasks`), so reading them never aggregates games. They can be
+rebuilt from the results of finished games in the event log and checked against
+a fresh aggregate. Games played before the log was introduced must be
+backfilled first.
+"""
+from operator import itemgetter
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from django.db import transaction
+from django.db.models import Case, F, Q, Value, When
+from tictactoe.games.models import ArchivedGame, Game, GameEvent
+from tictactoe.tasks.models import Task
+from tictactoe.users.models import UserStats
+
+COUNTERS = ("played", "wins", "losses", "draws", "total_moves", "streak")
+# Game ids per query reading results of sampled users' games
+CHECK_BATCH_SIZE = 500
+
+
+def _result(user_id, winner_id) -> str:
+    if winner_id is None:
+        return "draws"
+    return "wins" if str(winner_id) == str(user_id) else "losses"
+
+
+def record_game(players: Iterable, winner_id: Optional[object], moves: int) -> None:
+    """Counts a finished game in stats of both of its players.
+
+    Args:
+        players (Iterable): ids of players of the game
+        winner_id (Optional[object]): id of the winner, None for a draw
+        moves (int): number of moves of the game
+    """
+    streaks = {
+        "wins": Case(When(streak__gt=0, then=F("streak") + 1), default=Value(1)),
+        "losses": Case(When(streak__lt=0, then=F("streak") - 1), default=Value(-1)),
+        "draws": Value(0),
+    }
+    for user_id in sorted(filter(None, players), key=str):
+        result = _result(user_id, winner_id)
+        UserStats.objects.get_or_create(user_id=user_id)
+        UserStats.objects.filter(user_id=user_id).update(
+            played=F("played") + 1,
+            total_moves=F("total_moves") + moves,
+            streak=streaks[result],
+            **{result: F(result) + 1},
+        )
+
+
+def _count(games: Iterable[Tuple]) -> Dict[object, UserStats]:
+    """Builds unsaved stats from (player_1_id, player_2_id, winner_id, moves) tuples."""
+    stats: Dict[object, UserStats] = {}
+    for player_1_id, player_2_id, winner_id, moves in games:
+        for user_id in (player_1_id, player_2_id):
+            user_stats = stats.setdefault(str(user_id), UserStats(user_id=user_id))
+            result = _result(user_id, winner_id)
+            setattr(user_stats, result, getattr(user_stats, result) + 1)
+            user_stats.played += 1
+            user_stats.total_moves += moves
+            if result == "wins":
+                user_stats.streak = max(user_stats.streak, 0) + 1
+            elif result == "losses":
+                user_stats.streak = min(user_stats.streak, 0) - 1
+            else:
+                user_stats.streak = 0
+    return stats
+
+
+def _results(events: Iterable[dict]) -> Iterator[Tuple]:
+    """Reads (player_1_id, player_2_id, winner_id, moves) tuples of games counted in
+    stats from data of their `finished` events.
+    """
+    for data in events:
+        player_1_id, player_2_id = data["players"]
+        if player_1_id is not None and player_2_id is not None:
+            yield player_1_id, player_2_id, data["winner"], data["moves"]
+
+
+def rebuild(batch_size: int = 2000) -> int:
+    """Replaces stats of all users with counts of all finished games.
+
+    Results are streamed from the `finished` events of the log, which outlive
+    archived games, in the order the games finished, which streaks follow. Stats
+    tasks should not run meanwhile.
+
+    Args:
+        batch_size (int): events fetched and stats written per query
+
+    Returns:
+        int: number of users with stats
+    """
+    events = (
+        GameEvent.objects.filter(type="finished")
+        .order_by("id")
+        .values_list("data", flat=True)
+        .iterator(chunk_size=batch_size)
+    )
+    stats = _count(_results(events))
+    with transaction.atomic():
+        UserStats.objects.all().delete()
+        UserStats.objects.bulk_create(stats.values(), batch_size=batch_size)
+    return len(stats)
+
+
+def _pending_users() -> Set[str]:
+    """Returns ids of players of games whose stats tasks have not run yet."""
+    pending = Task.objects.filter(
+        idempotency_key__startswith="update_user_stats:", status__in=("queued", "running")
+    ).values_list("kwargs", flat=True)
+    return {player for kwargs in pending for player in kwargs["players"]}
+
+
+def check(sample_size: int, fix: bool = False) -> List[Tuple[UserStats, UserStats]]:
+    """Compares counters of randomly sampled users with a fresh aggregate of their games.
+
+    Results are read from the `finished` events of the games, in the order the
+    games finished, so that streaks are compared too. Counters of users with
+    stats tasks still pending lag behind their games and would be counted twice
+    once fixed, so these users are skipped. Pending tasks are read after the
+    games, so that games finishing meanwhile skip their players too.
+
+    Args:
+        sample_size (int): number of sampled users with stats
+        fix (bool): overwrite wrong counters with the fresh ones
+
+    Returns:
+        List[Tuple[UserStats, UserStats]]: stored and fresh stats of users whose
+            counters differ
+    """
+    stored = {str(stats.user_id): stats for stats in UserStats.objects.order_by("?")[:sample_size]}
+    user_ids = [stats.user_id for stats in stored.values()]
+
+    game_ids = []
+    for model in (Game, ArchivedGame):
+        game_ids.extend(
+            model.objects.filter(Q(player_1__in=user_ids) | Q(player_2__in=user_ids))
+            .filter(status="finished")
+            .values_list("id", flat=True)
+        )
+    events = []
+    for offset in range(0, len(game_ids), CHECK_BATCH_SIZE):
+        events.extend(
+            GameEvent.objects.filter(
+                type="finished", game_id__in=game_ids[offset:offset + CHECK_BATCH_SIZE]
+            ).values_list("id", "data")
+        )
+    events.sort(key=itemgetter(0))
+    fresh = _count(_results(data for _, data in events))
+    pending = _pending_users()
+
+    mismatches = []
+    for user_id, stats in stored.items():
+        if user_id in pending:
+            continue
+        expected = fresh.get(user_id, UserStats(user_id=stats.user_id))
+        if any(getattr(stats, counter) != getattr(expected, counter) for counter in COUNTERS):
+            mismatches.append((stats, expected))
+
+    if fix:
+        UserStats.objects.bulk_update([expected for _, expected in mismatches], COUNTERS)
+    return mismatches
@@ -0,0 +1,126 @@
+from datetime import timedelta
+from io import StringIO
+from django.core.management import CommandError, call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from tictactoe.games.archive import archive_batch
+from tictactoe.games.models import Game
+from tictactoe.games.services import GameService
+from tictactoe.tasks import queue
+from tictactoe.users import stats
+from tictactoe.users.models import User, UserStats
+from tictactoe.users.test.factories import UserFactory
+
+WIN = ((0, 0), (1, 0), (0, 1), (1, 1), (0, 2))
+DRAW = ((0, 0), (0, 1), (0, 2), (1, 1), (1, 0), (1, 2), (2, 1), (2, 0), (2, 2))
+
+
+class TestUserStats(APITestCase):
+    def setUp(self) -> None:
+        self.player_1 = User.objects.get(pk=UserFactory().pk)
+        self.player_2 = User.objects.get(pk=UserFactory().pk)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.player_1.auth_token}")
+
+    def _play(self, moves, player_1: User, player_2: User) -> Game:
+        game = Game.objects.create(player_1=player_1, player_2=player_2, status="in_progress")
+        for row, column in moves:
+            user, _ = game.get_next_player_and_mark()
+            GameService.move(game, {"row": row, "column": column}, user)
+        return game
+
+    def _stats(self, user: User) -> dict:
+        response = self.client.get(reverse("user-stats", kwargs={"pk": user.pk}))
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        return response.data
+
+    def _play_history(self) -> None:
+        self._play(WIN, self.player_1, self.player_2)
+        self._play(DRAW, self.player_2, self.player_1)
+        self._play(WIN, self.player_2, self.player_1)
+        self._play(WIN, self.player_2, self.player_1)
+        queue.run_pending()
+
+    def test_stats_are_counted_as_games_finish(self):
+        self._play_history()
+
+        self.assertEqual(
+            {"played": 4, "wins": 1, "losses": 2, "draws": 1, "streak": -2, "average_moves": 6.0},
+            self._stats(self.player_1),
+        )
+        self.assertEqual(2, self._stats(self.player_2)["streak"])
+
+    def test_user_without_finished_games(self):
+        self.assertEqual(0, self._stats(self.player_1)["played"])
+        self.assertEqual(0.0, self._stats(self.player_1)["average_moves"])
+
+    def test_game_is_counted_once(self):
+        game = self._play(WIN, self.player_1, self.player_2)
+        GameService._queue_finished_game_tasks(game)
+        queue.run_pending()
+        GameService._queue_finished_game_tasks(game)
+        queue.run_pending()
+
+        self.assertEqual(1, self._stats(self.player_1)["played"])
+
+    def test_rebuild_counts_all_finished_games(self):
+        self._play_history()
+        expected = {user.pk: self._stats(user) for user in (self.player_1, self.player_2)}
+        old = timezone.now() - timedelta(days=60)
+        for i, game in enumerate(Game.objects.order_by("created")):
+            Game.objects.filter(pk=game.pk).update(created=old + timedelta(seconds=i))
+        archive_batch(timezone.now() - timedelta(days=30), batch_size=2)
+        UserStats.objects.all().delete()
+
+        out = StringIO()
+        call_command("rebuild_user_stats", stdout=out)
+
+        self.assertIn("Rebuilt stats of 2 users", out.getvalue())
+        for user in (self.player_1, self.player_2):
+            self.assertEqual(expected[user.pk], self._stats(user))
+
+    def test_check_finds_and_fixes_drifted_counters(self):
+        self._play_history()
+        call_command("check_user_stats", stdout=StringIO())
+        UserStats.objects.filter(user=self.player_1).update(wins=5)
+
+        out = StringIO()
+        with self.assertRaises(CommandError):
+            call_command("check_user_stats", "--sample", "10", stdout=out)
+        self.assertIn(f"User {self.player_1.pk}: wins 5 != 1", out.getvalue())
+
+        call_command("check_user_stats", "--fix", stdout=StringIO())
+        self.assertEqual(1, self._stats(self.player_1)["wins"])
+
+    def test_check_skips_users_with_pending_stats_tasks(self):
+        self._play_history()
+        self._play(WIN, self.player_1, self.player_2)
+
+        self.assertEqual([], stats.check(10, fix=True))
+        queue.run_pending()
+
+        self.assertEqual(5, self._stats(self.player_1)["played"])
+        self.assertEqual([], stats.check(10))
+
+    def test_streaks_follow_the_order_games_finished(self):
+        # The first game created finishes last
+        first = Game.objects.create(
+            player_1=self.player_1, player_2=self.player_2, status="in_progress"
+        )
+        for row, column in WIN[:-1]:
+            user, _ = first.get_next_player_and_mark()
+            GameService.move(first, {"row": row, "column": column}, user)
+        self._play(WIN, self.player_2, self.player_1)
+        user, _ = first.get_next_player_and_mark()
+        GameService.move(first, {"row": WIN[-1][0], "column": WIN[-1][1]}, user)
+        queue.run_pending()
+        self.assertEqual(1, self._stats(self.player_1)["streak"])
+        self.assertEqual([], stats.check(10))
+
+        UserStats.objects.filter(user=self.player_1).update(streak=-1)
+        self.assertEqual([str(self.player_1.pk)], [str(s.user_id) for s, _ in stats.check(10)])
+
+        stats.rebuild()
+        self.assertEqual(1, self._stats(self.player_1)["streak"])
+        self.assertEqual(-1, self._stats(self.player_2)["streak"])
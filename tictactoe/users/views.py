@@ -1,14 +1,29 @@
 from django.contrib.auth import get_user_model
-from django.db.models import Count
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from rest_framework import viewsets, mixins
+from rest_framework.decorators import action
+from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
-from .models import User
+from tictactoe.db.mixins import ReplicaReadMixin
+from tictactoe.games.models import ArchivedGame, Game
+from tictactoe.metrics.mixins import SerializationTimingMixin
+from .models import User, UserStats
 from .permissions import IsUserOrReadOnly
-from .serializers import CreateUserSerializer, UserSerializer, UserHighscoreSerializer
+from .serializers import (
+    CreateUserSerializer,
+    UserSerializer,
+    UserHighscoreSerializer,
+    UserRatingSerializer,
+    UserStatsSerializer,
+)
 
 
 class UserViewSet(
-    mixins.RetrieveModelMixin, mixins.UpdateModelMixin, viewsets.GenericViewSet
+    SerializationTimingMixin,
+    mixins.RetrieveModelMixin,
+    mixins.UpdateModelMixin,
+    viewsets.GenericViewSet,
 ):
     """
     Updates and retrieves user accounts
@@ -18,8 +33,17 @@ class UserViewSet(
     serializer_class = UserSerializer
     permission_classes = (IsUserOrReadOnly,)
 
+    @action(detail=True, methods=["get"], serializer_class=UserStatsSerializer)
+    def stats(self, request, pk=None) -> Response:
+        """Returns results of finished games of a user, read from their counters."""
+        user_stats = UserStats.objects.filter(user_id=self.get_object().pk).first()
+        serializer = self.get_serializer(user_stats or UserStats())
+        return Response(serializer.data)
 
-class UserCreateViewSet(mixins.CreateModelMixin, viewsets.GenericViewSet):
+
+class UserCreateViewSet(
+    SerializationTimingMixin, mixins.CreateModelMixin, viewsets.GenericViewSet
+):
     """
     Creates user accounts
     """
@@ -29,13 +53,43 @@ class UserCreateViewSet(mixins.CreateModelMixin, viewsets.GenericViewSet):
     permission_classes = (AllowAny,)
 
 
+def _count_wins(model) -> Coalesce:
+    """Returns a subquery counting games of the model won by the outer user."""
+    wins = (
+        model.objects.filter(winner=OuterRef("pk"))
+        .order_by()
+        .values("winner")
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    return Coalesce(Subquery(wins, output_field=IntegerField()), 0)
+
+
 class HighscoreViewSet(
-    mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet
+    ReplicaReadMixin,
+    SerializationTimingMixin,
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    viewsets.GenericViewSet,
 ):
     queryset = (
         get_user_model()
-        .objects.annotate(wins_count=Count("games_won"))
+        .objects.annotate(wins_count=_count_wins(Game) + _count_wins(ArchivedGame))
         .order_by("-wins_count")
     )
     serializer_class = UserHighscoreSerializer
     permission_classes = (AllowAny,)
+    replica_actions = ("list", "retrieve")
+
+
+class LeaderboardViewSet(
+    ReplicaReadMixin, SerializationTimingMixin, mixins.ListModelMixin, viewsets.GenericViewSet
+):
+    """
+    Lists users by rating, read in the order of the rating index
+    """
+
+    queryset = User.objects.order_by("-rating")
+    serializer_class = UserRatingSerializer
+    permission_classes = (AllowAny,)
+    replica_actions = ("list",)